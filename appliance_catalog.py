@@ -0,0 +1,207 @@
+# appliance_catalog.py
+# This file loads the appliance catalog (Appliances.csv) without pandas.
+# The GUIs only need name lookup and the four numeric columns, which the standard csv module
+# reads in a few milliseconds, so pandas stays off the startup path entirely.
+# The parsed catalog is also compiled into a small binary cache (see load_catalog) that later
+# launches memory-map instead of parsing the CSV again. The columns are copied out and the
+# mapping closed straight away: Windows cannot replace a file that is still mapped.
+
+import csv
+import hashlib
+import math
+import mmap
+import os
+import struct
+from array import array
+from collections import namedtuple
+
+# Column headers in Appliances.csv
+NAME_COLUMN = "Appliance"
+POWER_COLUMN = "Rated Power (W)"
+PF_COLUMN = "Power Factor (PF)"
+EFFICIENCY_COLUMN = "Efficiency (%)"
+SURGE_COLUMN = "Surge Power (W)"
+
+# Binary cache next to the other generated files (load_Sched.csv, Solar_Setup.png)
+CACHE_FILENAME = "Appliances.cache"
+
+# Cache layout (little-endian):
+#   header: magic, CSV mtime_ns, CSV size, CSV sha256, row count, names blob length
+#   columns: power, power factor, efficiency, surge as float32[row count] each
+#   names: UTF-8 names separated by NUL bytes
+CACHE_MAGIC = b"APLCAT01"
+CACHE_HEADER = struct.Struct("<8sqq32sII")
+CACHE_COLUMNS = 4
+
+ApplianceRecord = namedtuple("ApplianceRecord", ["name", "power", "power_factor", "efficiency", "surge"])
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class ApplianceCatalog:
+    """
+    Appliance names plus rated power, power factor, efficiency and surge power columns.
+    The columns are lists when parsed from CSV, or float32 arrays read from the cache.
+    Lookups by name go through a name -> row dict, so they are O(1).
+    When a name appears more than once, lookups return its first row (as the old
+    appliance_data[appliance_data['Appliance'] == name].iloc[0] did).
+    """
+
+    def __init__(self, names, power, power_factor, efficiency, surge):
+        self.names = list(names)
+        self.power = power
+        self.power_factor = power_factor
+        self.efficiency = efficiency
+        self.surge = surge
+        self._rows = {}
+        for i, name in enumerate(self.names):
+            self._rows.setdefault(name, i)
+
+    @classmethod
+    def empty(cls):
+        return cls([], [], [], [], [])
+
+    @classmethod
+    def from_csv(cls, path):
+        """
+        Reads Appliances.csv with the csv module. Blank or non-numeric cells become NaN.
+        """
+        names, power, power_factor, efficiency, surge = [], [], [], [], []
+        with open(path, newline='', encoding='utf-8-sig') as file:
+            for row in csv.DictReader(file):
+                name = row.get(NAME_COLUMN)
+                if not name:
+                    continue
+                names.append(name)
+                power.append(_to_float(row.get(POWER_COLUMN)))
+                power_factor.append(_to_float(row.get(PF_COLUMN)))
+                efficiency.append(_to_float(row.get(EFFICIENCY_COLUMN)))
+                surge.append(_to_float(row.get(SURGE_COLUMN)))
+        return cls(names, power, power_factor, efficiency, surge)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def record(self, name):
+        """
+        Returns the ApplianceRecord of name, or None if the appliance is not in the catalog.
+        """
+        i = self._rows.get(name)
+        if i is None:
+            return None
+        return ApplianceRecord(self.names[i], self.power[i], self.power_factor[i],
+                               self.efficiency[i], self.surge[i])
+
+
+def format_number(value):
+    """
+    Formats a catalog number for an entry field: 100.0 -> "100", 7.5 -> "7.5".
+    """
+    return f"{value:g}"
+
+
+# ---------------------------
+# BINARY CACHE
+# ---------------------------
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _map_cache(cache_path):
+    """
+    Maps the cache file and returns (header fields, mapping), or None when it is missing or malformed.
+    """
+    try:
+        with open(cache_path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mapped) >= CACHE_HEADER.size:
+        header = CACHE_HEADER.unpack_from(mapped)
+        magic, _, _, _, count, names_length = header
+        if magic == CACHE_MAGIC and len(mapped) == CACHE_HEADER.size + CACHE_COLUMNS * 4 * count + names_length:
+            return header, mapped
+    mapped.close()
+    return None
+
+
+def _catalog_from_mapping(mapped, count, names_length):
+    """
+    Builds a catalog from the mapping, copying its float32 columns into arrays so that the
+    mapping can be closed (and the cache file replaced) afterwards.
+    """
+    offset = CACHE_HEADER.size
+    columns = []
+    for _ in range(CACHE_COLUMNS):
+        column = array('f')
+        column.frombytes(mapped[offset:offset + 4 * count])
+        columns.append(column)
+        offset += 4 * count
+    names = mapped[offset:offset + names_length].decode('utf-8').split("\0") if count else []
+    return ApplianceCatalog(names, *columns)
+
+
+def _write_cache(catalog, cache_path, mtime_ns, size, digest):
+    """
+    Writes the cache to a temporary file and renames it into place.
+    A cache that cannot be written (read-only folder, file in use) is simply skipped.
+    """
+    names_blob = "\0".join(catalog.names).encode('utf-8')
+    header = CACHE_HEADER.pack(CACHE_MAGIC, mtime_ns, size, digest, len(catalog), len(names_blob))
+    temp_path = cache_path + ".tmp"
+    try:
+        with open(temp_path, 'wb') as file:
+            file.write(header)
+            for column in (catalog.power, catalog.power_factor, catalog.efficiency, catalog.surge):
+                file.write(array('f', column).tobytes())
+            file.write(names_blob)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass
+
+
+def load_catalog(csv_path, cache_path=CACHE_FILENAME):
+    """
+    Returns the appliance catalog, using the binary cache whenever it is still valid.
+
+    The cache is trusted when the CSV's mtime and size match the ones recorded in it.
+    If they differ, the CSV is hashed: the same contents (e.g. a fresh copy of the same file)
+    reuse the cached columns, different contents rebuild the cache from the CSV.
+    """
+    stat = os.stat(csv_path)
+    mapping = _map_cache(cache_path)
+    if mapping is not None:
+        (_, cached_mtime, cached_size, cached_digest, count, names_length), mapped = mapping
+        with mapped:
+            cached = _catalog_from_mapping(mapped, count, names_length)
+        if (cached_mtime, cached_size) == (stat.st_mtime_ns, stat.st_size):
+            return cached
+        digest = _file_digest(csv_path)
+        if digest == cached_digest:
+            # Record the new mtime so the next launch skips the hash again.
+            _write_cache(cached, cache_path, stat.st_mtime_ns, stat.st_size, digest)
+            return cached
+    else:
+        digest = _file_digest(csv_path)
+
+    catalog = ApplianceCatalog.from_csv(csv_path)
+    _write_cache(catalog, cache_path, stat.st_mtime_ns, stat.st_size, digest)
+    # Serve the freshly written cache so the first launch sees the same float32 values as later ones.
+    mapping = _map_cache(cache_path)
+    if mapping is not None:
+        (_, _, _, _, count, names_length), mapped = mapping
+        with mapped:
+            return _catalog_from_mapping(mapped, count, names_length)
+    return catalog
@@ -0,0 +1,132 @@
+# appliance_index.py
+# This file holds the search index behind the Appliance autocomplete.
+# Names are lowercased and broken into trigrams once when the catalog is loaded; each keystroke
+# then only touches the postings of the typed trigrams and returns a ranked top-K list that
+# also tolerates typos.
+
+import heapq
+import math
+from bisect import bisect_left
+
+# Number of suggestions pushed into the combobox per keystroke.
+TOP_K = 50
+
+# Minimum trigram similarity (shared / query trigrams) for a fuzzy, typo-tolerant match.
+FUZZY_THRESHOLD = 0.5
+
+
+def _trigrams(text):
+    """
+    Returns the set of trigrams of a lowercased string, padded so that word starts count.
+    """
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ApplianceIndex:
+    """
+    Prefix and trigram index over the appliance names.
+
+    search() ranks matches in tiers:
+      0. exact name
+      1. name starts with the query
+      2. a word in the name starts with the query
+      3. the query appears anywhere in the name (what the old filter matched)
+      4. fuzzy match on shared trigrams, for typos
+    Within a tier shorter names come first, then alphabetical order; fuzzy matches are
+    ordered by trigram similarity first. A tier is only searched while the better tiers
+    have not filled the top-K yet.
+    """
+
+    def __init__(self, names, limit=TOP_K):
+        self.limit = limit
+        self.names = []
+        seen = set()
+        for name in names:
+            if isinstance(name, str) and name not in seen:
+                seen.add(name)
+                self.names.append(name)
+        self._lowered = [name.lower() for name in self.names]
+        # Tie-break position of every name: shorter first, then alphabetical.
+        by_length = sorted(range(len(self.names)), key=lambda i: (len(self._lowered[i]), self._lowered[i]))
+        self._order = [0] * len(self.names)
+        for position, i in enumerate(by_length):
+            self._order[i] = position
+
+        # Sorted (word, id) pairs: whole names and every word inside a name, for prefix lookups.
+        self._prefixes = sorted((lowered, i) for i, lowered in enumerate(self._lowered))
+        self._words = sorted(
+            {(word, i) for i, lowered in enumerate(self._lowered) for word in lowered.split()}
+        )
+
+        self._grams = []
+        self._postings = {}
+        for i, lowered in enumerate(self._lowered):
+            grams = _trigrams(lowered)
+            self._grams.append(grams)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(i)
+        self._postings = {gram: frozenset(ids) for gram, ids in self._postings.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    def _prefix_ids(self, table, query):
+        start = bisect_left(table, (query, -1))
+        end = bisect_left(table, (query + "\uffff", -1), start)
+        return [i for _, i in table[start:end]]
+
+    def search(self, query, limit=None):
+        """
+        Returns up to limit appliance names matching query, best match first.
+        An empty query returns every name in catalog order.
+        """
+        limit = self.limit if limit is None else limit
+        query = query.strip().lower()
+        if not query:
+            return list(self.names)
+
+        tiers = {}
+        for i in self._prefix_ids(self._prefixes, query):
+            tiers[i] = 0 if self._lowered[i] == query else 1
+        if len(tiers) < limit:
+            for i in self._prefix_ids(self._words, query):
+                tiers.setdefault(i, 2)
+
+        if len(tiers) < limit:
+            # Every substring match contains all unpadded trigrams of the query,
+            # so intersect their postings and verify the few names left.
+            if len(query) >= 3:
+                inner = [self._postings.get(query[i:i + 3], frozenset()) for i in range(len(query) - 2)]
+                candidates = frozenset.intersection(*sorted(inner, key=len))
+            else:
+                candidates = range(len(self.names))
+            for i in candidates:
+                if i not in tiers and query in self._lowered[i]:
+                    tiers[i] = 3
+
+        similarity = {}
+        if len(tiers) < limit:
+            # A name sharing at least FUZZY_THRESHOLD of the query trigrams must contain one of
+            # the rarest (n - required + 1) of them, so only those postings are scanned.
+            query_grams = _trigrams(query)
+            postings = sorted((self._postings.get(gram, frozenset()) for gram in query_grams), key=len)
+            required = max(1, math.ceil(len(query_grams) * FUZZY_THRESHOLD))
+            checked = set(tiers)
+            for ids in postings[:len(postings) - required + 1]:
+                for i in ids - checked:
+                    checked.add(i)
+                    shared = len(query_grams & self._grams[i])
+                    if shared >= required:
+                        tiers[i] = 4
+                        similarity[i] = shared / len(query_grams | self._grams[i])
+
+        if similarity:
+            def rank(i):
+                return tiers[i], -similarity.get(i, 0), self._order[i]
+        else:
+            def rank(i):
+                return tiers[i], self._order[i]
+
+        best = heapq.nsmallest(limit, tiers, key=rank)
+        return [self.names[i] for i in best]
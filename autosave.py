@@ -0,0 +1,148 @@
+# autosave.py
+# This file holds the background writer that saves load_Sched.csv.
+# The UI thread only hands over a snapshot of the rows; a worker thread writes it to a temporary
+# file and renames it over the schedule, so saves never block input and a crash mid-write
+# never leaves a truncated schedule behind.
+
+import csv
+import os
+import threading
+import time
+
+
+class AutosaveWriter:
+    """
+    Write-behind, atomic CSV writer.
+
+    submit() replaces any snapshot that is still waiting, so a burst of edits costs one write.
+    Each write goes to "<path>.tmp", is flushed to disk, then replaces the target with
+    os.replace(). If the target is locked (e.g. open in Excel) the snapshot is kept and
+    retried after retry_delay seconds instead of raising a dialog on every change.
+    With min_interval set, writes are spaced at least that many seconds apart and every
+    snapshot submitted in between is folded into the next write.
+    """
+
+    def __init__(self, path, retry_delay=2.0, min_interval=0.0):
+        self.path = path
+        self.retry_delay = retry_delay
+        self.min_interval = min_interval
+        self._next_write_at = 0.0
+        self._cond = threading.Condition()
+        self._pending = None
+        self._busy = False
+        self._closing = False
+
+        # Statistics, read by the UI through status()
+        self.submitted = 0
+        self.coalesced = 0
+        self.writes = 0
+        self.failures = 0
+        self.last_write_ms = None
+        self.max_write_ms = 0.0
+        self.last_error = None
+
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def submit(self, rows):
+        """
+        Queues rows (a list of CSV rows) to be written; a newer snapshot replaces an older one.
+        """
+        with self._cond:
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = rows
+            self.submitted += 1
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Waits until every submitted snapshot has been written (or has failed). Returns True if idle.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending is not None or self._busy:
+                if self.last_error is not None and not self._busy:
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=5.0):
+        """
+        Writes the last pending snapshot (one attempt) and stops the worker thread.
+        """
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def status(self):
+        """
+        Returns a snapshot of the writer statistics.
+        """
+        with self._cond:
+            return {
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "writes": self.writes,
+                "failures": self.failures,
+                "pending": self._pending is not None or self._busy,
+                "last_write_ms": self.last_write_ms,
+                "max_write_ms": self.max_write_ms,
+                "last_error": self.last_error,
+            }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closing:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                # Hold the snapshot until min_interval has passed; close() writes it right away.
+                while not self._closing and time.monotonic() < self._next_write_at:
+                    self._cond.wait(self._next_write_at - time.monotonic())
+                rows, self._pending = self._pending, None
+                self._busy = True
+
+            started = time.perf_counter()
+            try:
+                self._write(rows)
+            except OSError as e:
+                with self._cond:
+                    self.failures += 1
+                    self.last_error = e
+                    self._busy = False
+                    if self._closing:
+                        self._cond.notify_all()
+                        return
+                    if self._pending is None:
+                        self._pending = rows
+                    self._cond.notify_all()
+                    # Back off before retrying; only close() cuts the delay short.
+                    deadline = time.monotonic() + self.retry_delay
+                    while not self._closing and time.monotonic() < deadline:
+                        self._cond.wait(deadline - time.monotonic())
+                continue
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._cond:
+                self._next_write_at = time.monotonic() + self.min_interval
+                self.writes += 1
+                self.last_write_ms = elapsed_ms
+                self.max_write_ms = max(self.max_write_ms, elapsed_ms)
+                self.last_error = None
+                self._busy = False
+                self._cond.notify_all()
+
+    def _write(self, rows):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, mode='w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerows(rows)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
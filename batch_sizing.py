@@ -0,0 +1,136 @@
+# batch_sizing.py
+# This file provides a vectorized batch mode of the sizing engine.
+# It sizes N sites/scenarios in one NumPy pass and gives the same selections as
+# sizing_engine.size_system() does one call at a time.
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from component_catalog import CATALOG
+from sizing_engine import (
+    SUN_HOURS, BATTERY_MARGIN, INVERTER_MARGIN, INVERTER_SURGE_FACTOR, PV_MARGIN, PERFORMANCE_RATIO, AC_VOLTAGE
+)
+
+
+# ---------------------------
+# OUTPUT
+# ---------------------------
+@dataclass(frozen=True)
+class BatchSizingResult:
+    """
+    Requirements and component selections for N scenarios, one array entry per scenario.
+    Selections that exceed the largest available rating are NaN (the "> max" case of
+    size_system), and every output is NaN where valid is False (no load to size for).
+    """
+    valid: np.ndarray
+    battery_Ah_req: np.ndarray
+    inverter_required: np.ndarray
+    inverter_sel: np.ndarray
+    num_panels: np.ndarray
+    total_pv_capacity: np.ndarray
+    total_pv_current: np.ndarray
+    mppt_sel: np.ndarray
+    scc_sel: np.ndarray
+    dc_breaker_required: np.ndarray
+    dc_breaker_sel: np.ndarray
+    inverter_ac_current: np.ndarray
+    ac_breaker_required: np.ndarray
+    ac_breaker_sel: np.ndarray
+    inverter_current: np.ndarray
+    cable_required: np.ndarray
+    cable_sel: np.ndarray
+    active_balancer_required: np.ndarray
+    active_balancer_sel: np.ndarray
+    fuse_required: np.ndarray
+    fuse_sel: np.ndarray
+
+    def __len__(self):
+        return len(self.valid)
+
+
+# ---------------------------
+# SIZING
+# ---------------------------
+def size_batch(daily_Wh, peak_W, system_voltage, dod, panel_size,
+               sun_hours=SUN_HOURS, battery_margin=BATTERY_MARGIN, inverter_margin=INVERTER_MARGIN,
+               pv_margin=PV_MARGIN, performance_ratio=PERFORMANCE_RATIO, ac_voltage=AC_VOLTAGE,
+               surge_W=0.0, inverter_surge_factor=INVERTER_SURGE_FACTOR, total_W=None):
+    """
+    Sizes every scenario in one vectorized pass.
+    daily_Wh, peak_W, system_voltage, dod (%) and panel_size (W) are arrays of the same
+    length (scalars are broadcast); peak_W is the running load (LoadSummary.running_W) and
+    surge_W the surge peak. total_W is the total rated wattage (LoadSummary.total_wattage),
+    which decides like in size_system() whether there is a load to size for; it defaults to
+    peak_W. The formulas follow size_system() step by step,
+    so each entry matches what a single call with the same inputs returns.
+    """
+    if total_W is None:
+        total_W = peak_W
+    daily_Wh, peak_W, system_voltage, dod, panel_size, total_W = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (daily_Wh, peak_W, system_voltage, dod, panel_size, total_W))
+    )
+    # Same test as size_system(): a positive total wattage counts even when the running load is 0.
+    valid = (daily_Wh > 0) & (total_W > 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        battery_Ah_req = (daily_Wh * battery_margin) / (system_voltage * (dod / 100))
+
+        inverter_required = np.maximum(peak_W * inverter_margin, np.asarray(surge_W, dtype=float) / inverter_surge_factor)
+        inverter_sel = CATALOG.select_array("inverter", inverter_required)
+
+        pv_capacity_required = (daily_Wh * pv_margin) / (sun_hours * performance_ratio)
+        num_panels = np.ceil(pv_capacity_required / panel_size)
+        total_pv_capacity = num_panels * panel_size
+
+        current_per_panel = panel_size / system_voltage
+        total_pv_current = num_panels * current_per_panel
+
+        mppt_sel = CATALOG.select_array("mppt", total_pv_current)
+        scc_sel = CATALOG.select_array("scc", total_pv_current)
+
+        dc_breaker_required = total_pv_current * 1.20
+        dc_breaker_sel = CATALOG.select_array("dc_breaker", dc_breaker_required)
+
+        # An oversize inverter has no rating, so the currents fall back to the required wattage.
+        inverter_watts = np.where(np.isnan(inverter_sel), inverter_required, inverter_sel)
+        inverter_ac_current = inverter_watts / ac_voltage
+        ac_breaker_required = inverter_ac_current * 1.25
+        ac_breaker_sel = CATALOG.select_array("ac_breaker", ac_breaker_required)
+
+        inverter_current = inverter_watts / system_voltage
+        cable_required = inverter_current * 1.25
+        cable_sel = CATALOG.select_array("cable", cable_required)
+
+        active_balancer_required = np.maximum(battery_Ah_req * 0.05, 5)
+        active_balancer_sel = CATALOG.select_array("balancer", active_balancer_required)
+
+        fuse_required = inverter_current * 1.25
+        fuse_sel = CATALOG.select_array("fuse", fuse_required)
+
+    def masked(values):
+        return np.where(valid, values, np.nan)
+
+    return BatchSizingResult(
+        valid=valid,
+        battery_Ah_req=masked(battery_Ah_req),
+        inverter_required=masked(inverter_required),
+        inverter_sel=masked(inverter_sel),
+        num_panels=masked(num_panels),
+        total_pv_capacity=masked(total_pv_capacity),
+        total_pv_current=masked(total_pv_current),
+        mppt_sel=masked(mppt_sel),
+        scc_sel=masked(scc_sel),
+        dc_breaker_required=masked(dc_breaker_required),
+        dc_breaker_sel=masked(dc_breaker_sel),
+        inverter_ac_current=masked(inverter_ac_current),
+        ac_breaker_required=masked(ac_breaker_required),
+        ac_breaker_sel=masked(ac_breaker_sel),
+        inverter_current=masked(inverter_current),
+        cable_required=masked(cable_required),
+        cable_sel=masked(cable_sel),
+        active_balancer_required=masked(active_balancer_required),
+        active_balancer_sel=masked(active_balancer_sel),
+        fuse_required=masked(fuse_required),
+        fuse_sel=masked(fuse_sel),
+    )
@@ -0,0 +1,116 @@
+# component_catalog.py
+# This file holds the indexed component catalog used by the sizing engines.
+# The ratings from predefined_values.py are sorted once when the catalog is built; every lookup
+# after that is a binary search (bisect for single values, numpy.searchsorted for arrays).
+
+from bisect import bisect_left
+
+import predefined_values
+
+
+# ---------------------------
+# CATALOG TABLES
+# ---------------------------
+# Component kind -> name of the rating list in predefined_values.py.
+RATING_TABLES = {
+    "inverter": "INVERTER_SIZES",
+    "mppt": "MPPT_SIZES",
+    "scc": "SCC_SIZES",
+    "dc_breaker": "DC_BREAKER_SIZES",
+    "ac_breaker": "BREAKER_SIZES",
+    "balancer": "ACTIVE_BALANCER_SIZES",
+    "fuse": "FUSE_SIZES",
+}
+
+
+class ComponentCatalog:
+    """
+    Pre-sorted component ratings with one shared "next size up or overflow" rule.
+
+    Every kind is stored as a sorted tuple of ratings and a matching tuple of thresholds.
+    For plain ratings the thresholds are the ratings themselves; for cables they are the
+    running maximum of the ampacity ratings, so the first threshold >= the required current
+    is also the first cable size whose ampacity covers it.
+    """
+
+    def __init__(self, tables, cable_sizes, ampacity_rating):
+        self._ratings = {}
+        self._thresholds = {}
+        self._arrays = {}
+        for kind, sizes in tables.items():
+            ratings = tuple(sorted(sizes))
+            self._ratings[kind] = ratings
+            self._thresholds[kind] = ratings
+
+        cables = tuple(sorted(cable_sizes))
+        thresholds = []
+        running_max = 0
+        for size in cables:
+            running_max = max(running_max, ampacity_rating.get(size, 0))
+            thresholds.append(running_max)
+        self._ratings["cable"] = cables
+        self._thresholds["cable"] = tuple(thresholds)
+
+    @classmethod
+    def from_predefined(cls):
+        """
+        Builds the catalog from the lists in predefined_values.py.
+        """
+        tables = {kind: getattr(predefined_values, name) for kind, name in RATING_TABLES.items()}
+        return cls(tables, predefined_values.CABLE_SIZES, predefined_values.AMPACITY_RATING)
+
+    def kinds(self):
+        """
+        Returns the component kinds held by the catalog.
+        """
+        return tuple(self._ratings)
+
+    def ratings(self, kind):
+        """
+        Returns the sorted ratings of a component kind.
+        """
+        return self._ratings[kind]
+
+    def overflow(self, kind):
+        """
+        Returns the label used when a requirement exceeds every rating, e.g. "> 60000".
+        """
+        return f"> {self._ratings[kind][-1]}"
+
+    def select(self, kind, required):
+        """
+        Returns the smallest rating of kind that covers required,
+        or the overflow label when nothing in the catalog is large enough.
+        """
+        thresholds = self._thresholds[kind]
+        index = bisect_left(thresholds, required)
+        if index >= len(thresholds) or not thresholds[index] >= required:
+            return self.overflow(kind)
+        return self._ratings[kind][index]
+
+    def select_array(self, kind, required):
+        """
+        Vectorized select(): returns a float array of selected ratings,
+        NaN where the requirement exceeds every rating.
+        """
+        import numpy as np
+
+        ratings, thresholds = self._numpy_tables(kind)
+        index = np.searchsorted(thresholds, required, side='left')
+        overflow = index >= len(thresholds)
+        selected = ratings[np.minimum(index, len(ratings) - 1)]
+        return np.where(overflow | np.isnan(required), np.nan, selected)
+
+    def _numpy_tables(self, kind):
+        tables = self._arrays.get(kind)
+        if tables is None:
+            import numpy as np
+
+            tables = (np.array(self._ratings[kind], dtype=float),
+                      np.array(self._thresholds[kind], dtype=float))
+            self._arrays[kind] = tables
+        return tables
+
+
+# Catalog shared by the sizing engines, built once at import time.
+CATALOG = ComponentCatalog.from_predefined()
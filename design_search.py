@@ -0,0 +1,174 @@
+# design_search.py
+# This file searches the catalog for the cheapest design that meets a load.
+# The GUIs leave system voltage, DoD and panel size to the user; this sizes every combination of
+# VOLTAGES x DOD x PANEL_SIZES in one batch_sizing pass, picks the cheapest bank of AH battery
+# units for each voltage/DoD branch, and ranks the designs by life-cycle cost: components and
+# panels plus the battery bank and its replacements over PROJECT_YEARS.
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from batch_sizing import size_batch
+from predefined_values import (
+    AH, DOD, PANEL_SIZES, VOLTAGES, COMPONENT_PRICES, PANEL_PRICE_PER_W, PANEL_INSTALL_COST,
+    BATTERY_UNIT_VOLTAGE, BATTERY_PRICE_PER_KWH, BATTERY_UNIT_COST, BATTERY_CYCLES_AT_FULL_DOD,
+    BATTERY_CYCLE_EXPONENT, PROJECT_YEARS
+)
+
+TOP_N = 10
+
+# Component kind (as priced in COMPONENT_PRICES) -> selection field of BatchSizingResult
+SELECTION_FIELDS = {
+    "inverter": "inverter_sel",
+    "mppt": "mppt_sel",
+    "scc": "scc_sel",
+    "dc_breaker": "dc_breaker_sel",
+    "ac_breaker": "ac_breaker_sel",
+    "balancer": "active_balancer_sel",
+    "fuse": "fuse_sel",
+    "cable": "cable_sel",
+}
+
+
+@dataclass(frozen=True)
+class Design:
+    """
+    One priced design: the user-selectable parameters, the panel count, the battery bank
+    (battery_series x battery_strings units of battery_unit_Ah, bought battery_banks times over
+    PROJECT_YEARS) and its costs in PHP.
+    """
+    system_voltage: float
+    dod: float
+    panel_size: float
+    num_panels: int
+    battery_unit_Ah: float
+    battery_series: int
+    battery_strings: int
+    battery_banks: int
+    electronics_cost: float
+    pv_cost: float
+    battery_cost: float
+    total_cost: float
+
+
+# ---------------------------
+# COST MODEL
+# ---------------------------
+def battery_cycle_life(dod):
+    """
+    Returns the cycle life of a battery cycled to dod (%).
+    """
+    return BATTERY_CYCLES_AT_FULL_DOD * (100 / np.asarray(dod, dtype=float)) ** BATTERY_CYCLE_EXPONENT
+
+
+def battery_banks(dod):
+    """
+    Returns how many banks are bought over PROJECT_YEARS at one cycle a day (1 = no replacement).
+    """
+    return np.ceil(PROJECT_YEARS * 365 / battery_cycle_life(dod))
+
+
+def cheapest_battery_units(battery_Ah_req, series, unit_sizes=AH):
+    """
+    For each battery requirement, returns (unit_Ah, strings, cost) of the cheapest bank built
+    from parallel strings of series units of a single size. All unit sizes are priced at once;
+    only the cheapest one per requirement is kept.
+    """
+    units = np.asarray(unit_sizes, dtype=float)
+    strings = np.ceil(np.asarray(battery_Ah_req, dtype=float)[:, None] / units)
+    unit_price = units * BATTERY_UNIT_VOLTAGE / 1000 * BATTERY_PRICE_PER_KWH + BATTERY_UNIT_COST
+    cost = np.asarray(series, dtype=float)[:, None] * strings * unit_price
+    best = np.argmin(cost, axis=1)
+    rows = np.arange(len(best))
+    return units[best], strings[rows, best], cost[rows, best]
+
+
+# ---------------------------
+# SEARCH
+# ---------------------------
+def search_designs(loads, top_n=TOP_N, voltages=VOLTAGES, dods=DOD, panel_sizes=PANEL_SIZES, unit_sizes=AH):
+    """
+    Returns the top_n cheapest Designs for a LoadSummary, cheapest first (ties go to the lower
+    voltage, DoD and panel size). A design meets the load when size_system() would size it with
+    every component inside the catalog; its battery is the required Ah rounded up to whole units.
+
+    Branches that cannot win are pruned before the designs are combined: voltages that cannot
+    be built from BATTERY_UNIT_VOLTAGE strings, every battery unit size but the cheapest per
+    voltage/DoD, and designs with a component above the largest rating.
+    """
+    if loads.total_consumption_kWh <= 0 or loads.total_wattage <= 0:
+        return []
+    voltages = np.array([v for v in voltages if v >= BATTERY_UNIT_VOLTAGE and v % BATTERY_UNIT_VOLTAGE == 0],
+                        dtype=float)
+    dods = np.asarray(dods, dtype=float)
+    panel_sizes = np.asarray(panel_sizes, dtype=float)
+    if not (len(voltages) and len(dods) and len(panel_sizes)):
+        return []
+
+    # Every voltage x DoD x panel size, sized in one pass
+    shape = (len(voltages), len(dods), len(panel_sizes))
+    v, d, p = (a.ravel() for a in np.meshgrid(voltages, dods, panel_sizes, indexing='ij'))
+    sized = size_batch(loads.total_consumption_kWh * 1000, loads.running_W, v, d, p, surge_W=loads.surge_W,
+                       total_W=loads.total_wattage)
+
+    # The battery depends on voltage and DoD only: one cheapest bank per branch
+    branch_voltage = v.reshape(shape)[:, :, 0].ravel()
+    branch_dod = d.reshape(shape)[:, :, 0].ravel()
+    branch_Ah = sized.battery_Ah_req.reshape(shape)[:, :, 0].ravel()
+    series = branch_voltage / BATTERY_UNIT_VOLTAGE
+    unit_Ah, strings, bank_cost = cheapest_battery_units(branch_Ah, series, unit_sizes)
+    banks = battery_banks(branch_dod)
+    branch = np.arange(len(v)) // len(panel_sizes)
+
+    electronics_cost = sum(base + per_unit * getattr(sized, SELECTION_FIELDS[kind])
+                           for kind, (base, per_unit) in COMPONENT_PRICES.items())
+    pv_cost = sized.num_panels * (p * PANEL_PRICE_PER_W + PANEL_INSTALL_COST)
+    battery_cost = (bank_cost * banks)[branch]
+    total_cost = electronics_cost + pv_cost + battery_cost
+
+    # Overflowing selections are NaN, so NaN totals are designs that cannot be built.
+    feasible = np.flatnonzero(~np.isnan(total_cost))
+    ranked = feasible[np.lexsort((p[feasible], d[feasible], v[feasible], total_cost[feasible]))][:top_n]
+    return [
+        Design(
+            system_voltage=float(v[i]),
+            dod=float(d[i]),
+            panel_size=float(p[i]),
+            num_panels=int(sized.num_panels[i]),
+            battery_unit_Ah=float(unit_Ah[branch[i]]),
+            battery_series=int(series[branch[i]]),
+            battery_strings=int(strings[branch[i]]),
+            battery_banks=int(banks[branch[i]]),
+            electronics_cost=float(electronics_cost[i]),
+            pv_cost=float(pv_cost[i]),
+            battery_cost=float(battery_cost[i]),
+            total_cost=float(total_cost[i]),
+        )
+        for i in ranked
+    ]
+
+
+# ---------------------------
+# PRESENTATION HELPERS
+# ---------------------------
+DESIGN_COLUMNS = ("Voltage (V)", "DoD (%)", "Panels", "Battery Bank", "Cost (PHP)")
+
+
+def design_rows(designs):
+    """
+    Returns one DESIGN_COLUMNS tuple per design for the optimizer window.
+    """
+    rows = []
+    for design in designs:
+        battery = f"{design.battery_series}S{design.battery_strings}P x {design.battery_unit_Ah:g} Ah"
+        if design.battery_banks > 1:
+            battery += f" ({design.battery_banks} banks in {PROJECT_YEARS} yrs)"
+        rows.append((
+            f"{design.system_voltage:g}",
+            f"{design.dod:g}",
+            f"{design.num_panels} x {design.panel_size:g} W",
+            battery,
+            f"{design.total_cost:,.0f}",
+        ))
+    return rows
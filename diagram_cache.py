@@ -0,0 +1,99 @@
+# diagram_cache.py
+# This file holds the on-disk cache of rendered setup diagrams.
+# A diagram is fully determined by its labels (panel count, PV W, MPPT, SCC, breakers, cable,
+# balancer, fuse, inverter, battery and load) and the schematic layout, so the PNG is stored
+# under a hash of exactly those. Redrawing a kit that was drawn before copies the cached file
+# instead of rendering it again.
+
+import hashlib
+import json
+import os
+import shutil
+
+from schematic import layout_signature
+
+CACHE_DIRECTORY = "diagram_cache"
+
+# Bounds of the cache; the least recently used diagrams are evicted first.
+MAX_ENTRIES = 64
+MAX_BYTES = 64 * 1024 * 1024
+
+
+class DiagramCache:
+    """
+    Content-addressed, LRU-bounded store of rendered diagrams.
+
+    Entries are "<sha256>.png" files in directory. A file's modification time is its
+    last use: get() touches it on a hit, and put() evicts the oldest files once there are
+    more than max_entries of them or they take more than max_bytes.
+    Cache problems (read-only folder, file in use) never stop a draw; they count as misses.
+    """
+
+    def __init__(self, directory=CACHE_DIRECTORY, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(labels, dpi, extension="png"):
+        """
+        Returns the cache key of a diagram: a hash of its labels, the layout and the output format.
+        """
+        payload = json.dumps([labels, layout_signature(), dpi, extension], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest() + "." + extension
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key, target):
+        """
+        Copies the cached diagram to target and returns True, or returns False on a miss.
+        """
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, target)
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def put(self, key, source):
+        """
+        Stores a copy of a freshly rendered diagram and evicts old entries if the cache is full.
+        """
+        path = self._path(key)
+        temp_path = path + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            shutil.copyfile(source, temp_path)
+            os.replace(temp_path, path)
+            self._evict()
+        except OSError:
+            pass
+
+    def _evict(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        entries.sort(reverse=True)
+        total = 0
+        for count, (_, size, path) in enumerate(entries, 1):
+            total += size
+            # The newest entry (the one just stored) is always kept.
+            if count > 1 and (count > self.max_entries or total > self.max_bytes):
+                os.remove(path)
+                self.evictions += 1
+
+    def stats(self):
+        """
+        Returns the hit/miss/eviction counters.
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
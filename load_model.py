@@ -0,0 +1,399 @@
+# load_model.py
+# This file holds the appliance load model behind the load schedule table.
+# Every schedule row is kept as typed values in one array('d') column per field (8 bytes each)
+# with an interned appliance name, and is only formatted when it is shown or saved (display()).
+# Running totals are updated by deltas, so adding or editing a row costs O(1) instead of a
+# rescan of the whole table. Deleting rows updates the totals the same way, but compacts every
+# column to keep the table order, so a delete is O(n); remove_many() pays that once per batch.
+
+import math
+import sys
+from array import array
+
+from load_sweep import format_clock, load_peaks, parse_clock
+from sizing_engine import LoadSummary
+
+# Columns of the load schedule table and of load_Sched.csv.
+# Start and End are the optional daily running window ("HH:MM"); blank means any time.
+SCHEDULE_COLUMNS = ("Appliance", "Power (W)", "PF", "Eff(%)", "Surge(W)", "Usage (Hrs)", "Count", "Consumption (kWh)",
+                    "Start", "End")
+
+# Typed columns of the load model, one array('d') each; NaN stands for a start or end time not set
+NUMERIC_FIELDS = ("power", "power_factor", "efficiency", "surge", "usage_hours", "count", "consumption_kWh",
+                  "start_hour", "end_hour")
+
+# Field behind each SCHEDULE_COLUMNS entry, for sorting on typed values
+_SORT_FIELDS = ("appliance", "power", "power_factor", "efficiency", "surge", "usage_hours", "count",
+                "consumption_kWh", "start_hour", "end_hour")
+
+
+def schedule_values(appliance, power, power_factor, efficiency, surge, usage_hours, count, consumption_kWh,
+                    start_hour, end_hour):
+    """
+    Formats a schedule row for display, in SCHEDULE_COLUMNS order (NUMERIC_FIELDS order after the
+    appliance). A start or end hour of None or NaN is shown blank.
+    """
+    return (
+        appliance,
+        f"{power:,}",
+        f"{power_factor:.2f}",
+        f"{efficiency:.0f}",
+        f"{surge:,}",
+        f"{usage_hours:g}",
+        f"{count:g}",
+        f"{consumption_kWh:,.4f}",
+        "" if start_hour is None or start_hour != start_hour else format_clock(start_hour),
+        "" if end_hour is None or end_hour != end_hour else format_clock(end_hour),
+    )
+
+
+class _RunningSum:
+    """
+    Exact running sum of floats (Shewchuk's partials, the algorithm behind math.fsum).
+    Adding and later subtracting the same value leaves no rounding residue, so the total
+    never depends on the order of edits.
+    """
+
+    def __init__(self):
+        self._partials = []
+
+    def add(self, x):
+        partials = []
+        for y in self._partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                partials.append(lo)
+            x = hi
+        partials.append(x)
+        self._partials = partials
+
+    def extend(self, values):
+        """
+        Adds many values at once. math.fsum (exact internally) gives the rounded total; repeating
+        it on what is left gives non-overlapping partials that hold the exact sum, as add() does.
+        """
+        terms = list(values) + self._partials
+        partials = []
+        while True:
+            x = math.fsum(terms + [-p for p in partials])
+            if not x or not math.isfinite(x):
+                if x:
+                    partials = [x]
+                break
+            partials.append(x)
+        self._partials = partials[::-1]
+
+    def value(self):
+        return math.fsum(self._partials)
+
+
+class LoadModel:
+    """
+    Load schedule rows in typed columns plus running totals of wattage, usage hours, count and kWh.
+
+    Rows are identified by row id and kept in table order. row() and rows() return the numeric
+    (power_W, usage_hours, count, consumption_kWh, surge_W, start_hour, end_hour) tuples the sizing,
+    sweep and simulation modules read; the running window is None when the row has no times.
+    record() returns all fields of a row and display() its table text. Only power, usage, count
+    and consumption enter the totals, which follow the same definitions recalc_totals used:
+      - total_wattage        = sum(power * count)
+      - total_usage_hours    = sum(usage * count)
+      - appliance_count      = sum(count)
+      - total_consumption_kWh = sum(consumption)
+    """
+
+    def __init__(self):
+        self._ids = []
+        self._slots = {}  # row id -> index into the columns
+        self._names = []
+        self._columns = {name: array('d') for name in NUMERIC_FIELDS}
+        # Values derived from all rows (tuples, peaks, load profile), kept until the rows change
+        self._derived = {}
+        self._reset_totals()
+
+    def _reset_totals(self):
+        self._sums = [_RunningSum() for _ in range(4)]
+        self.total_wattage = 0
+        self.total_usage_hours = 0
+        self.appliance_count = 0
+        self.total_consumption_kWh = 0
+
+    def _apply(self, power, usage, count, consumption, sign):
+        wattage_sum, usage_sum, count_sum, consumption_sum = self._sums
+        wattage_sum.add(sign * power * count)
+        usage_sum.add(sign * usage * count)
+        count_sum.add(sign * count)
+        consumption_sum.add(sign * consumption)
+        self._publish_totals()
+
+    def _publish_totals(self):
+        wattage_sum, usage_sum, count_sum, consumption_sum = self._sums
+        self._derived.clear()
+        self.total_wattage = wattage_sum.value()
+        self.total_usage_hours = usage_sum.value()
+        self.appliance_count = count_sum.value()
+        self.total_consumption_kWh = consumption_sum.value()
+
+    def _get(self, name, slot):
+        return self._columns[name][slot]
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, row_id):
+        return row_id in self._slots
+
+    # ---------------------------
+    # READING ROWS
+    # ---------------------------
+    def row(self, row_id):
+        """
+        Returns the (power_W, usage_hours, count, consumption_kWh, surge_W, start_hour, end_hour) tuple of a row.
+        """
+        slot = self._slots[row_id]
+        start_hour, end_hour = self._get("start_hour", slot), self._get("end_hour", slot)
+        return (self._get("power", slot), self._get("usage_hours", slot), self._get("count", slot),
+                self._get("consumption_kWh", slot), self._get("surge", slot),
+                None if math.isnan(start_hour) else start_hour, None if math.isnan(end_hour) else end_hour)
+
+    def rows(self):
+        """
+        Returns the tuples of all rows (see row()), in table order. The list is built once per
+        change of the rows and must not be modified.
+        """
+        if "rows" not in self._derived:
+            columns = self._columns
+            start_hours = [None if hour != hour else hour for hour in columns["start_hour"]]
+            end_hours = [None if hour != hour else hour for hour in columns["end_hour"]]
+            self._derived["rows"] = list(zip(columns["power"], columns["usage_hours"], columns["count"],
+                                             columns["consumption_kWh"], columns["surge"], start_hours, end_hours))
+        return self._derived["rows"]
+
+    def row_ids(self):
+        """
+        Returns the ids of all rows, in the order of rows().
+        """
+        return list(self._ids)
+
+    def record(self, row_id):
+        """
+        Returns every field of a row as a dict: the NUMERIC_FIELDS plus appliance, and start and end
+        as "HH:MM" or blank (the form the edit journal stores).
+        """
+        slot = self._slots[row_id]
+        fields = {name: self._get(name, slot) for name in NUMERIC_FIELDS}
+        fields["appliance"] = self._names[slot]
+        fields["start"] = format_clock(None if math.isnan(fields["start_hour"]) else fields["start_hour"])
+        fields["end"] = format_clock(None if math.isnan(fields["end_hour"]) else fields["end_hour"])
+        return fields
+
+    def display(self, row_id):
+        """
+        Returns the table text of a row, in SCHEDULE_COLUMNS order.
+        """
+        slot = self._slots[row_id]
+        return schedule_values(self._names[slot], *(self._get(name, slot) for name in NUMERIC_FIELDS))
+
+    def display_rows(self):
+        """
+        Returns the table text of every row (see display()), in table order.
+        """
+        columns = self._columns
+        return [schedule_values(*values) for values in zip(self._names, *(columns[name] for name in NUMERIC_FIELDS))]
+
+    def sort_keys(self, column):
+        """
+        Returns a sort key per row (in row_ids() order) for a SCHEDULE_COLUMNS column: the typed
+        value, with names compared case-insensitively and rows without a time last.
+        """
+        name = _SORT_FIELDS[SCHEDULE_COLUMNS.index(column)]
+        if name == "appliance":
+            return [appliance.casefold() for appliance in self._names]
+        return [math.inf if value != value else value for value in self._columns[name]]
+
+    # ---------------------------
+    # CHANGING ROWS
+    # ---------------------------
+    def _append(self, row_id, appliance, values):
+        self._slots[row_id] = len(self._ids)
+        self._ids.append(row_id)
+        self._names.append(sys.intern(str(appliance)))
+        for name, value in zip(NUMERIC_FIELDS, values):
+            self._columns[name].append(value)
+
+    def add(self, row_id, power, usage_hours, count, consumption_kWh, surge=None, start_hour=None, end_hour=None,
+            appliance="", power_factor=1.0, efficiency=100.0):
+        """
+        Adds a row at the end and folds it into the totals. Re-adding an existing id replaces the row.
+        Without a surge rating the appliance starts at its rated power.
+        """
+        if row_id in self._slots:
+            self.remove(row_id)
+        values = _typed(power, power_factor, efficiency, surge, usage_hours, count, consumption_kWh,
+                        start_hour, end_hour)
+        self._append(row_id, appliance, values)
+        self._apply(values[0], values[4], values[5], values[6], 1)
+
+    def extend(self, records):
+        """
+        Adds many rows given as (row_id, fields) pairs in the form record() returns (as the
+        edit journal replays them). Each column is filled in one pass and each total takes one
+        exact sum; a later pair with the same id replaces an earlier one.
+        """
+        records = dict(records)
+        self.remove_many([row_id for row_id in records if row_id in self._slots])
+        first = len(self._ids)
+        self._ids.extend(records)
+        self._slots.update(zip(records, range(first, len(self._ids))))
+        rows = list(records.values())
+        self._names.extend([sys.intern(str(fields["appliance"])) for fields in rows])
+        columns = self._columns
+        for name in ("power", "power_factor", "efficiency", "usage_hours", "count", "consumption_kWh"):
+            columns[name].extend([float(fields[name]) for fields in rows])
+        columns["surge"].extend([float(fields["power"] if fields["surge"] is None else fields["surge"])
+                                 for fields in rows])
+        columns["start_hour"].extend(_hours([fields.get("start", "") for fields in rows]))
+        columns["end_hour"].extend(_hours([fields.get("end", "") for fields in rows]))
+        self._fold(*(columns[name][first:] for name in ("power", "usage_hours", "count", "consumption_kWh")), 1)
+
+    def _fold(self, power, usage, count, consumption, sign):
+        """
+        Adds (sign 1) or subtracts (sign -1) rows, given as columns, from the totals with one exact
+        sum per total.
+        """
+        wattage_sum, usage_sum, count_sum, consumption_sum = self._sums
+        wattage_sum.extend([sign * p * c for p, c in zip(power, count)])
+        usage_sum.extend([sign * u * c for u, c in zip(usage, count)])
+        count_sum.extend([sign * c for c in count])
+        consumption_sum.extend([sign * kWh for kWh in consumption])
+        self._publish_totals()
+
+    def update(self, row_id, power=None, usage_hours=None, count=None, consumption_kWh=None, appliance=None):
+        """
+        Changes some values of an existing row, applying only the difference to the totals.
+        """
+        slot = self._slots[row_id]
+        old = [self._get(name, slot) for name in ("power", "usage_hours", "count", "consumption_kWh")]
+        new = [value if change is None else float(change)
+               for value, change in zip(old, (power, usage_hours, count, consumption_kWh))]
+        for name, value in zip(("power", "usage_hours", "count", "consumption_kWh"), new):
+            self._columns[name][slot] = value
+        if appliance is not None:
+            self._names[slot] = sys.intern(str(appliance))
+        self._apply(*old, -1)
+        self._apply(*new, 1)
+
+    def set_window(self, row_id, start_hour, end_hour):
+        """
+        Sets the daily running window of a row (None for no time). The totals do not change.
+        """
+        slot = self._slots[row_id]
+        self._columns["start_hour"][slot] = math.nan if start_hour is None else float(start_hour)
+        self._columns["end_hour"][slot] = math.nan if end_hour is None else float(end_hour)
+        self._derived.clear()
+
+    def remove(self, row_id):
+        """
+        Removes a row and takes it out of the totals.
+        """
+        self.remove_many([row_id])
+
+    def remove_many(self, row_ids):
+        """
+        Removes several rows at once, copying each column once rather than once per row.
+        """
+        slots = sorted({self._slots[row_id] for row_id in row_ids})
+        if not slots:
+            return
+        self._fold(*([self._get(name, slot) for slot in slots]
+                     for name in ("power", "usage_hours", "count", "consumption_kWh")), -1)
+        self._ids = _without(self._ids, slots)
+        self._names = _without(self._names, slots)
+        for name, column in self._columns.items():
+            self._columns[name] = _without(column, slots)
+        self._slots = dict(zip(self._ids, range(len(self._ids))))
+
+    def clear(self):
+        self._ids.clear()
+        self._slots.clear()
+        self._names.clear()
+        for column in self._columns.values():
+            del column[:]
+        self._derived.clear()
+        self._reset_totals()
+
+    # ---------------------------
+    # DERIVED VALUES
+    # ---------------------------
+    def peaks(self):
+        """
+        Returns the coincident running and surge peaks of the schedule (load_sweep.LoadPeaks),
+        swept once per change of the rows.
+        """
+        if "peaks" not in self._derived:
+            self._derived["peaks"] = load_peaks(self.rows())
+        return self._derived["peaks"]
+
+    def profile(self):
+        """
+        Returns the average load of each hour of the day (year_simulation.load_profile) as a
+        read-only array, computed from the columns once per change of the rows. Imports NumPy on first use.
+        """
+        if "profile" not in self._derived:
+            import numpy as np
+            from year_simulation import load_profile
+            power, usage_hours, count, start_hour, end_hour = (
+                np.frombuffer(self._columns[name], dtype=float)
+                for name in ("power", "usage_hours", "count", "start_hour", "end_hour"))
+            profile = load_profile(power, usage_hours, count, start_hour, end_hour)
+            profile.flags.writeable = False
+            self._derived["profile"] = profile
+        return self._derived["profile"]
+
+    def summary(self, peaks=None):
+        """
+        Returns the totals the sizing engine needs as a LoadSummary, including the peaks
+        (computed here unless given).
+        """
+        peaks = peaks or self.peaks()
+        return LoadSummary(self.total_wattage, self.total_consumption_kWh, peaks.coincident_W, peaks.surge_W)
+
+    def stats(self):
+        """
+        Returns the row count and the bytes held by the numeric columns.
+        """
+        return {"rows": len(self._ids),
+                "column_bytes": sum(column.itemsize * len(column) for column in self._columns.values())}
+
+
+def _typed(power, power_factor, efficiency, surge, usage_hours, count, consumption_kWh, start_hour, end_hour):
+    """
+    Returns the values of a row as floats in NUMERIC_FIELDS order.
+    """
+    return (float(power), float(power_factor), float(efficiency), float(power if surge is None else surge),
+            float(usage_hours), float(count), float(consumption_kWh),
+            math.nan if start_hour is None else float(start_hour), math.nan if end_hour is None else float(end_hour))
+
+
+def _hours(texts):
+    """
+    Returns parse_clock() of many times of day, parsing each distinct text once; NaN where blank.
+    """
+    hours = {}
+    for text in set(texts):
+        hour = parse_clock(text)
+        hours[text] = math.nan if hour is None else hour
+    return [hours[text] for text in texts]
+
+
+def _without(sequence, slots):
+    """
+    Returns a copy of a list or array without the items at slots (sorted), copying the runs between them.
+    """
+    result = sequence[:slots[0]]
+    for start, end in zip(slots, slots[1:] + [len(sequence)]):
+        result += sequence[start + 1:end]
+    return result
@@ -0,0 +1,164 @@
+# load_sweep.py
+# This file finds the coincident running peak and the worst motor-start surge of a load schedule.
+# Rows with a start and end time only run inside that window; rows without times are assumed to
+# run around the clock, which is the old "everything at once" assumption. A sweep line over the
+# start/end events (sorted once, O(n log n)) tracks the running load, and a max-heap of the running
+# appliances' surge headroom (surge - rated power) gives the largest single start at every moment.
+
+import datetime
+import heapq
+from dataclasses import dataclass
+
+HOURS_PER_DAY = 24
+
+
+@dataclass(frozen=True)
+class LoadPeaks:
+    """
+    Coincident peaks of a schedule. coincident_W is the highest total running load and
+    surge_W the highest running load plus one motor start; the hours are when each first
+    occurs, and surge_row is the index of the row whose start causes surge_W (-1 if none).
+    """
+    coincident_W: float
+    coincident_hour: float
+    surge_W: float
+    surge_hour: float
+    surge_row: int
+
+
+def parse_clock(text):
+    """
+    Parses a time of day ("18", "18:30", "6:05", "18:30:00", "6:30 PM", or a datetime.time as
+    spreadsheets and Parquet files store it) into hours; blank text gives None.
+    Raises ValueError for anything else.
+    """
+    if isinstance(text, (datetime.time, datetime.datetime)):
+        return text.hour + text.minute / 60 + text.second / 3600
+    text = str(text).strip()
+    if not text:
+        return None
+    clock, meridiem = text.upper(), None
+    if clock.endswith(("AM", "PM")):
+        clock, meridiem = clock[:-2].strip(), clock[-2:]
+    try:
+        parts = [int(part) for part in clock.split(":")]
+        if len(parts) > 3 or meridiem and not 1 <= parts[0] <= 12:
+            raise ValueError
+    except ValueError:
+        raise ValueError(f"Invalid time of day: {text!r}") from None
+    hours, minutes, seconds = parts + [0] * (3 - len(parts))
+    if meridiem:
+        hours = hours % 12 + (12 if meridiem == "PM" else 0)
+    minutes += seconds / 60
+    if not (0 <= hours <= HOURS_PER_DAY and 0 <= minutes < 60 and 0 <= seconds < 60) or hours * 60 + minutes > HOURS_PER_DAY * 60:
+        raise ValueError(f"Invalid time of day: {text!r}")
+    return hours + minutes / 60
+
+
+def format_clock(hour):
+    """
+    Formats hours as "HH:MM"; None gives "".
+    """
+    if hour is None:
+        return ""
+    minutes = round(hour * 60)
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def window_hours(start_hour, end_hour):
+    """
+    Returns the length (hours) of a daily running window. No times, or equal start and end,
+    mean all day.
+    """
+    if start_hour is None or end_hour is None:
+        return float(HOURS_PER_DAY)
+    return (end_hour - start_hour) % HOURS_PER_DAY or float(HOURS_PER_DAY)
+
+
+def _windows(start_hour, end_hour):
+    """
+    Returns the [start, end) intervals of a daily window, split at midnight if it wraps.
+    No times, or equal start and end, mean all day.
+    """
+    if start_hour is None or end_hour is None or start_hour == end_hour:
+        return [(0.0, float(HOURS_PER_DAY))]
+    start_hour %= HOURS_PER_DAY
+    end_hour %= HOURS_PER_DAY
+    if start_hour < end_hour:
+        return [(start_hour, end_hour)]
+    windows = [(start_hour, float(HOURS_PER_DAY))]
+    if end_hour > 0:
+        windows.append((0.0, end_hour))
+    return windows
+
+
+def load_peaks(rows):
+    """
+    Sweeps a schedule given as LoadModel rows (power_W, usage_hours, count, consumption_kWh,
+    surge_W, start_hour, end_hour) and returns its LoadPeaks.
+    Each row runs count units of power_W; only one unit starts at a time, adding surge_W - power_W.
+    """
+    events = []
+    for index, row in enumerate(rows):
+        power, _, count, _, surge, start_hour, end_hour = row
+        for start, end in _windows(start_hour, end_hour):
+            # Ends sort before starts at the same time: back-to-back windows do not overlap.
+            events.append((start, 1, index))
+            events.append((end, 0, index))
+    events.sort()
+
+    running = 0.0
+    active = [0] * len(rows)
+    starts = []  # Max-heap of (-surge headroom, row index); rows that stopped are dropped lazily
+    coincident_W, coincident_hour = 0.0, 0.0
+    surge_W, surge_hour, surge_row = 0.0, 0.0, -1
+    i = 0
+    while i < len(events):
+        hour = events[i][0]
+        while i < len(events) and events[i][0] == hour:
+            _, starting, index = events[i]
+            power, _, count, _, surge, _, _ = rows[index]
+            if starting:
+                active[index] += 1
+                running += power * count
+                heapq.heappush(starts, (-max(surge - power, 0.0), index))
+            else:
+                active[index] -= 1
+                running -= power * count
+            i += 1
+        if hour >= HOURS_PER_DAY:
+            break
+        while starts and not active[starts[0][1]]:
+            heapq.heappop(starts)
+        if running > coincident_W:
+            coincident_W, coincident_hour = running, hour
+        headroom, index = (-starts[0][0], starts[0][1]) if starts else (0.0, -1)
+        if running + headroom > surge_W:
+            surge_W, surge_hour, surge_row = running + headroom, hour, index
+    return LoadPeaks(coincident_W, coincident_hour, surge_W, surge_hour, surge_row)
+
+
+# ---------------------------
+# PRESENTATION HELPERS
+# ---------------------------
+def peak_rows(peaks, total_wattage, surge_name=None, params=None):
+    """
+    Returns the (Component, Requirement/Selection, Details) rows added to solar_tree.
+    surge_name is the appliance whose start causes the surge peak, if known. With the
+    SizingParams of the design, a last row tells which peak the inverter was sized for.
+    """
+    surge_detail = f"at {format_clock(peaks.surge_hour)}"
+    if surge_name:
+        surge_detail = f"{surge_name} starting {surge_detail}"
+    rows = [
+        ("Coincident Peak (W)", f"{peaks.coincident_W:,.0f}",
+         f"at {format_clock(peaks.coincident_hour)}; all loads at once: {total_wattage:,.0f}W"),
+        ("Surge Peak (W)", f"{peaks.surge_W:,.0f}", surge_detail),
+    ]
+    if params is not None:
+        running_W = peaks.coincident_W * params.inverter_margin
+        starting_W = peaks.surge_W / params.inverter_surge_factor
+        rows.append(("Inverter Sized For", "Surge peak" if starting_W > running_W else "Coincident peak",
+                     f"max({peaks.coincident_W:,.0f}W x {params.inverter_margin:g}, "
+                     f"{peaks.surge_W:,.0f}W / {params.inverter_surge_factor:g}) = {max(running_W, starting_W):,.0f}W"))
+    return rows
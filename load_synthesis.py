@@ -0,0 +1,244 @@
+# load_synthesis.py
+# This file synthesizes randomized minute-by-minute load traces from the load schedule.
+# year_simulation works with hourly averages of a fixed daily profile, which hide the short peaks
+# that trip inverters. Here every unit of every appliance runs its usage hours on a random block
+# each day (random length around usage_hours, random start inside its running window), and each
+# start adds the appliance's surge headroom. A year at 1-minute resolution is 525,600 steps, so
+# synthesize_minutes() streams it as chunks of CHUNK_DAYS days, vectorized across appliances and
+# days, and minute_stats() folds the chunks into peak-demand and C-rate figures. Every unit adds
+# its on/off steps into the one load of the chunk, so memory does not grow with the schedule.
+# MinuteStatsRun does the synthesis on a background thread for the GUIs.
+
+import queue
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from load_sweep import window_hours
+from year_simulation import DAYS_PER_YEAR, HOURS_PER_DAY, LOAD_CENTRE_HOUR, Losses
+
+MINUTES_PER_HOUR = 60
+MINUTES_PER_DAY = HOURS_PER_DAY * MINUTES_PER_HOUR
+CHUNK_DAYS = 7  # Days per chunk; a chunk holds CHUNK_DAYS x 1440 values
+
+USAGE_SIGMA = 0.20  # Spread of a day's running time around usage_hours (lognormal)
+START_SIGMA_MIN = 60  # Spread of the start of untimed appliances around LOAD_CENTRE_HOUR (minutes)
+HISTOGRAM_BINS = 2000  # Resolution of the streamed load distribution used for percentiles
+STAT_PERCENTILE = 99
+
+
+@dataclass(frozen=True)
+class MinuteChunk:
+    """
+    CHUNK_DAYS (or fewer) synthesized days starting at first_day.
+    load_W[day, minute] is the running load of the schedule, start_W[day, minute] the surge
+    headroom of the units that start in that minute. capacity_W is the load with every unit
+    running, the ceiling of load_W.
+    """
+    first_day: int
+    load_W: np.ndarray
+    start_W: np.ndarray
+    capacity_W: float
+
+
+@dataclass(frozen=True)
+class MinuteStats:
+    """
+    Peak-demand statistics of synthesized minute traces. Loads are on the AC side in W; the
+    C-rates are the battery discharge current at that load divided by battery_Ah (1/h).
+    peak_day and peak_minute locate peak_W; surge_peak_W adds motor starts to the running load.
+    """
+    days: int
+    mean_W: float
+    hourly_peak_W: float
+    p99_W: float
+    peak_W: float
+    peak_day: int
+    peak_minute: int
+    surge_peak_W: float
+    p99_c_rate: float
+    peak_c_rate: float
+    surge_c_rate: float
+
+
+# ---------------------------
+# SYNTHESIS
+# ---------------------------
+def _units(rows):
+    """
+    Expands LoadModel rows into one entry per unit. Returns the row index, power, surge
+    headroom, usage minutes, window start and window length (minutes) of every unit;
+    untimed rows get a NaN window start.
+    """
+    counts = np.array([max(int(round(row[2])), 0) for row in rows], dtype=int)
+    index = np.repeat(np.arange(len(rows)), counts)
+    power, usage, surge = (np.array([float(row[i]) for row in rows])[index] for i in (0, 1, 4))
+    window_start = np.full(len(rows), np.nan)
+    window_length = np.full(len(rows), float(MINUTES_PER_DAY))
+    for i, row in enumerate(rows):
+        hours = window_hours(row[5], row[6])
+        if hours < HOURS_PER_DAY:
+            window_start[i] = row[5] * MINUTES_PER_HOUR
+            window_length[i] = hours * MINUTES_PER_HOUR
+    return (index, power, np.maximum(surge - power, 0.0), usage * MINUTES_PER_HOUR,
+            window_start[index], window_length[index])
+
+
+def synthesize_minutes(rows, days=DAYS_PER_YEAR, chunk_days=CHUNK_DAYS, seed=None):
+    """
+    Yields MinuteChunks covering days days of a schedule given as LoadModel rows.
+    Each unit runs once a day for a lognormal-jittered share of its usage hours: timed rows start
+    at a uniform time that keeps the block inside their window (and no block is longer than the
+    window), untimed rows start around
+    LOAD_CENTRE_HOUR. Blocks that run past midnight wrap into the same day.
+    """
+    rng = np.random.default_rng(seed)
+    index, power, headroom, usage_min, window_start, window_length = _units(rows)
+    timed = ~np.isnan(window_start)
+    capacity_W = float(power.sum())
+
+    for first_day in range(0, days, chunk_days):
+        n_days = min(chunk_days, days - first_day)
+        start_W = np.zeros((n_days, MINUTES_PER_DAY))
+        if not len(index):
+            yield MinuteChunk(first_day, np.zeros((n_days, MINUTES_PER_DAY)), start_W, capacity_W)
+            continue
+
+        shape = (len(index), n_days)
+        jitter = rng.lognormal(-USAGE_SIGMA ** 2 / 2, USAGE_SIGMA, shape)
+        duration = np.clip(np.round(usage_min[:, None] * jitter), 0, MINUTES_PER_DAY)
+        duration[usage_min >= MINUTES_PER_DAY] = MINUTES_PER_DAY
+        duration = np.minimum(duration, window_length[:, None])
+        slack = np.maximum(window_length[:, None] - duration, 0)
+        start = np.where(
+            timed[:, None],
+            np.nan_to_num(window_start)[:, None] + rng.random(shape) * slack,
+            LOAD_CENTRE_HOUR * MINUTES_PER_HOUR - duration / 2 + rng.normal(0, START_SIGMA_MIN, shape),
+        )
+        start = np.floor(start).astype(int) % MINUTES_PER_DAY
+
+        # Each block adds its power at its start minute and removes it at its end; a running sum
+        # over the minutes turns these steps into the load of the day.
+        end = start + duration.astype(int)
+        wraps = end > MINUTES_PER_DAY
+        steps = np.zeros((n_days, MINUTES_PER_DAY + 1))
+        unit, day = np.nonzero(duration > 0)
+        unit_W = power[unit]
+        np.add.at(steps, (day, start[unit, day]), unit_W)
+        np.add.at(steps, (day, np.where(wraps[unit, day], MINUTES_PER_DAY, end[unit, day])), -unit_W)
+        unit, day = np.nonzero(wraps)
+        np.add.at(steps, (day, 0), power[unit])
+        np.add.at(steps, (day, end[unit, day] - MINUTES_PER_DAY), -power[unit])
+        load_W = np.cumsum(steps[:, :MINUTES_PER_DAY], axis=1)
+
+        # A unit that runs all day never starts; the rest start once a day
+        unit, day = np.nonzero((duration > 0) & (duration < MINUTES_PER_DAY))
+        np.add.at(start_W, (day, start[unit, day]), headroom[unit])
+        yield MinuteChunk(first_day, load_W, start_W, capacity_W)
+
+
+# ---------------------------
+# STATISTICS
+# ---------------------------
+def minute_stats(chunks, result, losses=Losses()):
+    """
+    Folds a stream of MinuteChunks into MinuteStats for the design of a SizingResult, keeping
+    only a fixed-size histogram of the load between chunks (p99_W is accurate to one bin).
+    """
+    days = 0
+    total_W = 0.0
+    hourly_peak_W = peak_W = surge_peak_W = 0.0
+    peak_day = peak_minute = 0
+    histogram = None
+    for chunk in chunks:
+        load = chunk.load_W
+        if histogram is None:
+            edges = np.linspace(0, max(chunk.capacity_W, 1.0), HISTOGRAM_BINS + 1)
+            histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+        histogram += np.histogram(np.minimum(load, edges[-1]), edges)[0]
+        days += load.shape[0]
+        total_W += float(load.sum())
+        hourly_peak_W = max(hourly_peak_W, float(load.reshape(load.shape[0], HOURS_PER_DAY, -1).mean(axis=2).max()))
+        day, minute = np.unravel_index(np.argmax(load), load.shape)
+        if load[day, minute] > peak_W:
+            peak_W, peak_day, peak_minute = float(load[day, minute]), chunk.first_day + int(day), int(minute)
+        surge_peak_W = max(surge_peak_W, float((load + chunk.start_W).max()))
+
+    if not days:
+        return MinuteStats(0, 0.0, 0.0, 0.0, 0.0, 0, 0, 0.0, 0.0, 0.0, 0.0)
+    cumulative = np.cumsum(histogram)
+    p99_W = float(edges[np.searchsorted(cumulative, cumulative[-1] * STAT_PERCENTILE / 100) + 1])
+    p99_W = min(p99_W, peak_W)
+    # Battery current (A) per W of AC load, divided by the bank's Ah
+    c_per_W = 1 / (losses.inverter_efficiency * losses.discharge_efficiency
+                   * result.system_voltage * result.battery_Ah_req)
+    return MinuteStats(
+        days=days,
+        mean_W=total_W / (days * MINUTES_PER_DAY),
+        hourly_peak_W=hourly_peak_W,
+        p99_W=p99_W,
+        peak_W=peak_W,
+        peak_day=peak_day,
+        peak_minute=peak_minute,
+        surge_peak_W=surge_peak_W,
+        p99_c_rate=p99_W * c_per_W,
+        peak_c_rate=peak_W * c_per_W,
+        surge_c_rate=surge_peak_W * c_per_W,
+    )
+
+
+def minute_text(stats):
+    """
+    Returns a one-line summary of MinuteStats for the GUIs.
+    """
+    clock = f"{stats.peak_minute // MINUTES_PER_HOUR:02d}:{stats.peak_minute % MINUTES_PER_HOUR:02d}"
+    return (f"Minute load over {stats.days} days: mean {stats.mean_W:,.0f}W, hourly peak {stats.hourly_peak_W:,.0f}W, "
+            f"P{STAT_PERCENTILE} {stats.p99_W:,.0f}W, peak {stats.peak_W:,.0f}W (day {stats.peak_day + 1} {clock}), "
+            f"with starts {stats.surge_peak_W:,.0f}W; battery C-rate P{STAT_PERCENTILE} {stats.p99_c_rate:.2f}C, "
+            f"peak {stats.peak_c_rate:.2f}C, with starts {stats.surge_c_rate:.2f}C")
+
+
+class MinuteStatsRun:
+    """
+    minute_stats() of a year synthesized for rows, on a background thread, for the GUIs.
+    poll() returns the events received so far: "progress" events (days done of total), then a
+    "done" event (carrying the MinuteStats) or an "error" event. cancel() stops the run at the
+    next chunk.
+    """
+
+    def __init__(self, rows, result, days=DAYS_PER_YEAR, seed=None):
+        self.finished = False
+        self._cancelled = threading.Event()
+        self._events = queue.Queue()
+        threading.Thread(target=self._run, args=(rows, result, days, seed), name="minute-stats", daemon=True).start()
+
+    def _run(self, rows, result, days, seed):
+        def chunks():
+            for chunk in synthesize_minutes(rows, days, seed=seed):
+                if self._cancelled.is_set():
+                    return
+                yield chunk
+                self._events.put({"event": "progress", "done": min(chunk.first_day + CHUNK_DAYS, days), "total": days})
+
+        try:
+            stats = minute_stats(chunks(), result)
+        except Exception as e:
+            self._events.put({"event": "error", "error": str(e)})
+        else:
+            self._events.put({"event": "done", "stats": stats})
+
+    def poll(self):
+        events = []
+        while not self.finished:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            events.append(event)
+            self.finished = event["event"] in ("done", "error")
+        return events
+
+    def cancel(self):
+        self.finished = True
+        self._cancelled.set()
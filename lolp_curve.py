@@ -0,0 +1,73 @@
+# lolp_curve.py
+# This file computes the trade-off between PV array size and battery capacity for a load schedule.
+# Every (PV W, battery Ah) pair of a grid around the sized design is simulated over the same year
+# in one year_simulation.simulate_batch() call; the loss-of-load probability (share of hours with
+# unmet load) of each pair then gives, for every array size, the smallest battery that reaches a
+# target LOLP. That curve replaces the single point of calculate_gen_set when quoting.
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from year_simulation import HOURS_PER_YEAR, Losses, default_pv_profile, schedule_profile, simulate_batch
+
+TARGET_LOLP = 0.01  # Unmet load in at most 1% of the hours (about 88 hours a year)
+
+# Grid, relative to the sized design: 0.5x to 3x its array, 0.25x to 4x its battery (9% steps)
+PV_FACTORS = np.linspace(0.5, 3.0, 26)
+BATTERY_FACTORS = np.geomspace(0.25, 4.0, 32)
+
+
+@dataclass(frozen=True)
+class LolpSurface:
+    """
+    LOLP of every grid pair: lolp[i, j] is the share of hours with unmet load for pv_W[i]
+    of PV and battery_Ah[j] of battery at the design's system voltage and DoD.
+    """
+    pv_W: np.ndarray
+    battery_Ah: np.ndarray
+    lolp: np.ndarray
+
+    def curve(self, target=TARGET_LOLP):
+        """
+        Returns (pv_W, battery_Ah) of the iso-LOLP curve: for every array size, the smallest
+        grid battery whose LOLP is at most target. Array sizes that miss the target even with
+        the largest battery are left out.
+        """
+        meets = self.lolp <= target
+        reachable = meets.any(axis=1)
+        smallest = np.argmax(meets, axis=1)
+        return self.pv_W[reachable], self.battery_Ah[smallest[reachable]]
+
+
+def lolp_surface(rows, result, pv_factors=PV_FACTORS, battery_factors=BATTERY_FACTORS,
+                 pv_per_W=None, losses=Losses()):
+    """
+    Simulates the grid around a SizingResult for a load schedule given as LoadModel rows
+    and returns a LolpSurface.
+    """
+    if pv_per_W is None:
+        pv_per_W = default_pv_profile()
+    pv_W = result.total_pv_capacity * np.asarray(pv_factors, dtype=float)
+    battery_Ah = result.battery_Ah_req * np.asarray(battery_factors, dtype=float)
+    grid_pv, grid_Ah = np.meshgrid(pv_W, battery_Ah, indexing='ij')
+    simulation = simulate_batch(schedule_profile(rows), pv_per_W, grid_pv.ravel(),
+                                grid_Ah.ravel() * result.system_voltage, result.dod, losses)
+    lolp = simulation.loss_of_load_hours.reshape(grid_pv.shape) / HOURS_PER_YEAR
+    return LolpSurface(pv_W=pv_W, battery_Ah=battery_Ah, lolp=lolp)
+
+
+def plot_curve(ax, surface, result, target=TARGET_LOLP):
+    """
+    Draws the iso-LOLP curve and the sized design onto a matplotlib Axes.
+    """
+    ax.clear()
+    curve_pv, curve_Ah = surface.curve(target)
+    ax.step(curve_pv, curve_Ah, where='post', color='tab:blue', label=f"LOLP <= {target:.0%}")
+    ax.plot([result.total_pv_capacity], [result.battery_Ah_req], 'o', color='tab:red', label="Sized design")
+    ax.set_xlabel("PV array (W)")
+    ax.set_ylabel(f"Battery (Ah @ {float(result.system_voltage):.0f} V, DoD {result.dod:.0f}%)")
+    ax.set_xlim(surface.pv_W[0], surface.pv_W[-1])
+    ax.set_ylim(0, surface.battery_Ah[-1])
+    ax.grid(True, alpha=0.3)
+    ax.legend(loc='upper right')
@@ -164,3 +164,38 @@ ACTIVE_BALANCER_SIZES = [
 FUSE_SIZES = [
     5, 7.5, 10, 15, 20, 25, 30, 40, 50, 60, 80, 100, 120, 150, 200
 ]
+
+# ---------------------------
+# COMPONENT PRICES (PHP)
+# ---------------------------
+# Approximate retail prices, used by the design optimizer (design_search.py) to rank designs.
+# Each component kind of the catalog is priced as (base price, price per rating unit):
+# per W for inverters, per mm² for the inverter cable run and per A for everything else.
+COMPONENT_PRICES = {
+    "inverter": (2000, 8),
+    "mppt": (1500, 60),
+    "scc": (500, 40),
+    "dc_breaker": (300, 8),
+    "ac_breaker": (250, 6),
+    "balancer": (800, 30),
+    "fuse": (100, 4),
+    "cable": (0, 60),
+}
+
+# Solar panels: price per W plus mounting and wiring per panel
+PANEL_PRICE_PER_W = 25
+PANEL_INSTALL_COST = 800
+
+# ---------------------------
+# BATTERY UNITS AND LIFE
+# ---------------------------
+# Battery banks are built from strings of 12 V units of one of the AH sizes above.
+BATTERY_UNIT_VOLTAGE = 12
+BATTERY_PRICE_PER_KWH = 9000
+BATTERY_UNIT_COST = 1500  # Case, terminals and interconnects per unit
+
+# Cycle life at 100% DoD; shallower cycles last longer, roughly (100 / DoD) ** exponent times as many.
+BATTERY_CYCLES_AT_FULL_DOD = 500
+BATTERY_CYCLE_EXPONENT = 1.4
+# Designs are compared over this many years, including battery replacements.
+PROJECT_YEARS = 10
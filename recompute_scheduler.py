@@ -0,0 +1,85 @@
+# recompute_scheduler.py
+# This file holds the recompute scheduler used by the GUIs.
+# UI events only mark work as dirty; the actual sizing and CSV save run once the burst of
+# events has settled (or has gone on for max_wait_ms), through a single root.after callback.
+
+import time
+
+
+class RecomputeScheduler:
+    """
+    Debounced, coalesced runner for expensive UI recomputations.
+
+    Tasks are registered by name (e.g. "size" -> calculate_gen_set, "save" -> save_to_csv)
+    and run in registration order. request() marks tasks dirty and (re)arms one root.after
+    timer; every request that arrives while a run is already pending is folded into it and
+    counted as skipped, so typing a 30-character name costs one sizing pass, not 30.
+    The timer is never pushed back beyond max_wait_ms after the first request of a burst,
+    so a steady stream of events (holding a key down) still runs the tasks that often.
+    """
+
+    def __init__(self, root, delay_ms=100, max_wait_ms=500):
+        self.root = root
+        self.delay_ms = delay_ms
+        self.max_wait_ms = max_wait_ms
+        self._tasks = []
+        self._dirty = set()
+        self._after_id = None
+        self._deadline = None  # When the pending run must happen at the latest (time.monotonic())
+        self.requests = 0
+        self.runs = 0
+        self.skipped = 0
+
+    def register(self, name, callback):
+        """
+        Registers a task. Tasks run in the order they were registered.
+        """
+        self._tasks.append((name, callback))
+
+    def request(self, *names):
+        """
+        Marks the named tasks dirty and schedules a run after the debounce delay.
+        """
+        self.requests += 1
+        self._dirty.update(names)
+        now = time.monotonic()
+        if self._after_id is None:
+            self._deadline = now + self.max_wait_ms / 1000
+        else:
+            # Fold this request into the pending run and restart the debounce window.
+            self.skipped += 1
+            self.root.after_cancel(self._after_id)
+        # The window never reaches past the deadline of the burst.
+        delay_ms = min(self.delay_ms, max(0, round((self._deadline - now) * 1000)))
+        self._after_id = self.root.after(delay_ms, self._run)
+
+    def flush(self):
+        """
+        Runs any pending tasks right away, e.g. before drawing or closing.
+        """
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._run()
+
+    def cancel(self):
+        """
+        Drops pending work without running it.
+        """
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = None
+        self._dirty.clear()
+
+    def _run(self):
+        self._after_id = None
+        dirty, self._dirty = self._dirty, set()
+        self.runs += 1
+        for name, callback in self._tasks:
+            if name in dirty:
+                callback()
+
+    def stats(self):
+        """
+        Returns the request/run/skip counters.
+        """
+        return {"requests": self.requests, "runs": self.runs, "skipped": self.skipped}
@@ -0,0 +1,254 @@
+# render_worker.py
+# This file runs schematic rendering (Solar_Setup.png) in a separate, pre-warmed process.
+# The worker imports matplotlib with the Agg backend once at startup, then renders jobs it reads
+# from stdin as JSON lines and reports progress on stdout. The GUI talks to it through
+# SchematicRenderer and polls for events with root.after, so the Tk main thread never blocks
+# on matplotlib.
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+# Command-line flag that turns the packaged executable into the render worker (see solar.py).
+WORKER_FLAG = "--render-worker"
+
+
+# ---------------------------
+# WORKER PROCESS
+# ---------------------------
+def _warm_up():
+    """
+    Imports matplotlib, builds the schematic template and renders it once, so fonts, the Agg
+    canvas and the static layout are all ready before the first job.
+    """
+    import io
+    import matplotlib
+    matplotlib.use("Agg")
+    import schematic
+
+    schematic.render_png({key: "warm-up" for key in list(schematic.BOXES) + ["cable"]}, io.BytesIO())
+    return schematic
+
+
+def serve(stdin=None, stdout=None):
+    """
+    Worker main loop. Only the newest job is rendered: jobs that were superseded while waiting,
+    or cancelled before their file was written, are reported as "cancelled".
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    # Anything else printed by libraries goes to stderr so it cannot corrupt the protocol.
+    printed, sys.stdout = sys.stdout, sys.stderr
+    try:
+        _serve(stdin, stdout)
+    finally:
+        sys.stdout = printed
+
+
+def _serve(stdin, stdout):
+    def send(**event):
+        stdout.write(json.dumps(event) + "\n")
+        stdout.flush()
+
+    cond = threading.Condition()
+    jobs = []
+    cancelled = set()
+    closing = []
+
+    def read_jobs():
+        for line in stdin:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            with cond:
+                if "cancel" in message:
+                    cancelled.add(message["cancel"])
+                elif "job" in message:
+                    jobs.append(message)
+                cond.notify()
+        with cond:
+            closing.append(True)
+            cond.notify()
+
+    threading.Thread(target=read_jobs, name="render-jobs", daemon=True).start()
+
+    try:
+        schematic = _warm_up()
+    except Exception as e:
+        send(event="error", job=None, error=f"Cannot load matplotlib: {e}")
+        return
+    send(event="ready", job=None)
+
+    while True:
+        with cond:
+            while not jobs and not closing:
+                cond.wait()
+            if not jobs:
+                return
+            stale, job = jobs[:-1], jobs[-1]
+            jobs.clear()
+        for old in stale:
+            send(event="cancelled", job=old["job"])
+        job_id = job["job"]
+        if job_id in cancelled:
+            send(event="cancelled", job=job_id)
+            continue
+
+        send(event="started", job=job_id)
+        started = time.perf_counter()
+        path = job["path"]
+        temp_path = path + ".tmp"
+        try:
+            schematic.render_png(job["labels"], temp_path, dpi=job.get("dpi", schematic.DPI))
+            with cond:
+                stale_now = job_id in cancelled or bool(jobs)
+            if stale_now:
+                os.remove(temp_path)
+                send(event="cancelled", job=job_id)
+                continue
+            os.replace(temp_path, path)
+        except Exception as e:
+            send(event="error", job=job_id, error=str(e))
+            continue
+        send(event="done", job=job_id, path=path, ms=(time.perf_counter() - started) * 1000)
+
+
+# ---------------------------
+# GUI SIDE
+# ---------------------------
+def worker_command():
+    """
+    Returns the command line that starts a render worker.
+    A PyInstaller build has no separate Python, so it re-runs its own executable with WORKER_FLAG.
+    """
+    if getattr(sys, "frozen", False):
+        return [sys.executable, WORKER_FLAG]
+    return [sys.executable, os.path.abspath(__file__)]
+
+
+class SchematicRenderer:
+    """
+    Client for the render worker.
+
+    start() launches the worker ahead of time so matplotlib is already imported when the user
+    clicks Draw. submit() queues a job and returns its id; a newer job makes older ones stale,
+    and poll() only reports events of the current job. If the worker dies it is restarted by
+    the next submit().
+    """
+
+    def __init__(self, command=None):
+        self.command = command or worker_command()
+        self.current = None
+        self.ready = False
+        self.worker_error = None
+        self._process = None
+        self._events = queue.Queue()
+        self._next_job = 1
+
+    @property
+    def busy(self):
+        return self.current is not None
+
+    def start(self):
+        """
+        Starts the worker process if it is not running. Raises OSError if it cannot be started.
+        """
+        if self._process is not None and self._process.poll() is None:
+            return
+        flags = subprocess.CREATE_NO_WINDOW if sys.platform.startswith('win') else 0
+        self.ready = False
+        self._process = subprocess.Popen(
+            self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            text=True, encoding='utf-8', bufsize=1, creationflags=flags,
+        )
+        threading.Thread(target=self._read_events, args=(self._process,),
+                         name="render-events", daemon=True).start()
+
+    def _read_events(self, process):
+        for line in process.stdout:
+            try:
+                self._events.put(json.loads(line))
+            except ValueError:
+                continue
+        # Reap the worker, so a restart after this event never finds it still running
+        process.stdout.close()
+        process.wait()
+        self._events.put({"event": "exit", "job": None})
+
+    def _send(self, message):
+        self._process.stdin.write(json.dumps(message) + "\n")
+        self._process.stdin.flush()
+
+    def submit(self, labels, path, dpi=None):
+        """
+        Queues a render of labels into path and returns the job id.
+        """
+        self.start()
+        job_id = self._next_job
+        self._next_job += 1
+        message = {"job": job_id, "labels": labels, "path": os.path.abspath(path)}
+        if dpi is not None:
+            message["dpi"] = dpi
+        self._send(message)
+        self.current = job_id
+        return job_id
+
+    def cancel(self):
+        """
+        Cancels the current job; its file is not written unless rendering had already finished.
+        """
+        if self.current is None:
+            return
+        try:
+            self._send({"cancel": self.current})
+        except (OSError, ValueError):
+            pass
+        self.current = None
+
+    def poll(self):
+        """
+        Returns the events of the current job received since the last call. The job ends with
+        a "done", "error" or "cancelled" event; if the worker died, that is reported as "error".
+        """
+        events = []
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if event["event"] == "ready":
+                self.ready = True
+            elif event["event"] == "error" and event["job"] is None:
+                self.worker_error = event["error"]
+            elif event["event"] == "exit" and self.current is not None:
+                error = self.worker_error or "The render worker stopped."
+                event = {"event": "error", "job": self.current, "error": error}
+            if self.current is None or event["job"] != self.current:
+                continue
+            events.append(event)
+            if event["event"] in ("done", "error", "cancelled"):
+                self.current = None
+        return events
+
+    def close(self, timeout=2.0):
+        """
+        Stops the worker. A render in progress is abandoned.
+        """
+        process, self._process = self._process, None
+        self.current = None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            process.kill()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,291 @@
+# schedule_import.py
+# This file streams large load schedules into the load model.
+# Facility audits arrive as spreadsheets with tens of thousands of lines, too many to enter one
+# Add click at a time. ScheduleImport reads a CSV file (or a Parquet file when pyarrow is
+# installed) CHUNK_ROWS rows at a time, so the GUIs can add each chunk to the load model and the
+# journal and move a progress bar between chunks, without ever holding the whole file.
+# Every row is checked against the appliance catalog, which fills in PF, efficiency and surge
+# (and the rated power when the file has none); rows that cannot be used are skipped and
+# reported with their line number, and a start or end time that cannot be read, or a window too
+# short for the usage hours, is cleared (the appliance is then taken to run around the clock)
+# and reported. load_Sched.csv reads back too: a CSV schedule ends at its
+# first blank line, which is where the summary sections of load_Sched.csv begin.
+
+import csv
+import math
+import os
+
+from load_sweep import format_clock, parse_clock, window_hours
+
+CHUNK_ROWS = 5000
+MAX_ERRORS = 100  # Skipped rows whose reason is kept for the report
+
+# Values used when neither the file nor the catalog has one (as add_appliance does)
+DEFAULT_USAGE_HOURS = 6
+DEFAULT_COUNT = 1
+DEFAULT_POWER_FACTOR = 1.0
+DEFAULT_EFFICIENCY = 100
+
+# Accepted headers of each field, compared case-insensitively: the columns of load_Sched.csv,
+# those of Appliances.csv, and a few common spreadsheet names
+HEADERS = {
+    "appliance": ("appliance", "name"),
+    "power": ("power (w)", "rated power (w)", "power"),
+    "power_factor": ("pf", "power factor (pf)", "power factor"),
+    "efficiency": ("eff(%)", "efficiency (%)", "efficiency"),
+    "surge": ("surge(w)", "surge power (w)", "surge"),
+    "usage_hours": ("usage (hrs)", "usage hours", "hours"),
+    "count": ("count", "quantity", "qty"),
+    "start": ("start",),
+    "end": ("end",),
+}
+
+
+def _header_map(headers):
+    """
+    Returns {field: header} for the fields found among headers. Raises ValueError without an
+    appliance column.
+    """
+    names = {str(header).strip().lstrip("\ufeff").casefold(): header for header in headers if header is not None}
+    columns = {}
+    for field, accepted in HEADERS.items():
+        for name in accepted:
+            if name in names:
+                columns[field] = names[name]
+                break
+    if "appliance" not in columns:
+        raise ValueError("the file has no Appliance column")
+    return columns
+
+
+def _number(value, label):
+    """
+    Returns a cell as a float (thousands separators allowed), or None if it is blank.
+    """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    try:
+        number = float(value.replace(",", "")) if isinstance(value, str) else float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{label} is not a number: {value!r}") from None
+    if not math.isfinite(number) or number < 0:
+        raise ValueError(f"{label} must be a positive number: {value!r}")
+    return number
+
+
+def _clock(value, label, notes):
+    """
+    Returns a time cell in hours, or None if it is blank; a time that cannot be read is cleared
+    and noted (which clears the other end of the window too).
+    """
+    try:
+        return parse_clock("" if value is None else value)
+    except ValueError as e:
+        notes.append(f"{label} cleared: {e}")
+        return None
+
+
+def _catalog_value(value):
+    # Blank catalog cells are NaN
+    return None if value is None or math.isnan(value) else value
+
+
+def schedule_fields(values, columns, catalog):
+    """
+    Returns the fields of one schedule row (as add_appliance builds them) from the cells of a
+    file row, with missing values filled from the catalog, whether the appliance is missing
+    from the catalog, and notes on the times that were cleared. Consumption is recomputed from
+    power, hours and count. Raises ValueError for a row that cannot be used.
+    """
+    def cell(field):
+        return values.get(columns[field]) if field in columns else None
+
+    appliance = str(cell("appliance") or "").strip()
+    if not appliance:
+        raise ValueError("no appliance name")
+    record = catalog.record(appliance)
+    power = _number(cell("power"), "Power")
+    if power is None and record is not None:
+        power = _catalog_value(record.power)
+    if power is None:
+        raise ValueError(f"{appliance!r} is not in the appliance catalog and has no power")
+
+    power_factor = _number(cell("power_factor"), "PF")
+    efficiency = _number(cell("efficiency"), "Efficiency")
+    surge = _number(cell("surge"), "Surge")
+    if record is not None:
+        power_factor = power_factor if power_factor is not None else _catalog_value(record.power_factor)
+        efficiency = efficiency if efficiency is not None else _catalog_value(record.efficiency)
+        surge = surge if surge is not None else _catalog_value(record.surge)
+
+    usage_hours = _number(cell("usage_hours"), "Usage hours")
+    count = _number(cell("count"), "Count")
+    usage_hours = DEFAULT_USAGE_HOURS if usage_hours is None else usage_hours
+    count = DEFAULT_COUNT if count is None else round(count)
+    notes = []
+    start_hour = _clock(cell("start"), "Start", notes)
+    end_hour = _clock(cell("end"), "End", notes)
+    if notes:
+        start_hour = end_hour = None  # A window needs both ends
+    elif usage_hours > window_hours(start_hour, end_hour):
+        notes.append(f"Start and End cleared: {usage_hours:g} usage hours do not fit between them")
+        start_hour = end_hour = None
+    fields = {
+        "appliance": appliance,
+        "power": power,
+        "power_factor": DEFAULT_POWER_FACTOR if power_factor is None else power_factor,
+        "efficiency": DEFAULT_EFFICIENCY if efficiency is None else efficiency,
+        "surge": power if surge is None else surge,
+        "usage_hours": usage_hours,
+        "count": count,
+        "consumption_kWh": power * usage_hours * count / 1000,
+        "start": format_clock(start_hour),
+        "end": format_clock(end_hour),
+    }
+    return fields, record is None, notes
+
+
+# ---------------------------
+# FILE READERS
+# ---------------------------
+def _csv_records(path):
+    """
+    Yields (line, {header: cell}, fraction of the file read) for the rows of a CSV file, up to
+    its first blank line. Reads the file line by line in binary, so the progress is exact.
+    A header row that cannot be parsed raises ValueError, as a missing Appliance column does.
+    """
+    size = os.path.getsize(path) or 1
+    done = 0
+
+    def lines(file):
+        nonlocal done
+        for line in file:
+            done += len(line)
+            yield line.decode("utf-8", errors="replace")
+
+    with open(path, "rb") as file:
+        reader = csv.reader(lines(file))
+        try:
+            headers = next(reader, [])
+        except csv.Error as e:
+            raise ValueError(f"the header row cannot be read ({e})") from None
+        columns = _header_map(headers)
+        yield columns
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                break
+            yield reader.line_num, dict(zip(headers, row)), done / size
+
+
+def _parquet_records(path, chunk_rows):
+    """
+    Yields (row number, {column: value}, fraction of the rows read) for a Parquet file.
+    Needs pyarrow, which is imported here so that it stays optional.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("reading Parquet files needs the pyarrow package") from None
+    parquet = pq.ParquetFile(path)
+    total = parquet.metadata.num_rows or 1
+    yield _header_map(parquet.schema_arrow.names)
+    line = 1
+    for batch in parquet.iter_batches(batch_size=chunk_rows):
+        for values in batch.to_pylist():
+            line += 1
+            yield line, values, (line - 1) / total
+
+
+class ScheduleImport:
+    """
+    Import of one schedule file. next_chunk() returns the fields of up to chunk_rows more usable
+    rows, or None at the end of the file. rows, skipped and unknown count the rows imported,
+    skipped and imported with their own power (not in the catalog); errors keeps (line, reason)
+    of the first MAX_ERRORS skipped rows and warnings (line, note) of the first MAX_ERRORS rows
+    imported with a time cleared (counted by cleared); done is the fraction of the file read.
+    A file that cannot be read to the end (a malformed CSV line, a read error) ends the import
+    after the rows before it, with stopped set to the reason; cancel() ends it early.
+    Raises ValueError (no Appliance column, or a header row that cannot be parsed), ImportError
+    (Parquet without pyarrow) or OSError.
+    """
+
+    def __init__(self, path, catalog, chunk_rows=CHUNK_ROWS):
+        self.path = path
+        self.catalog = catalog
+        self.chunk_rows = chunk_rows
+        if path.lower().endswith(".parquet"):
+            self._records = _parquet_records(path, chunk_rows)
+        else:
+            self._records = _csv_records(path)
+        self._columns = next(self._records)
+        self.rows = 0
+        self.skipped = 0
+        self.unknown = 0
+        self.errors = []
+        self.cleared = 0
+        self.warnings = []
+        self.done = 0.0
+        self.line = 1  # Line (or row number) of the last row read
+        self.stopped = None
+        self.cancelled = False
+        self.finished = False
+
+    def next_chunk(self):
+        if self.finished:
+            return None
+        chunk = []
+        try:
+            for self.line, values, self.done in self._records:
+                try:
+                    fields, unknown, notes = schedule_fields(values, self._columns, self.catalog)
+                except ValueError as e:
+                    self.skipped += 1
+                    if len(self.errors) < MAX_ERRORS:
+                        self.errors.append((self.line, str(e)))
+                    continue
+                chunk.append(fields)
+                self.unknown += unknown
+                if notes:
+                    self.cleared += 1
+                    if len(self.warnings) < MAX_ERRORS:
+                        self.warnings.append((self.line, "; ".join(notes)))
+                if len(chunk) >= self.chunk_rows:
+                    break
+            else:
+                self.close()
+        except Exception as e:
+            # Whatever stops the reader (csv.Error, OSError, a pyarrow error) ends the import;
+            # the rows read before it are still returned
+            self.stopped = str(e) or type(e).__name__
+            self.close()
+        self.rows += len(chunk)
+        return chunk or None
+
+    def close(self):
+        """
+        Stops the import and closes the file.
+        """
+        self.finished = True
+        self.done = 1.0
+        self._records.close()
+
+    def cancel(self):
+        self.cancelled = True
+        self.close()
+
+    def report(self):
+        """
+        Returns a one-line summary of the import.
+        """
+        text = f"Imported {self.rows:,} rows from {os.path.basename(self.path)}"
+        if self.unknown:
+            text += f" ({self.unknown:,} not in the appliance catalog)"
+        if self.cleared:
+            text += f"; cleared the times of {self.cleared:,}"
+        if self.skipped:
+            text += f"; skipped {self.skipped:,}"
+        if self.stopped is not None:
+            text += f"; stopped after line {self.line:,}: {self.stopped}"
+        elif self.cancelled:
+            text += f"; cancelled after line {self.line:,}"
+        return text
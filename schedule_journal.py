@@ -0,0 +1,329 @@
+# schedule_journal.py
+# This file holds the append-only journal of load schedule edits.
+# Every add, delete or cell edit appends one JSON line, so an edit costs O(1) no matter how
+# long the schedule is. A background thread periodically folds the journal into a snapshot,
+# and on startup the snapshot plus the journal tail are replayed to restore the schedule,
+# including after a crash. Only one process at a time owns the journal files (Main.py and
+# solar.py share them); any other process replays them but does not write.
+
+import json
+import os
+import sys
+import threading
+
+# Files written next to load_Sched.csv
+JOURNAL_SUFFIX = ".journal"
+SNAPSHOT_SUFFIX = ".snapshot.json"
+LOCK_SUFFIX = ".lock"
+
+# Number of journal entries after which the journal is compacted into the snapshot.
+COMPACT_EVERY = 1000
+
+
+def _lock(file):
+    """
+    Takes an exclusive lock on an open file without waiting. Returns False if another process
+    holds it. The operating system drops the lock when the process exits, even after a crash.
+    """
+    try:
+        if sys.platform.startswith('win'):
+            import msvcrt
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+class ScheduleJournal:
+    """
+    Append-only record of schedule mutations with background compaction.
+
+    Rows are keyed by stable ids ("r1", "r2", ...) that are also used as the Treeview iids,
+    and hold the numeric fields of a row (see LoadModel.record). Entries are:
+        {"op": "add", "id": ..., "fields": {...}}
+        {"op": "delete", "id": ...}
+        {"op": "edit", "id": ..., "fields": {...changed fields only...}}
+    Every entry sets state rather than changing it, so replaying an entry twice is harmless.
+    That keeps compaction crash-safe:
+      1. the current journal is renamed to "<journal>.1" and a new journal is started;
+      2. a background thread writes the rows as they were at that point to the snapshot;
+      3. "<journal>.1" is deleted.
+    A crash between any two steps replays "<journal>.1" again on top of the snapshot.
+    The rows are kept as the rows of the last compaction plus the changes since, so step 2
+    writes the former while new entries go to the latter, without copying the schedule.
+
+    replay() also takes the lock file "<base>.lock". If another process holds it, the journal
+    is read_only: the schedule is replayed and edited in memory but nothing is written, so two
+    windows never hand out the same row ids or compact each other's journal.
+    """
+
+    def __init__(self, base_path, compact_every=COMPACT_EVERY):
+        self.journal_path = base_path + JOURNAL_SUFFIX
+        self.rotated_path = self.journal_path + ".1"
+        self.snapshot_path = base_path + SNAPSHOT_SUFFIX
+        self.lock_path = base_path + LOCK_SUFFIX
+        self.compact_every = compact_every
+        self.read_only = False
+        self._lock_file = None
+        self._rows = {}  # Rows as of the last compaction; written by the compactor, then merged
+        self._changes = {}  # Rows added or edited since, and deleted ones (None)
+        self._count = 0
+        self._next_id = 1
+        self._file = None
+        self._entries = 0
+        self._lock = threading.Lock()
+        self._compactor = None
+
+        # Statistics
+        self.appended = 0
+        self.compactions = 0
+        self.replayed = 0
+        self.last_error = None
+
+    # ---------------------------
+    # STARTUP
+    # ---------------------------
+    def replay(self):
+        """
+        Takes ownership of the journal files (or makes the journal read_only) and restores the
+        schedule from the snapshot and journal files. Returns a list of (row id, fields) in table order.
+        """
+        self._acquire()
+        rows = {}
+        next_id = 1
+        try:
+            with open(self.snapshot_path, encoding='utf-8') as file:
+                snapshot = json.load(file)
+            next_id = snapshot["next_id"]
+            rows = {row_id: fields for row_id, fields in snapshot["rows"]}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.last_error = e
+
+        self._rows = rows
+        self._changes = {}
+        self._count = len(rows)
+        self._next_id = next_id
+        # Entries replayed from the journal files count towards the next compaction.
+        self._entries = sum(self._replay_file(path) for path in (self.rotated_path, self.journal_path))
+        self._merge()
+        self.replayed = len(self._rows)
+        return list(self._rows.items())
+
+    def _acquire(self):
+        if self._lock_file is not None or self.read_only:
+            return
+        try:
+            file = open(self.lock_path, 'a+b')
+        except OSError as e:
+            self.last_error = e
+            self.read_only = True
+            return
+        if _lock(file):
+            self._lock_file = file
+        else:
+            file.close()
+            self.read_only = True
+
+    def _replay_file(self, path):
+        """
+        Applies the entries of one journal file. A torn last line (the process died mid-write)
+        is cut off so that new entries are not appended after it (unless read_only, when the
+        owner may still be writing it). Returns the number of entries applied.
+        """
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return 0
+        applied = 0
+        offset = 0
+        for line in data.splitlines(keepends=True):
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("incomplete journal entry")
+                self._apply(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                if not self.read_only:
+                    with open(path, 'r+b') as file:
+                        file.truncate(offset)
+                break
+            applied += 1
+            offset += len(line)
+        return applied
+
+    def _get(self, row_id):
+        if row_id in self._changes:
+            return self._changes[row_id]
+        return self._rows.get(row_id)
+
+    def _apply(self, entry):
+        op = entry["op"]
+        row_id = entry["id"]
+        if op == "add":
+            self._count += self._get(row_id) is None
+            self._changes[row_id] = entry["fields"]
+            self._next_id = max(self._next_id, int(row_id[1:]) + 1)
+        elif op == "delete":
+            if self._get(row_id) is not None:
+                self._count -= 1
+                if row_id in self._rows:
+                    self._changes[row_id] = None
+                else:
+                    del self._changes[row_id]
+        elif op == "edit":
+            fields = self._get(row_id)
+            if fields is not None:
+                self._changes[row_id] = {**fields, **entry["fields"]}
+        else:
+            raise ValueError(f"unknown journal entry {op!r}")
+
+    def _merge(self):
+        """
+        Folds the changes into the rows; only called while no snapshot is being written.
+        """
+        for row_id, fields in self._changes.items():
+            if fields is None:
+                del self._rows[row_id]
+            else:
+                self._rows[row_id] = fields
+        self._changes = {}
+
+    # ---------------------------
+    # MUTATIONS
+    # ---------------------------
+    def new_id(self):
+        """
+        Returns a row id that has never been used in this schedule.
+        """
+        row_id = f"r{self._next_id}"
+        self._next_id += 1
+        return row_id
+
+    def add(self, row_id, fields):
+        self._append({"op": "add", "id": row_id, "fields": dict(fields)})
+
+    def add_many(self, rows):
+        """
+        Adds (row id, fields) pairs with a single write and flush (bulk imports).
+        """
+        self._append(*({"op": "add", "id": row_id, "fields": dict(fields)} for row_id, fields in rows))
+
+    def delete(self, row_id):
+        self._append({"op": "delete", "id": row_id})
+
+    def edit(self, row_id, fields):
+        self._append({"op": "edit", "id": row_id, "fields": dict(fields)})
+
+    def _append(self, *entries):
+        for entry in entries:
+            self._apply(entry)
+        if self.read_only:
+            return
+        lines = "".join(json.dumps(entry, separators=(',', ':')) + "\n" for entry in entries)
+        try:
+            with self._lock:
+                if self._file is None:
+                    self._file = open(self.journal_path, 'a', encoding='utf-8')
+                self._file.write(lines)
+                self._file.flush()
+        except OSError as e:
+            # The schedule still works in memory; the next compaction snapshots it.
+            self.last_error = e
+            return
+        self.appended += len(entries)
+        self._entries += len(entries)
+        if self._entries >= self.compact_every:
+            self.compact()
+
+    # ---------------------------
+    # COMPACTION
+    # ---------------------------
+    def compact(self, wait=False):
+        """
+        Folds the journal into the snapshot on a background thread.
+        Does nothing while an earlier compaction is still running, unless wait is set, or
+        when the journal is read_only.
+        """
+        if self.read_only:
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            if not wait:
+                return
+            self._compactor.join()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            try:
+                if os.path.exists(self.journal_path) and os.path.exists(self.rotated_path):
+                    # An earlier snapshot failed; keep its entries until this one succeeds.
+                    with open(self.journal_path, 'rb') as source, open(self.rotated_path, 'ab') as target:
+                        target.write(source.read())
+                    os.remove(self.journal_path)
+                elif os.path.exists(self.journal_path):
+                    os.replace(self.journal_path, self.rotated_path)
+            except OSError as e:
+                self.last_error = e
+                return
+            self._entries = 0
+        # The compactor owns self._rows until it finishes; new entries only touch self._changes
+        self._merge()
+        self._compactor = threading.Thread(target=self._write_snapshot, args=(self._next_id, self._rows),
+                                           name="journal-compaction", daemon=True)
+        self._compactor.start()
+        if wait:
+            self._compactor.join()
+
+    def _write_snapshot(self, next_id, rows):
+        temp_path = self.snapshot_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump({"next_id": next_id, "rows": list(rows.items())}, file, separators=(',', ':'))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.snapshot_path)
+        except OSError as e:
+            self.last_error = e
+            return
+        try:
+            os.remove(self.rotated_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.last_error = e
+        self.compactions += 1
+
+    def close(self):
+        """
+        Compacts whatever is left in the journal and waits for it, so the next start replays
+        only the snapshot, then gives up ownership of the journal files.
+        """
+        if self._entries or os.path.exists(self.rotated_path):
+            self.compact(wait=True)
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def status(self):
+        """
+        Returns the journal statistics.
+        """
+        return {
+            "rows": self._count,
+            "read_only": self.read_only,
+            "appended": self.appended,
+            "pending": self._entries,
+            "compactions": self.compactions,
+            "replayed": self.replayed,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,182 @@
+# schematic.py
+# This file holds the layout of the solar generation set schematic (Solar_Setup.png).
+# The layout tables and labels are plain data, so they can be built on the UI thread at no cost;
+# matplotlib is only imported by render_png(), which normally runs in the render worker
+# (see render_worker.py).
+
+# Figure size (inches) and data limits of the drawing
+FIGSIZE = (16, 10)
+XLIM = (0, 22)
+YLIM = (0, 18)
+DPI = 150
+# zlib level for PNG output. Level 1 encodes about twice as fast as the default 6, for a
+# file roughly a third bigger; the pixels are identical.
+PNG_COMPRESS_LEVEL = 1
+
+# Components: key -> (position, size, face colour, font size).
+# DC side on the left, AC side on the right; the solar panel array and load use bigger boxes.
+BOXES = {
+    "solar": ((2, 15), (3, 1.5), 'yellow', 10),
+    "mppt": ((2, 13), (2, 1), 'lightblue', 10),
+    "cc": ((2, 11), (2, 1), 'lightgreen', 10),
+    "dc_breaker": ((5, 11.5), (1, 0.8), 'gold', 9),
+    "battery": ((7, 10), (3, 3), 'orange', 10),
+    "active_balancer": ((12, 15), (1.5, 1), 'violet', 10),
+    "fuse": ((12, 13), (1.5, 1), 'pink', 10),
+    "inverter": ((12, 8), (3, 2), 'red', 10),
+    "ac_breaker": ((16, 8.5), (1, 1), 'salmon', 10),
+    "outlets": ((18, 7.5), (2, 1.5), 'lightgrey', 10),
+    "load": ((21, 5), (3, 3), 'gray', 10),
+}
+
+
+def _x(key, fraction):
+    """
+    Returns the x coordinate at a fraction of a box's width (0 = left edge, 1 = right edge).
+    """
+    (x, _), (w, _), _, _ = BOXES[key]
+    return x + w * fraction
+
+
+def _y(key, fraction):
+    """
+    Returns the y coordinate at a fraction of a box's height (0 = bottom edge, 1 = top edge).
+    """
+    (_, y), (_, h), _, _ = BOXES[key]
+    return y + h * fraction
+
+
+# Connections: (start, end, label, label position, colour, line style)
+ARROWS = [
+    ((_x("solar", 1), _y("solar", 0.5)), (_x("mppt", 1), _y("mppt", 0.5)), "DC",
+     ((_x("solar", 1) + _x("mppt", 1)) / 2, _y("solar", 0.5) + 0.5), 'black', '-'),
+    ((_x("mppt", 0.5), _y("mppt", 0)), (_x("cc", 0.5), _y("cc", 1)), "DC",
+     (_x("mppt", 0.5), (_y("mppt", 0) + _y("cc", 1)) / 2), 'black', '-'),
+    ((_x("cc", 1), _y("cc", 0.5)), (_x("dc_breaker", 0), _y("dc_breaker", 0.5)), "DC",
+     ((_x("cc", 1) + _x("dc_breaker", 0)) / 2, _y("cc", 0.5)), 'black', '-'),
+    ((_x("dc_breaker", 1), _y("dc_breaker", 0.5)), (_x("battery", 0), _y("battery", 0.5)), "DC",
+     ((_x("dc_breaker", 1) + _x("battery", 0)) / 2, _y("battery", 0.5)), 'black', '-'),
+    ((_x("battery", 1), _y("battery", 0.8)), (_x("active_balancer", 0), _y("active_balancer", 0.5)), "DC",
+     ((_x("battery", 1) + _x("active_balancer", 0)) / 2, _y("battery", 0.8)), 'black', '-'),
+    ((_x("battery", 1), _y("battery", 0.5)), (_x("fuse", 0), _y("fuse", 0.5)), "DC",
+     ((_x("battery", 1) + _x("fuse", 0)) / 2, _y("battery", 0.5)), 'black', '-'),
+    ((_x("fuse", 1), _y("fuse", 0.5)), (_x("inverter", 0.5), _y("inverter", 1)), "AC",
+     ((_x("fuse", 1) + _x("inverter", 0.5)) / 2, (_y("fuse", 0) + _y("inverter", 1)) / 2), 'black', '-'),
+    ((_x("inverter", 1), _y("inverter", 0.5)), (_x("ac_breaker", 0), _y("ac_breaker", 0.5)), "AC",
+     ((_x("inverter", 1) + _x("ac_breaker", 0)) / 2, _y("inverter", 0.5)), 'black', '-'),
+    ((_x("ac_breaker", 1), _y("ac_breaker", 0.5)), (_x("outlets", 0), _y("outlets", 0.5)), "AC",
+     ((_x("ac_breaker", 1) + _x("outlets", 0)) / 2, _y("ac_breaker", 0.5)), 'black', '-'),
+    ((_x("outlets", 1), _y("outlets", 0.5)), (_x("load", 0), _y("load", 0.5)), "AC",
+     ((_x("outlets", 1) + _x("load", 0)) / 2, _y("outlets", 0.5)), 'black', '-'),
+    ((_x("battery", 0.5), _y("battery", 0)), (_x("inverter", 0.5), _y("inverter", 1)), "DC Backup",
+     ((_x("battery", 0.5) + _x("inverter", 0.5)) / 2, (_y("battery", 0) + _y("inverter", 1)) / 2), 'blue', '--'),
+]
+
+# Cable size label, above the fuse -> inverter run
+CABLE_LABEL_POS = ((_x("fuse", 1) + _x("inverter", 0.5)) / 2, _y("inverter", 1) + 0.5)
+
+
+def layout_signature():
+    """
+    Returns a string that changes whenever the drawing layout changes, for cache keys.
+    """
+    return repr((FIGSIZE, XLIM, YLIM, BOXES, ARROWS, CABLE_LABEL_POS))
+
+
+def schematic_labels(result, load_watts):
+    """
+    Returns the text of every box (plus "cable") for a SizingResult and the total load in W.
+    """
+    return {
+        "solar": f"Solar Panels\n{result.num_panels} panels\nTotal: {result.total_pv_capacity:,} W",
+        "mppt": f"MPPT\n{result.mppt_sel} A",
+        "cc": f"Charge Ctrl\n{result.scc_sel} A",
+        "dc_breaker": f"DC Breaker\n{result.dc_breaker_sel} A",
+        "battery": f"Battery Bank\n{result.battery_Ah_req:,.0f} Ah @ {float(result.system_voltage):.0f} V",
+        "active_balancer": f"Balancer\n{result.active_balancer_sel} A",
+        "fuse": f"Fuse\n{result.fuse_sel} A",
+        "inverter": f"Inverter\n{result.inverter_sel} W",
+        "ac_breaker": f"AC Breaker\n{result.ac_breaker_sel} A",
+        "outlets": "Outlets",
+        "load": f"Load\n{load_watts:,} W",
+        "cable": f"Cable: {result.cable_sel} mm²",
+    }
+
+
+def draw_schematic(ax, labels):
+    """
+    Draws the schematic with the given labels onto a matplotlib Axes.
+    Returns the text artists of the labels, keyed like schematic_labels(), so they can be updated later.
+    """
+    from matplotlib.patches import Rectangle, FancyArrowPatch
+
+    texts = {}
+    ax.set_xlim(*XLIM)
+    ax.set_ylim(*YLIM)
+    ax.axis('off')
+    for key, (pos, size, color, fontsize) in BOXES.items():
+        ax.add_patch(Rectangle(pos, *size, fc=color, alpha=0.7))
+        texts[key] = ax.text(pos[0] + size[0] / 2, pos[1] + size[1] / 2, labels[key],
+                             ha='center', va='center', fontsize=fontsize, fontweight='bold')
+    for start, end, label, label_pos, color, linestyle in ARROWS:
+        ax.add_patch(FancyArrowPatch(start, end, arrowstyle='->', mutation_scale=15,
+                                     color=color, linestyle=linestyle))
+        ax.text(*label_pos, label, fontsize=8, va='center', color=color)
+    texts["cable"] = ax.text(*CABLE_LABEL_POS, labels["cable"], fontsize=9, va='center', color='blue')
+    return texts
+
+
+class SchematicTemplate:
+    """
+    Retained-mode schematic: the boxes and arrows are built once, and each design only
+    swaps the text of its labels before the figure is saved or redrawn.
+    figure may be a Figure owned by a Tk canvas (see the live preview in the GUIs).
+    """
+
+    def __init__(self, figure=None):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        if figure is None:
+            figure = Figure(figsize=FIGSIZE, dpi=DPI)
+            FigureCanvasAgg(figure)
+        self.figure = figure
+        self.labels = {key: "" for key in list(BOXES) + ["cable"]}
+        self._texts = draw_schematic(self.figure.subplots(), self.labels)
+
+    def update(self, labels):
+        """
+        Sets the label texts; unchanged labels are left alone.
+        """
+        for key, text in self._texts.items():
+            if labels[key] != self.labels[key]:
+                text.set_text(labels[key])
+        self.labels = dict(labels)
+
+    def render_png(self, path, dpi=DPI):
+        """
+        Saves the figure as PNG, cropped like bbox_inches='tight'.
+        The tight box is measured with the canvas's own renderer, which lays out the text
+        without rasterizing the figure, so the figure is only drawn once per save.
+        """
+        from matplotlib import rcParams
+
+        bbox = self.figure.get_tightbbox(self.figure.canvas.get_renderer())
+        self.figure.savefig(path, dpi=dpi, bbox_inches=bbox.padded(rcParams['savefig.pad_inches']),
+                            format='png', pil_kwargs={"compress_level": PNG_COMPRESS_LEVEL})
+
+
+# Template shared by every render_png() call in this process (normally the render worker)
+_template = None
+
+
+def render_png(labels, path, dpi=DPI):
+    """
+    Renders the schematic to a PNG file, reusing this process's SchematicTemplate.
+    Uses a bare Figure (Agg canvas) rather than pyplot, so no GUI backend is involved.
+    """
+    global _template
+    if _template is None:
+        _template = SchematicTemplate()
+    _template.update(labels)
+    _template.render_png(path, dpi)
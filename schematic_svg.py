@@ -0,0 +1,99 @@
+# schematic_svg.py
+# This file writes the setup schematic as SVG, straight from the layout tables in schematic.py.
+# It needs nothing beyond the standard library, so a vector drawing is available in a few
+# milliseconds without importing matplotlib; PNG output still goes through matplotlib.
+
+from xml.sax.saxutils import escape, quoteattr
+
+from schematic import ARROWS, BOXES, CABLE_LABEL_POS, FIGSIZE
+
+# Scale of one layout unit in SVG user units (points), matching the plot area of the matplotlib
+# figure (FIGSIZE inches, default subplot margins), so both drawings have the same proportions.
+UNIT_X = FIGSIZE[0] * 72 * (0.9 - 0.125) / 22
+UNIT_Y = FIGSIZE[1] * 72 * (0.88 - 0.11) / 18
+MARGIN = 20
+LINE_HEIGHT = 1.2
+FONT_FAMILY = "DejaVu Sans, Arial, Helvetica, sans-serif"
+
+
+def _bounds():
+    xs, ys = [], []
+    for (x, y), (w, h), _, _ in BOXES.values():
+        xs += [x, x + w]
+        ys += [y, y + h]
+    for start, end, _, label_pos, _, _ in ARROWS:
+        xs += [start[0], end[0], label_pos[0]]
+        ys += [start[1], end[1], label_pos[1]]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+_X0, _Y0, _X1, _Y1 = _bounds()
+WIDTH = (_X1 - _X0) * UNIT_X + 2 * MARGIN
+HEIGHT = (_Y1 - _Y0) * UNIT_Y + 2 * MARGIN
+
+
+def _point(x, y):
+    """
+    Converts layout coordinates (y up) to SVG coordinates (y down).
+    """
+    return MARGIN + (x - _X0) * UNIT_X, MARGIN + (_Y1 - y) * UNIT_Y
+
+
+def _text(x, y, text, fontsize, anchor, bold=False, color='black'):
+    """
+    Returns a <text> element; multi-line text is centred vertically on y, like matplotlib's va='center'.
+    """
+    sx, sy = _point(x, y)
+    lines = text.split("\n")
+    first_dy = -(len(lines) - 1) * LINE_HEIGHT / 2
+    spans = "".join(
+        f'<tspan x="{sx:.2f}" dy="{(first_dy if i == 0 else LINE_HEIGHT):.2f}em">{escape(line)}</tspan>'
+        for i, line in enumerate(lines)
+    )
+    weight = ' font-weight="bold"' if bold else ''
+    return (f'<text x="{sx:.2f}" y="{sy:.2f}" font-size="{fontsize}" text-anchor="{anchor}" '
+            f'dominant-baseline="central" fill={quoteattr(color)}{weight}>{spans}</text>')
+
+
+def schematic_svg(labels):
+    """
+    Returns the schematic with the given labels (see schematic.schematic_labels) as an SVG document.
+    """
+    colors = sorted({color for _, _, _, _, color, _ in ARROWS})
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH:.0f}pt" height="{HEIGHT:.0f}pt" '
+        f'viewBox="0 0 {WIDTH:.2f} {HEIGHT:.2f}" font-family={quoteattr(FONT_FAMILY)}>',
+        '<defs>',
+    ]
+    for color in colors:
+        parts.append(f'<marker id="arrow-{color}" viewBox="0 0 10 10" refX="10" refY="5" '
+                     f'markerWidth="8" markerHeight="8" orient="auto">'
+                     f'<path d="M0,0 L10,5 L0,10" fill="none" stroke="{color}" stroke-width="1.5"/></marker>')
+    parts.append('</defs>')
+    parts.append(f'<rect width="{WIDTH:.2f}" height="{HEIGHT:.2f}" fill="white"/>')
+
+    for key, ((x, y), (w, h), color, fontsize) in BOXES.items():
+        left, top = _point(x, y + h)
+        parts.append(f'<rect x="{left:.2f}" y="{top:.2f}" width="{w * UNIT_X:.2f}" height="{h * UNIT_Y:.2f}" '
+                     f'fill="{color}" fill-opacity="0.7"/>')
+        parts.append(_text(x + w / 2, y + h / 2, labels[key], fontsize, "middle", bold=True))
+
+    for start, end, label, label_pos, color, linestyle in ARROWS:
+        (x1, y1), (x2, y2) = _point(*start), _point(*end)
+        dash = ' stroke-dasharray="6,4"' if linestyle == '--' else ''
+        parts.append(f'<line x1="{x1:.2f}" y1="{y1:.2f}" x2="{x2:.2f}" y2="{y2:.2f}" stroke="{color}" '
+                     f'stroke-width="1.5"{dash} marker-end="url(#arrow-{color})"/>')
+        parts.append(_text(*label_pos, label, 8, "start", color=color))
+
+    parts.append(_text(*CABLE_LABEL_POS, labels["cable"], 9, "start", color='blue'))
+    parts.append('</svg>')
+    return "\n".join(parts) + "\n"
+
+
+def render_svg(labels, path):
+    """
+    Writes the schematic to an SVG file.
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(schematic_svg(labels))
@@ -0,0 +1,145 @@
+# sizing_cache.py
+# This file memoizes sizing results in bounded LRUs.
+# Comparing options means flipping between the same few system voltage, DoD and panel size
+# values, and each flip used to size and simulate the design from scratch. Results are stored
+# under their normalized inputs (daily Wh, coincident and surge W, and every SizingParams field,
+# as floats), so a flip back to an earlier combination is a dictionary lookup.
+# Both size_system() and the year simulation are pure functions of those inputs, so a cached
+# result is the same object a fresh computation would build. Set SOLAR_SIZING_CACHE_CHECK=1 to
+# recompute every hit the plain way (size_system() on the inputs as given, not normalized) and
+# count any result whose pickled bytes differ.
+
+import os
+import pickle
+from collections import OrderedDict
+from dataclasses import astuple, fields, replace
+
+from sizing_engine import LoadSummary, size_system
+
+MAX_ENTRIES = 128
+CHECK = bool(os.environ.get("SOLAR_SIZING_CACHE_CHECK"))
+
+
+class LruMemo:
+    """
+    Bounded map of key -> computed value; the least recently used entry is evicted first.
+    get() counts hits, misses and evictions. With check set, hits are recomputed (by reference,
+    or compute without one) and compared byte for byte; a mismatch is counted and the fresh
+    value replaces the cached one.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, check=CHECK):
+        self.max_entries = max_entries
+        self.check = check
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.mismatches = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, compute, reference=None):
+        """
+        Returns the value stored under key, or compute() (stored under key) on a miss.
+        reference is an independent way to compute the same value, used by the check.
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            if not self.check:
+                return value
+            fresh = (reference or compute)()
+            if pickle.dumps(fresh) == pickle.dumps(value):
+                return value
+            self.mismatches += 1
+            self._entries[key] = fresh
+            return fresh
+
+        value = compute()
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        """
+        Returns the entry count and the hit/miss/eviction/mismatch counters.
+        """
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "mismatches": self.mismatches}
+
+
+# ---------------------------
+# NORMALIZED INPUTS
+# ---------------------------
+def _number(value):
+    # Adding 0.0 folds -0.0 into 0.0, which would otherwise share a key but not a result
+    return float(value) + 0.0
+
+
+def normalized_inputs(loads, params):
+    """
+    Returns (loads, params) with every number as a float, as they are sized and keyed.
+    """
+    loads = LoadSummary(_number(loads.total_wattage), _number(loads.total_consumption_kWh),
+                        None if loads.coincident_W is None else _number(loads.coincident_W),
+                        _number(loads.surge_W))
+    params = replace(params, **{field.name: _number(getattr(params, field.name)) for field in fields(params)})
+    return loads, params
+
+
+def sizing_key(loads, params):
+    """
+    Returns the cache key of normalized inputs: what size_system() reads from the loads
+    (daily Wh, running W, surge W) followed by every SizingParams field.
+    """
+    return (loads.total_consumption_kWh * 1000, loads.running_W, loads.surge_W) + astuple(params)
+
+
+class SizingCache:
+    """
+    Memoized size_system() and year simulation for the GUIs.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, check=CHECK):
+        self.sizing = LruMemo(max_entries, check)
+        self.simulations = LruMemo(max_entries, check)
+
+    def size(self, loads, params, compute=size_system):
+        """
+        Returns size_system(loads, params), computed once per normalized input. compute may be
+        any function that returns the same result (such as SizingGraph.evaluate); the check
+        compares hits with size_system() on loads and params as given.
+        """
+        normalized_loads, normalized_params = normalized_inputs(loads, params)
+        return self.sizing.get(sizing_key(normalized_loads, normalized_params),
+                               lambda: compute(normalized_loads, normalized_params),
+                               lambda: size_system(loads, params))
+
+    def simulate(self, load_W, result):
+        """
+        Returns year_simulation.simulate_profile(load_W, result), computed once per design and
+        load profile (LoadModel.profile(); 24 values, whatever the length of the schedule).
+        """
+        from year_simulation import simulate_profile
+        return self.simulations.get((load_W.tobytes(), result), lambda: simulate_profile(load_W, result))
+
+    def clear(self):
+        self.sizing.clear()
+        self.simulations.clear()
+
+    def stats(self):
+        """
+        Returns the counters of both caches.
+        """
+        return {"sizing": self.sizing.stats(), "simulation": self.simulations.stats()}
@@ -0,0 +1,230 @@
+# sizing_engine.py
+# This file holds the Tk-free sizing engine used by both GUIs (Main.py and solar.py).
+# Everything here is a pure function of its inputs: no StringVars, no Treeview, no module globals,
+# so it can be called from a batch job or from several threads at once.
+
+import math
+from dataclasses import dataclass
+
+from component_catalog import CATALOG
+
+
+# ---------------------------
+# DESIGN CONSTANTS
+# ---------------------------
+SUN_HOURS = 5.5  # Average daily sun hours
+BATTERY_MARGIN = 1.20  # 20% extra battery capacity margin
+INVERTER_MARGIN = 1.25  # 25% extra inverter capacity margin
+INVERTER_SURGE_FACTOR = 2.0  # Inverters deliver about twice their rating for the seconds a motor takes to start
+PV_MARGIN = 1.20  # 20% extra PV capacity margin
+PERFORMANCE_RATIO = 0.8  # Typical system performance ratio
+AC_VOLTAGE = 230  # AC output voltage used for the AC breaker current
+
+
+# ---------------------------
+# INPUTS
+# ---------------------------
+@dataclass(frozen=True)
+class LoadSummary:
+    """
+    Totals of the appliance load schedule that the sizing depends on.
+    total_wattage is the sum of rated power * count, total_consumption_kWh the daily energy.
+    coincident_W and surge_W are the running peak and the peak with one motor starting
+    (see load_sweep.load_peaks); without them the inverter carries total_wattage.
+    """
+    total_wattage: float
+    total_consumption_kWh: float
+    coincident_W: object = None
+    surge_W: float = 0.0
+
+    @property
+    def running_W(self):
+        """
+        Load the inverter must carry continuously.
+        """
+        return self.total_wattage if self.coincident_W is None else self.coincident_W
+
+
+@dataclass(frozen=True)
+class SizingParams:
+    """
+    Solar parameters picked by the user plus the design constants and margins.
+    """
+    system_voltage: float
+    dod: float
+    panel_size: float
+    sun_hours: float = SUN_HOURS
+    battery_margin: float = BATTERY_MARGIN
+    inverter_margin: float = INVERTER_MARGIN
+    inverter_surge_factor: float = INVERTER_SURGE_FACTOR
+    pv_margin: float = PV_MARGIN
+    performance_ratio: float = PERFORMANCE_RATIO
+    ac_voltage: float = AC_VOLTAGE
+
+
+# ---------------------------
+# OUTPUT
+# ---------------------------
+@dataclass(frozen=True)
+class SizingResult:
+    """
+    Every requirement and component selection produced by size_system().
+    Selections that exceed the largest available rating hold a string such as "> 60000".
+    """
+    system_voltage: float
+    dod: float
+    panel_size: float
+    daily_consumption_Wh: float
+    battery_Ah_req: float
+    inverter_required: float
+    inverter_sel: object
+    pv_capacity_required: float
+    num_panels: int
+    total_pv_capacity: float
+    total_pv_current: float
+    mppt_sel: object
+    scc_sel: object
+    dc_breaker_required: float
+    dc_breaker_sel: object
+    inverter_ac_current: float
+    ac_breaker_required: float
+    ac_breaker_sel: object
+    inverter_current: float
+    cable_required: float
+    cable_sel: object
+    active_balancer_required: float
+    active_balancer_sel: object
+    fuse_required: float
+    fuse_sel: object
+
+
+# ---------------------------
+# SIZING
+# ---------------------------
+def size_system(loads, params):
+    """
+    Calculates the Solar Generation Set requirements based on appliance loads and solar parameters.
+    Returns a SizingResult, or None when there is no load to size for.
+
+    Refinements:
+      - Battery Capacity (Ah) = (Daily Consumption (Wh) * battery_margin) / (System Voltage * (DoD/100))
+      - Inverter Required (W) = max(Coincident Peak (W) * inverter_margin, Surge Peak (W) / inverter_surge_factor)
+        (the coincident peak is the total appliance wattage unless the schedule has running times;
+        the surge term applies either way, so a motor load whose surge is more than
+        inverter_surge_factor * inverter_margin times its rating needs a larger inverter than before)
+      - PV Array Sizing:
+            Performance Ratio (PR) = 0.8 (typical)
+            PV Capacity Required (W) = (Daily Consumption (Wh) * pv_margin) / (Sun Hours * PR)
+            Number of Panels = ceil(PV Capacity Required / Panel Size)
+      - The other components are selected based on the calculated currents with additional margins.
+    """
+    if loads.total_consumption_kWh <= 0 or loads.total_wattage <= 0:
+        return None
+
+    system_voltage = params.system_voltage
+    dod = params.dod
+    panel_size = params.panel_size
+
+    daily_consumption_Wh = loads.total_consumption_kWh * 1000
+    battery_Ah_req = (daily_consumption_Wh * params.battery_margin) / (system_voltage * (dod / 100))
+
+    inverter_required = max(loads.running_W * params.inverter_margin, loads.surge_W / params.inverter_surge_factor)
+    inverter_sel = CATALOG.select("inverter", inverter_required)
+
+    pv_capacity_required = (daily_consumption_Wh * params.pv_margin) / (params.sun_hours * params.performance_ratio)
+    num_panels = math.ceil(pv_capacity_required / panel_size)
+    total_pv_capacity = num_panels * panel_size
+
+    current_per_panel = panel_size / system_voltage
+    total_pv_current = num_panels * current_per_panel
+
+    mppt_sel = CATALOG.select("mppt", total_pv_current)
+    scc_sel = CATALOG.select("scc", total_pv_current)
+
+    dc_breaker_required = total_pv_current * 1.20
+    dc_breaker_sel = CATALOG.select("dc_breaker", dc_breaker_required)
+
+    # An oversize inverter has no rating, so the currents fall back to the required wattage.
+    inverter_watts = inverter_sel if isinstance(inverter_sel, (int, float)) else inverter_required
+    inverter_ac_current = inverter_watts / params.ac_voltage
+    ac_breaker_required = inverter_ac_current * 1.25
+    ac_breaker_sel = CATALOG.select("ac_breaker", ac_breaker_required)
+
+    inverter_current = inverter_watts / system_voltage
+    cable_required = inverter_current * 1.25
+    cable_sel = CATALOG.select("cable", cable_required)
+
+    active_balancer_required = max(battery_Ah_req * 0.05, 5)
+    active_balancer_sel = CATALOG.select("balancer", active_balancer_required)
+
+    fuse_required = inverter_current * 1.25
+    fuse_sel = CATALOG.select("fuse", fuse_required)
+
+    return SizingResult(
+        system_voltage=system_voltage,
+        dod=dod,
+        panel_size=panel_size,
+        daily_consumption_Wh=daily_consumption_Wh,
+        battery_Ah_req=battery_Ah_req,
+        inverter_required=inverter_required,
+        inverter_sel=inverter_sel,
+        pv_capacity_required=pv_capacity_required,
+        num_panels=num_panels,
+        total_pv_capacity=total_pv_capacity,
+        total_pv_current=total_pv_current,
+        mppt_sel=mppt_sel,
+        scc_sel=scc_sel,
+        dc_breaker_required=dc_breaker_required,
+        dc_breaker_sel=dc_breaker_sel,
+        inverter_ac_current=inverter_ac_current,
+        ac_breaker_required=ac_breaker_required,
+        ac_breaker_sel=ac_breaker_sel,
+        inverter_current=inverter_current,
+        cable_required=cable_required,
+        cable_sel=cable_sel,
+        active_balancer_required=active_balancer_required,
+        active_balancer_sel=active_balancer_sel,
+        fuse_required=fuse_required,
+        fuse_sel=fuse_sel,
+    )
+
+
+# ---------------------------
+# PRESENTATION HELPERS
+# ---------------------------
+def result_rows(result):
+    """
+    Returns the (Component, Requirement/Selection, Details) rows shown in solar_tree.
+    """
+    return [
+        ("Daily Consumption (Wh)", f"{result.daily_consumption_Wh:,.0f}", "From appliance loads"),
+        ("Battery Capacity (Ah)", f"{result.battery_Ah_req:,.0f}",
+         f"{result.system_voltage}V, DOD: {result.dod}%"),
+        ("Inverter Size (W)", f"{result.inverter_sel}", f"Required: {result.inverter_required:,.0f}W"),
+        ("PV Array Capacity (W)", f"{result.total_pv_capacity:,.0f}",
+         f"{result.num_panels} panels @ {result.panel_size}W each"),
+        ("MPPT Controller (A)", f"{result.mppt_sel}", f"Total PV Current: {result.total_pv_current:.2f}A"),
+        ("Charge Controller (A)", f"{result.scc_sel}", f"Total PV Current: {result.total_pv_current:.2f}A"),
+        ("DC Circuit Breaker (A)", f"{result.dc_breaker_sel}", f"Required: {result.dc_breaker_required:.2f}A"),
+        ("AC Circuit Breaker (A)", f"{result.ac_breaker_sel}",
+         f"Inverter AC Current: {result.inverter_ac_current:.2f}A"),
+        ("Cable Size (mm²)", f"{result.cable_sel}", f"Required Ampacity for {result.cable_required:.2f}A"),
+        ("Active Balancer (A)", f"{result.active_balancer_sel}",
+         f"Required: {result.active_balancer_required:.2f}A"),
+        ("Fuse Size (A)", f"{result.fuse_sel}", f"Required: {result.fuse_required:.2f}A"),
+    ]
+
+
+def summary_text(result):
+    """
+    Returns the one-line system summary shown under solar_tree.
+    """
+    return (
+        f"Battery: {result.system_voltage}V, {result.battery_Ah_req:,.0f}Ah | "
+        f"Panels: {result.num_panels} ({result.total_pv_capacity:,}W total) | "
+        f"Inverter: {result.inverter_sel}W | "
+        f"MPPT: {result.mppt_sel}A | "
+        f"SCC: {result.scc_sel}A | "
+        f"Balancer: {result.active_balancer_sel}A | "
+        f"Fuse: {result.fuse_sel}A"
+    )
@@ -0,0 +1,123 @@
+# sizing_graph.py
+# This file evaluates the sizing as a small dataflow graph, so an edit only re-runs what it affects.
+# Every requirement and selection of size_system() is a node computed from its inputs (the load,
+# the solar parameters, or other nodes). SizingGraph keeps the last value of every node; on the next
+# evaluation a node only runs if one of its inputs changed, and a node whose new value equals the
+# old one stops the change from spreading further. Changing the panel size, for example, re-runs
+# the PV nodes and their breakers but leaves the inverter, AC breaker, cable and fuse alone.
+
+import math
+from dataclasses import fields
+
+from component_catalog import CATALOG
+from sizing_engine import SizingResult
+
+# Inputs of the graph: what size_system() reads from a LoadSummary and SizingParams
+INPUTS = (
+    "daily_consumption_Wh", "running_W", "surge_W", "system_voltage", "dod", "panel_size", "sun_hours",
+    "battery_margin", "inverter_margin", "inverter_surge_factor", "pv_margin", "performance_ratio", "ac_voltage",
+)
+
+
+def _select(kind):
+    return lambda required: CATALOG.select(kind, required)
+
+
+# (node, inputs, function) in evaluation order. The formulas follow size_system() step by step,
+# so a full evaluation returns the same SizingResult.
+NODES = (
+    ("battery_Ah_req", ("daily_consumption_Wh", "battery_margin", "system_voltage", "dod"),
+     lambda daily_Wh, margin, voltage, dod: (daily_Wh * margin) / (voltage * (dod / 100))),
+    ("inverter_required", ("running_W", "inverter_margin", "surge_W", "inverter_surge_factor"),
+     lambda running_W, margin, surge_W, surge_factor: max(running_W * margin, surge_W / surge_factor)),
+    ("inverter_sel", ("inverter_required",), _select("inverter")),
+    ("pv_capacity_required", ("daily_consumption_Wh", "pv_margin", "sun_hours", "performance_ratio"),
+     lambda daily_Wh, margin, sun_hours, ratio: (daily_Wh * margin) / (sun_hours * ratio)),
+    ("num_panels", ("pv_capacity_required", "panel_size"), lambda required, size: math.ceil(required / size)),
+    ("total_pv_capacity", ("num_panels", "panel_size"), lambda panels, size: panels * size),
+    ("total_pv_current", ("num_panels", "panel_size", "system_voltage"),
+     lambda panels, size, voltage: panels * (size / voltage)),
+    ("mppt_sel", ("total_pv_current",), _select("mppt")),
+    ("scc_sel", ("total_pv_current",), _select("scc")),
+    ("dc_breaker_required", ("total_pv_current",), lambda current: current * 1.20),
+    ("dc_breaker_sel", ("dc_breaker_required",), _select("dc_breaker")),
+    # An oversize inverter has no rating, so the currents fall back to the required wattage.
+    ("inverter_watts", ("inverter_sel", "inverter_required"),
+     lambda selected, required: selected if isinstance(selected, (int, float)) else required),
+    ("inverter_ac_current", ("inverter_watts", "ac_voltage"), lambda watts, ac_voltage: watts / ac_voltage),
+    ("ac_breaker_required", ("inverter_ac_current",), lambda current: current * 1.25),
+    ("ac_breaker_sel", ("ac_breaker_required",), _select("ac_breaker")),
+    ("inverter_current", ("inverter_watts", "system_voltage"), lambda watts, voltage: watts / voltage),
+    ("cable_required", ("inverter_current",), lambda current: current * 1.25),
+    ("cable_sel", ("cable_required",), _select("cable")),
+    ("active_balancer_required", ("battery_Ah_req",), lambda battery_Ah: max(battery_Ah * 0.05, 5)),
+    ("active_balancer_sel", ("active_balancer_required",), _select("balancer")),
+    ("fuse_required", ("inverter_current",), lambda current: current * 1.25),
+    ("fuse_sel", ("fuse_required",), _select("fuse")),
+)
+
+_RESULT_FIELDS = tuple(field.name for field in fields(SizingResult))
+
+
+def _same(old, new):
+    """
+    True if new can stand in for old downstream: equal, of the same type, and (for floats)
+    of the same sign, so 0.0 and -0.0 count as different. NaN never equals itself.
+    """
+    if type(old) is not type(new) or old != new:
+        return False
+    return not isinstance(old, float) or math.copysign(1, old) == math.copysign(1, new)
+
+
+class SizingGraph:
+    """
+    Incremental size_system(). evaluate() returns the SizingResult of new inputs, re-running only
+    the nodes downstream of inputs that changed; changed holds the inputs and nodes whose value
+    changed in the last evaluation. The counters show how much work evaluations skipped.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self.changed = frozenset()
+        self.evaluations = 0
+        self.nodes_run = 0
+        self.nodes_skipped = 0
+
+    def evaluate(self, loads, params):
+        """
+        Returns the same SizingResult as size_system(loads, params), or None without a load.
+        """
+        if loads.total_consumption_kWh <= 0 or loads.total_wattage <= 0:
+            return None
+        inputs = {
+            "daily_consumption_Wh": loads.total_consumption_kWh * 1000,
+            "running_W": loads.running_W,
+            "surge_W": loads.surge_W,
+        }
+        inputs.update((name, getattr(params, name)) for name in INPUTS if name not in inputs)
+
+        values = self._values
+        changed = set()
+        for name, value in inputs.items():
+            if name not in values or not _same(values[name], value):
+                values[name] = value
+                changed.add(name)
+        for name, node_inputs, function in NODES:
+            if name in values and changed.isdisjoint(node_inputs):
+                self.nodes_skipped += 1
+                continue
+            value = function(*(values[node_input] for node_input in node_inputs))
+            self.nodes_run += 1
+            if name not in values or not _same(values[name], value):
+                values[name] = value
+                changed.add(name)
+
+        self.evaluations += 1
+        self.changed = frozenset(changed)
+        return SizingResult(**{name: values[name] for name in _RESULT_FIELDS})
+
+    def stats(self):
+        """
+        Returns the evaluation and node counters.
+        """
+        return {"evaluations": self.evaluations, "nodes_run": self.nodes_run, "nodes_skipped": self.nodes_skipped}
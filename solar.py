@@ -1,12 +1,26 @@
+from startup_profile import PROFILE
 import tkinter as tk
 from tkinter import ttk
-import pandas as pd
 import tkinter.messagebox as messagebox
-import csv
-import math
+import tkinter.filedialog as filedialog
 import os
 import sys
 
+# The packaged app starts its schematic render worker by running itself with --render-worker
+if "--render-worker" in sys.argv:
+    from render_worker import serve
+    serve()
+    sys.exit()
+
+# ...its weather risk helper with --weather-risk, and that helper's process pool workers
+# through multiprocessing's own command line
+import multiprocessing
+multiprocessing.freeze_support()
+if "--weather-risk" in sys.argv:
+    from weather_risk import serve
+    serve()
+    sys.exit()
+
 # --- Helper for bundled resources ---
 def resource_path(relative_path):
     """
@@ -21,82 +35,123 @@ def resource_path(relative_path):
 
 # Import all predefined values from predefined_values.py
 from predefined_values import *
-
-# Load Appliances.csv using the resource helper
-appliance_data = pd.read_csv(resource_path("Appliances.csv"))
+from sizing_engine import SizingParams, result_rows, summary_text
+from sizing_cache import SizingCache
+from sizing_graph import SizingGraph
+from tree_rows import TreeRows
+from virtual_table import VirtualTable
+from load_model import LoadModel, SCHEDULE_COLUMNS
+from load_sweep import format_clock, parse_clock, peak_rows, window_hours
+from recompute_scheduler import RecomputeScheduler
+from appliance_index import ApplianceIndex
+from appliance_catalog import ApplianceCatalog, format_number, load_catalog
+from autosave import AutosaveWriter
+from schedule_journal import ScheduleJournal
+from schedule_import import ScheduleImport
+from schematic import DPI, FIGSIZE, SchematicTemplate, schematic_labels, render_png
+from diagram_cache import DiagramCache
+from schematic_svg import render_svg
+from render_worker import SchematicRenderer
+
+PROFILE.mark("imports")
+
+# Appliance catalog and its autocomplete index; filled by load_appliance_catalog() once the window is up
+appliance_catalog = ApplianceCatalog.empty()
+appliance_index = ApplianceIndex([])
 total_wattage = 0
 total_usage_hours = 0
 appliance_count = 0
 total_consumption_kWh = 0  # Accumulated energy consumption in kWh
 
-csv_filename = "load_Sched.csv"
+# Numeric schedule rows keyed by Treeview item id, with running totals
+load_model = LoadModel()
 
-# Global variables for computed sizing and drawing
-_battery_Ah_req = None
-_num_panels = None
-_total_pv_capacity = None
-_inverter_sel = None
-_mppt_sel = None
-_scc_sel = None
-_active_balancer_sel = None
-_fuse_sel = None
-_system_voltage = None
-_dc_breaker_sel = None
-_ac_breaker_sel = None
-_cable_sel = None
+csv_filename = "load_Sched.csv"
+# Background writer that saves csv_filename atomically, off the UI thread.
+# The CSV is an export of the schedule plus results, rewritten at most every CSV_EXPORT_INTERVAL seconds.
+CSV_EXPORT_INTERVAL = 2.0
+autosave = AutosaveWriter(csv_filename, min_interval=CSV_EXPORT_INTERVAL)
+AUTOSAVE_POLL_MS = 500
+
+# Append-only journal of schedule edits (load_Sched.journal), replayed on startup by restore_schedule()
+journal = ScheduleJournal(os.path.splitext(csv_filename)[0])
+
+# Result of the last sizing pass, used for drawing
+_sizing_result = None
+
+# Schematic rendering runs in a pre-warmed worker process; poll_render() picks up its events
+SCHEMATIC_FILENAME = "Solar_Setup.png"
+# SVG drawings are written directly by schematic_svg, without matplotlib or the worker
+SVG_FILENAME = "Solar_Setup.svg"
+DRAWING_FORMATS = ("PNG", "SVG")
+RENDER_POLL_MS = 50
+renderer = SchematicRenderer()
+_render_poll_id = None
+# Rendered diagrams keyed by a hash of their labels, so redrawing a known kit skips rendering
+diagram_cache = DiagramCache()
+_render_key = None
+# Sizing and year simulation results by normalized inputs, so flipping back to a design is a lookup
+sizing_cache = SizingCache()
+# Incremental sizing: an edit re-runs only the sizing nodes it affects (see sizing_graph.py)
+sizing_graph = SizingGraph()
+# Debug view (F12): (Toplevel, Label) while it is open, refreshed every DEBUG_POLL_MS
+DEBUG_POLL_MS = 500
+_debug = None
+# Bulk import of a schedule file (see schedule_import.py): the running ScheduleImport, which
+# adds one chunk of rows every IMPORT_STEP_MS so the window keeps responding
+IMPORT_STEP_MS = 1
+IMPORT_ERRORS_SHOWN = 10
+_import = None
+# Live preview window: (Toplevel, SchematicTemplate, canvas) while it is open
+PREVIEW_DPI = 60
+_preview = None
+# Monte Carlo weather risk run in a helper process (see weather_risk.py); _risk_inputs is the
+# (rows, SizingResult) it was started for
+RISK_POLL_MS = 200
+_risk_run = None
+_risk_inputs = None
+# Design optimizer window: (Toplevel, Treeview, designs) while it is open
+_optimizer = None
+# PV/battery trade-off window: (Toplevel, Axes, canvas) while it is open; redrawn by the "lolp" recompute task
+LOLP_FIGSIZE = (7, 5)
+_lolp = None
+# Minute load synthesis on a background thread (see load_synthesis.py); _minute_inputs is the
+# (rows, SizingResult) it was started for
+MINUTE_POLL_MS = 200
+_minute_run = None
+_minute_inputs = None
 
 def update_fields(*args):
-    appliance_name = appliance_var.get()
-    if appliance_name in appliance_data['Appliance'].values:
-        appliance_info = appliance_data[appliance_data['Appliance'] == appliance_name].iloc[0]
-        rated_power_combobox.set(appliance_info['Rated Power (W)'])
+    appliance_info = appliance_catalog.record(appliance_var.get())
+    if appliance_info is not None:
+        rated_power_combobox.set(format_number(appliance_info.power))
     else:
         rated_power_combobox.set("")
-    calculate_gen_set()
+    recompute.request("size")
 
 def save_to_csv():
-    try:
-        with open(csv_filename, mode='w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(
-                ["Appliance", "Power (W)", "PF", "Eff(%)", "Surge(W)", "Usage (Hrs)", "Count", "Consumption (kWh)"])
-            for row in tree.get_children():
-                writer.writerow(tree.item(row)['values'])
-            writer.writerow([])
-            writer.writerow(["Total Consumption (kWh)", f"{total_consumption_kWh:,.4f}"])
-            writer.writerow([])
-            writer.writerow(["Solar Gen Set Summary", summary_label.cget("text")])
-            writer.writerow([])
-            writer.writerow(["Solar Component", "Requirement/Selection", "Details"])
-            for item in solar_tree.get_children():
-                writer.writerow(solar_tree.item(item)['values'])
-    except PermissionError:
-        messagebox.showerror("File Error",
-                             f"Permission denied when trying to write to '{csv_filename}'. Please ensure the file is not open in another application and that you have write permissions.")
+    if journal.read_only:
+        return
+    rows = [list(SCHEDULE_COLUMNS)]
+    rows.extend(load_model.display_rows())
+    rows.append([])
+    rows.append(["Total Consumption (kWh)", f"{total_consumption_kWh:,.4f}"])
+    rows.append([])
+    rows.append(["Solar Gen Set Summary", summary_label.cget("text")])
+    rows.append([])
+    rows.append(["Solar Component", "Requirement/Selection", "Details"])
+    for item in solar_tree.get_children():
+        rows.append(solar_tree.item(item)['values'])
+    autosave.submit(rows)
 
 def recalc_totals():
     global total_wattage, total_usage_hours, appliance_count, total_consumption_kWh
-    total_wattage = 0
-    total_usage_hours = 0
-    appliance_count = 0
-    total_consumption_kWh = 0
+    total_wattage = load_model.total_wattage
+    total_usage_hours = load_model.total_usage_hours
+    appliance_count = load_model.appliance_count
+    total_consumption_kWh = load_model.total_consumption_kWh
 
-    for row in tree.get_children():
-        values = tree.item(row)['values']
-        try:
-            power = float(str(values[1]).replace(",", ""))
-            usage = float(values[5])
-            count = float(values[6])
-            consumption = float(str(values[7]).replace(",", ""))
-        except Exception:
-            continue
-        total_wattage += power * count
-        total_usage_hours += usage * count
-        appliance_count += count
-        total_consumption_kWh += consumption
-
-    calculate_gen_set()
-    save_to_csv()
+    recompute.request("size", "save")
 
 def add_appliance():
     appliance = appliance_var.get()
@@ -106,11 +161,11 @@ def add_appliance():
         messagebox.showwarning("Input Error", "Please enter a valid number for Rated Power (W).")
         return
 
-    if appliance in appliance_data['Appliance'].values:
-        appliance_info = appliance_data[appliance_data['Appliance'] == appliance].iloc[0]
-        surge_power = float(appliance_info['Surge Power (W)'])
-        power_factor = float(appliance_info['Power Factor (PF)'])
-        efficiency = float(appliance_info['Efficiency (%)'])
+    appliance_info = appliance_catalog.record(appliance)
+    if appliance_info is not None:
+        surge_power = appliance_info.surge
+        power_factor = appliance_info.power_factor
+        efficiency = appliance_info.efficiency
     else:
         surge_power = rated_power
         power_factor = 1.0
@@ -126,20 +181,36 @@ def add_appliance():
     except ValueError:
         appliance_count_input = 1
 
+    try:
+        start_hour = parse_clock(start_combobox.get())
+        end_hour = parse_clock(end_combobox.get())
+    except ValueError:
+        messagebox.showwarning("Input Error", "Please enter Start and End as HH:MM, or leave them blank.")
+        return
+    if usage_hours > window_hours(start_hour, end_hour):
+        messagebox.showwarning("Input Error", "Usage Hours do not fit between Start and End.")
+        return
+
     consumption = rated_power * usage_hours * appliance_count_input / 1000
-    rated_power_formatted = f"{rated_power:,}"
-    consumption_formatted = f"{consumption:,.4f}"
-
-    tree.insert("", "end", values=(
-        appliance,
-        rated_power_formatted,
-        f"{power_factor:.2f}",
-        f"{efficiency:.0f}",
-        f"{surge_power:,}",
-        usage_hours,
-        appliance_count_input,
-        consumption_formatted
-    ))
+    fields = {
+        "appliance": appliance,
+        "power": rated_power,
+        "power_factor": power_factor,
+        "efficiency": efficiency,
+        "surge": surge_power,
+        "usage_hours": usage_hours,
+        "count": appliance_count_input,
+        "consumption_kWh": consumption,
+        "start": format_clock(start_hour),
+        "end": format_clock(end_hour),
+    }
+
+    row_id = journal.new_id()
+    load_model.add(row_id, rated_power, usage_hours, appliance_count_input, consumption,
+                   surge=surge_power, start_hour=start_hour, end_hour=end_hour,
+                   appliance=appliance, power_factor=power_factor, efficiency=efficiency)
+    tree.refresh(row_id)
+    journal.add(row_id, fields)
     recalc_totals()
 
 def delete_selected():
@@ -147,28 +218,26 @@ def delete_selected():
     if not selected_items:
         messagebox.showinfo("Delete", "No item selected for deletion.")
         return
+    load_model.remove_many(selected_items)
+    tree.refresh(*selected_items)
     for item in selected_items:
-        tree.delete(item)
+        journal.delete(item)
     recalc_totals()
 
 def on_combobox_keyrelease(event):
-    typed_value = appliance_var.get()
-    if typed_value:
-        filtered_appliances = [item for item in appliance_data['Appliance']
-                               if isinstance(item, str) and typed_value.lower() in item.lower()]
-    else:
-        filtered_appliances = appliance_data['Appliance'].tolist()
-    appliance_combobox['values'] = filtered_appliances
+    appliance_combobox['values'] = appliance_index.search(appliance_var.get())
 
 def on_tree_select(event):
     selected_items = tree.selection()
     if selected_items:
-        item_values = tree.item(selected_items[0])['values']
-        appliance_var.set(item_values[0])
-        rated_power_combobox.set(item_values[1].replace(",", ""))
-        usage_hours_combobox.set(item_values[5])
-        counts_combobox.set(item_values[6])
-    calculate_gen_set()
+        record = load_model.record(selected_items[0])
+        appliance_var.set(record["appliance"])
+        rated_power_combobox.set(format_number(record["power"]))
+        usage_hours_combobox.set(format_number(record["usage_hours"]))
+        counts_combobox.set(format_number(record["count"]))
+        start_combobox.set(record["start"])
+        end_combobox.set(record["end"])
+    recompute.request("size")
 
 def on_tree_double_click(event):
     region = tree.identify("region", event.x, event.y)
@@ -180,7 +249,7 @@ def on_tree_double_click(event):
     if not row:
         return
     col_num = int(col.replace("#", "")) - 1
-    if col_num not in (0, 1, 5):
+    if col_num not in (0, 1, 5, 8, 9):
         return
 
     x, y, width, height = tree.bbox(row, col)
@@ -192,35 +261,52 @@ def on_tree_double_click(event):
 
     def on_focus_out(event):
         new_value = entry.get().strip()
-        current_values = list(tree.item(row, "values"))
         if col_num == 1:
             try:
                 new_val_float = float(new_value)
-                current_values[1] = f"{new_val_float:,}"
             except ValueError:
                 messagebox.showwarning("Input Error", "Please enter a valid number for Rated Power (W).")
                 entry.destroy()
                 return
+            load_model.update(row, power=new_val_float)
+            journal.edit(row, {"power": new_val_float})
         elif col_num == 5:
             try:
                 usage = float(new_value)
-                current_values[5] = usage
             except ValueError:
                 messagebox.showwarning("Input Error", "Please enter a valid number for Usage Hours.")
                 entry.destroy()
                 return
+            rated_power, _, count, _, _, start_hour, end_hour = load_model.row(row)
+            if usage > window_hours(start_hour, end_hour):
+                messagebox.showwarning("Input Error", "Usage Hours do not fit between Start and End.")
+                entry.destroy()
+                return
+            consumption = rated_power * usage * count / 1000
+            load_model.update(row, usage_hours=usage, consumption_kWh=consumption)
+            journal.edit(row, {"usage_hours": usage, "consumption_kWh": consumption})
+        elif col_num in (8, 9):
             try:
-                rated_power = float(str(current_values[1]).replace(",", ""))
-                count = float(current_values[6])
-                consumption = rated_power * usage * count / 1000
-                current_values[7] = f"{consumption:,.4f}"
-            except Exception as e:
-                messagebox.showwarning("Calculation Error", f"Error recalculating consumption: {e}")
+                hour = parse_clock(new_value)
+            except ValueError:
+                messagebox.showwarning("Input Error", "Please enter a time as HH:MM, or leave it blank.")
                 entry.destroy()
                 return
+            usage, start_hour, end_hour = (load_model.row(row)[i] for i in (1, 5, 6))
+            if col_num == 8:
+                start_hour = hour
+            else:
+                end_hour = hour
+            if usage > window_hours(start_hour, end_hour):
+                messagebox.showwarning("Input Error", "Usage Hours do not fit between Start and End.")
+                entry.destroy()
+                return
+            load_model.set_window(row, start_hour, end_hour)
+            journal.edit(row, {"start": format_clock(start_hour), "end": format_clock(end_hour)})
         else:
-            current_values[col_num] = new_value
-        tree.item(row, values=current_values)
+            load_model.update(row, appliance=new_value)
+            journal.edit(row, {"appliance": new_value})
+        tree.refresh(row)
         entry.destroy()
         recalc_totals()
 
@@ -232,191 +318,268 @@ def draw_setup():
         messagebox.showerror("Draw Error", "No data available to draw the solar setup.")
         return
 
-    calculate_gen_set()
+    recompute.request("size")
+    recompute.flush()
+    if _sizing_result is None:
+        return
     draw_setup_figure()
 
 def draw_setup_figure():
-    import matplotlib.pyplot as plt
-    from matplotlib.patches import Rectangle, FancyArrowPatch
-
-    fig, ax = plt.subplots(figsize=(16, 10))
-    ax.set_xlim(0, 22)
-    ax.set_ylim(0, 18)
-    ax.axis('off')
-
-    solar_pos = (2, 15)  # Solar Panels (bigger box)
-    solar_size = (3, 1.5)
-    mppt_pos = (2, 13)
-    mppt_size = (2, 1)
-    cc_pos = (2, 11)
-    cc_size = (2, 1)
-    dc_breaker_pos = (5, 11.5)
-    dc_breaker_size = (1, 0.8)
-    battery_pos = (7, 10)
-    battery_size = (3, 3)
-
-    # AC Side Components:
-    active_balancer_pos = (12, 15)
-    active_balancer_size = (1.5, 1)
-    fuse_pos = (12, 13)
-    fuse_size = (1.5, 1)
-    inverter_pos = (12, 8)
-    inverter_size = (3, 2)
-    ac_breaker_pos = (16, 8.5)
-    ac_breaker_size = (1, 1)
-    outlets_pos = (18, 7.5)  # Outlets box
-    outlets_size = (2, 1.5)
-    load_pos = (21, 5)  # Load (bigger box)
-    load_size = (3, 3)
-
-    # --- Draw Components ---
-    solar_box = Rectangle(solar_pos, *solar_size, fc='yellow', alpha=0.7)
-    ax.add_patch(solar_box)
-    ax.text(solar_pos[0] + solar_size[0] / 2, solar_pos[1] + solar_size[1] / 2,
-            f"Solar Panels\n{_num_panels} panels\nTotal: {_total_pv_capacity:,} W",
-            ha='center', va='center', fontsize=10, fontweight='bold')
-
-    mppt_box = Rectangle(mppt_pos, *mppt_size, fc='lightblue', alpha=0.7)
-    ax.add_patch(mppt_box)
-    ax.text(mppt_pos[0] + mppt_size[0] / 2, mppt_pos[1] + mppt_size[1] / 2,
-            f"MPPT\n{_mppt_sel} A", ha='center', va='center', fontsize=10, fontweight='bold')
-
-    cc_box = Rectangle(cc_pos, *cc_size, fc='lightgreen', alpha=0.7)
-    ax.add_patch(cc_box)
-    ax.text(cc_pos[0] + cc_size[0] / 2, cc_pos[1] + cc_size[1] / 2,
-            f"Charge Ctrl\n{_scc_sel} A", ha='center', va='center', fontsize=10, fontweight='bold')
-
-    dc_box = Rectangle(dc_breaker_pos, *dc_breaker_size, fc='gold', alpha=0.7)
-    ax.add_patch(dc_box)
-    ax.text(dc_breaker_pos[0] + dc_breaker_size[0] / 2, dc_breaker_pos[1] + dc_breaker_size[1] / 2,
-            f"DC Breaker\n{_dc_breaker_sel} A", ha='center', va='center', fontsize=9, fontweight='bold')
-
-    battery_box = Rectangle(battery_pos, *battery_size, fc='orange', alpha=0.7)
-    ax.add_patch(battery_box)
-    ax.text(battery_pos[0] + battery_size[0] / 2, battery_pos[1] + battery_size[1] / 2,
-            f"Battery Bank\n{_battery_Ah_req:,.0f} Ah @ {float(_system_voltage):.0f} V",
-            ha='center', va='center', fontsize=10, fontweight='bold')
-
-    ab_box = Rectangle(active_balancer_pos, *active_balancer_size, fc='violet', alpha=0.7)
-    ax.add_patch(ab_box)
-    ax.text(active_balancer_pos[0] + active_balancer_size[0] / 2, active_balancer_pos[1] + active_balancer_size[1] / 2,
-            f"Balancer\n{_active_balancer_sel} A", ha='center', va='center', fontsize=10, fontweight='bold')
-
-    fuse_box = Rectangle(fuse_pos, *fuse_size, fc='pink', alpha=0.7)
-    ax.add_patch(fuse_box)
-    ax.text(fuse_pos[0] + fuse_size[0] / 2, fuse_pos[1] + fuse_size[1] / 2,
-            f"Fuse\n{_fuse_sel} A", ha='center', va='center', fontsize=10, fontweight='bold')
-
-    inverter_box = Rectangle(inverter_pos, *inverter_size, fc='red', alpha=0.7)
-    ax.add_patch(inverter_box)
-    ax.text(inverter_pos[0] + inverter_size[0] / 2, inverter_pos[1] + inverter_size[1] / 2,
-            f"Inverter\n{_inverter_sel} W", ha='center', va='center', fontsize=10, fontweight='bold')
-
-    ac_box = Rectangle(ac_breaker_pos, *ac_breaker_size, fc='salmon', alpha=0.7)
-    ax.add_patch(ac_box)
-    ax.text(ac_breaker_pos[0] + ac_breaker_size[0] / 2, ac_breaker_pos[1] + ac_breaker_size[1] / 2,
-            f"AC Breaker\n{_ac_breaker_sel} A", ha='center', va='center', fontsize=10, fontweight='bold')
-
-    outlets_box = Rectangle(outlets_pos, *outlets_size, fc='lightgrey', alpha=0.7)
-    ax.add_patch(outlets_box)
-    ax.text(outlets_pos[0] + outlets_size[0] / 2, outlets_pos[1] + outlets_size[1] / 2,
-            "Outlets", ha='center', va='center', fontsize=10, fontweight='bold')
-
-    load_box = Rectangle(load_pos, *load_size, fc='gray', alpha=0.7)
-    ax.add_patch(load_box)
-    ax.text(load_pos[0] + load_size[0] / 2, load_pos[1] + load_size[1] / 2,
-            f"Load\n{total_wattage:,} W", ha='center', va='center', fontsize=10, fontweight='bold')
-
-    # --- Draw Connection Arrows with Labels ---
-    arrow1 = FancyArrowPatch((solar_pos[0] + solar_size[0], solar_pos[1] + solar_size[1] / 2),
-                             (mppt_pos[0] + mppt_size[0], mppt_pos[1] + mppt_size[1] / 2),
-                             arrowstyle='->', mutation_scale=15, color='black')
-    ax.add_patch(arrow1)
-    ax.text((solar_pos[0] + solar_size[0] + mppt_pos[0] + mppt_size[0]) / 2,
-            solar_pos[1] + solar_size[1] / 2 + 0.5, "DC", fontsize=8, va='center')
-
-    arrow2 = FancyArrowPatch((mppt_pos[0] + mppt_size[0] / 2, mppt_pos[1]),
-                             (cc_pos[0] + cc_size[0] / 2, cc_pos[1] + cc_size[1]),
-                             arrowstyle='->', mutation_scale=15, color='black')
-    ax.add_patch(arrow2)
-    ax.text(mppt_pos[0] + mppt_size[0] / 2,
-            (mppt_pos[1] + cc_pos[1] + cc_size[1]) / 2, "DC", fontsize=8, va='center')
-
-    arrow3 = FancyArrowPatch((cc_pos[0] + cc_size[0], cc_pos[1] + cc_size[1] / 2),
-                             (dc_breaker_pos[0], dc_breaker_pos[1] + dc_breaker_size[1] / 2),
-                             arrowstyle='->', mutation_scale=15, color='black')
-    ax.add_patch(arrow3)
-    ax.text((cc_pos[0] + cc_size[0] + dc_breaker_pos[0]) / 2,
-            cc_pos[1] + cc_size[1] / 2, "DC", fontsize=8, va='center')
-
-    arrow4 = FancyArrowPatch((dc_breaker_pos[0] + dc_breaker_size[0], dc_breaker_pos[1] + dc_breaker_size[1] / 2),
-                             (battery_pos[0], battery_pos[1] + battery_size[1] / 2),
-                             arrowstyle='->', mutation_scale=15, color='black')
-    ax.add_patch(arrow4)
-    ax.text((dc_breaker_pos[0] + dc_breaker_size[0] + battery_pos[0]) / 2,
-            battery_pos[1] + battery_size[1] / 2, "DC", fontsize=8, va='center')
-
-    arrow5 = FancyArrowPatch((battery_pos[0] + battery_size[0], battery_pos[1] + battery_size[1] * 0.8),
-                             (active_balancer_pos[0], active_balancer_pos[1] + active_balancer_size[1] / 2),
-                             arrowstyle='->', mutation_scale=15, color='black')
-    ax.add_patch(arrow5)
-    ax.text((battery_pos[0] + battery_size[0] + active_balancer_pos[0]) / 2,
-            battery_pos[1] + battery_size[1] * 0.8, "DC", fontsize=8, va='center')
-
-    arrow6 = FancyArrowPatch((battery_pos[0] + battery_size[0], battery_pos[1] + battery_size[1] * 0.5),
-                             (fuse_pos[0], fuse_pos[1] + fuse_size[1] / 2),
-                             arrowstyle='->', mutation_scale=15, color='black')
-    ax.add_patch(arrow6)
-    ax.text((battery_pos[0] + battery_size[0] + fuse_pos[0]) / 2,
-            battery_pos[1] + battery_size[1] * 0.5, "DC", fontsize=8, va='center')
-
-    arrow7 = FancyArrowPatch((fuse_pos[0] + fuse_size[0], fuse_pos[1] + fuse_size[1] / 2),
-                             (inverter_pos[0] + inverter_size[0] / 2, inverter_pos[1] + inverter_size[1]),
-                             arrowstyle='->', mutation_scale=15, color='black')
-    ax.add_patch(arrow7)
-    ax.text((fuse_pos[0] + fuse_size[0] + inverter_pos[0] + inverter_size[0] / 2) / 2,
-            (fuse_pos[1] + inverter_pos[1] + inverter_size[1]) / 2, "AC", fontsize=8, va='center')
-
-    arrow8 = FancyArrowPatch((inverter_pos[0] + inverter_size[0], inverter_pos[1] + inverter_size[1] / 2),
-                             (ac_breaker_pos[0], ac_breaker_pos[1] + ac_breaker_size[1] / 2),
-                             arrowstyle='->', mutation_scale=15, color='black')
-    ax.add_patch(arrow8)
-    ax.text((inverter_pos[0] + inverter_size[0] + ac_breaker_pos[0]) / 2,
-            inverter_pos[1] + inverter_size[1] / 2, "AC", fontsize=8, va='center')
-
-    arrow9 = FancyArrowPatch((ac_breaker_pos[0] + ac_breaker_size[0], ac_breaker_pos[1] + ac_breaker_size[1] / 2),
-                             (outlets_pos[0], outlets_pos[1] + outlets_size[1] / 2),
-                             arrowstyle='->', mutation_scale=15, color='black')
-    ax.add_patch(arrow9)
-    ax.text((ac_breaker_pos[0] + ac_breaker_size[0] + outlets_pos[0]) / 2,
-            ac_breaker_pos[1] + ac_breaker_size[1] / 2, "AC", fontsize=8, va='center')
-
-    arrow10 = FancyArrowPatch((outlets_pos[0] + outlets_size[0], outlets_pos[1] + outlets_size[1] / 2),
-                              (load_pos[0], load_pos[1] + load_size[1] / 2),
-                              arrowstyle='->', mutation_scale=15, color='black')
-    ax.add_patch(arrow10)
-    ax.text((outlets_pos[0] + outlets_size[0] + load_pos[0]) / 2,
-            outlets_pos[1] + outlets_size[1] / 2, "AC", fontsize=8, va='center')
-
-    arrow11 = FancyArrowPatch((battery_pos[0] + battery_size[0] / 2, battery_pos[1]),
-                              (inverter_pos[0] + inverter_size[0] / 2, inverter_pos[1] + inverter_size[1]),
-                              arrowstyle='->', mutation_scale=15, color='blue', linestyle='--')
-    ax.add_patch(arrow11)
-    ax.text((battery_pos[0] + battery_size[0] / 2 + inverter_pos[0] + inverter_size[0] / 2) / 2,
-            (battery_pos[1] + inverter_pos[1] + inverter_size[1]) / 2, "DC Backup", fontsize=8, va='center',
-            color='blue')
-
-    ax.text((fuse_pos[0] + fuse_size[0] + inverter_pos[0] + inverter_size[0] / 2) / 2,
-            inverter_pos[1] + inverter_size[1] + 0.5, f"Cable: {_cable_sel} mm²", fontsize=9, va='center', color='blue')
+    global _render_poll_id, _render_key
+    labels = schematic_labels(_sizing_result, total_wattage)
+    if drawing_format_var.get() == "SVG":
+        try:
+            render_svg(labels, SVG_FILENAME)
+            open_image(SVG_FILENAME)
+        except OSError as e:
+            messagebox.showerror("Save Error", f"Error saving the drawing: {e}")
+        return
+    _render_key = diagram_cache.key(labels, DPI)
+    if diagram_cache.get(_render_key, SCHEMATIC_FILENAME):
+        # A render still running for older inputs must not overwrite this file.
+        cancel_render()
+        open_image(SCHEMATIC_FILENAME)
+        return
+    try:
+        renderer.submit(labels, SCHEMATIC_FILENAME)
+    except OSError:
+        render_setup_inline(labels)
+        return
+    show_render_progress(True)
+    if _render_poll_id is None:
+        _render_poll_id = root.after(RENDER_POLL_MS, poll_render)
 
+def render_setup_inline(labels):
     try:
-        filename = "Solar_Setup.png"
-        fig.savefig(filename, dpi=150, bbox_inches='tight')
-        plt.close(fig)
-        open_image(filename)
+        render_png(labels, SCHEMATIC_FILENAME)
+        diagram_cache.put(_render_key, SCHEMATIC_FILENAME)
+        open_image(SCHEMATIC_FILENAME)
     except Exception as e:
         messagebox.showerror("Save Error", f"Error saving the drawing: {e}")
-        plt.close(fig)
+
+def poll_render():
+    global _render_poll_id
+    _render_poll_id = None
+    for event in renderer.poll():
+        if event["event"] == "done":
+            diagram_cache.put(_render_key, event["path"])
+            open_image(event["path"])
+        elif event["event"] == "error":
+            messagebox.showerror("Save Error", f"Error saving the drawing: {event['error']}")
+    if renderer.busy:
+        _render_poll_id = root.after(RENDER_POLL_MS, poll_render)
+    else:
+        show_render_progress(False)
+
+def cancel_render():
+    renderer.cancel()
+    show_render_progress(False)
+
+def show_render_progress(active):
+    if active:
+        render_label.config(text=f"Rendering '{SCHEMATIC_FILENAME}'...")
+        render_progress.start(10)
+        cancel_render_button.config(state="normal")
+    else:
+        render_label.config(text="")
+        render_progress.stop()
+        cancel_render_button.config(state="disabled")
+
+def open_preview():
+    global _preview
+    if _preview is not None:
+        _preview[0].lift()
+        return
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+    window = tk.Toplevel(root)
+    window.title("Solar Setup Preview")
+    figure = Figure(figsize=FIGSIZE, dpi=PREVIEW_DPI)
+    canvas = FigureCanvasTkAgg(figure, master=window)
+    canvas.get_tk_widget().pack(fill="both", expand=True)
+    _preview = (window, SchematicTemplate(figure), canvas)
+    window.protocol("WM_DELETE_WINDOW", close_preview)
+    update_preview()
+
+def update_preview():
+    if _preview is None or _sizing_result is None:
+        return
+    _, template, canvas = _preview
+    template.update(schematic_labels(_sizing_result, total_wattage))
+    canvas.draw_idle()
+
+def close_preview():
+    global _preview
+    if _preview is not None:
+        _preview[0].destroy()
+        _preview = None
+
+def start_renderer():
+    if drawing_format_var.get() != "PNG":
+        return
+    try:
+        renderer.start()
+    except OSError:
+        pass
+
+def start_weather_risk():
+    global _risk_run, _risk_inputs
+    if _sizing_result is None:
+        messagebox.showinfo("Weather Risk", "Add appliances first; the risk is computed for the current design.")
+        return
+    cancel_weather_risk()
+    from weather_risk import WeatherRiskRun
+    try:
+        _risk_run = WeatherRiskRun(load_model.rows(), _sizing_result)
+    except OSError as e:
+        messagebox.showerror("Weather Risk", f"Cannot start the weather simulation: {e}")
+        return
+    _risk_inputs = (load_model.rows(), _sizing_result)
+    risk_label.config(text="Simulating weather years...")
+    root.after(RISK_POLL_MS, poll_weather_risk, _risk_run)
+
+def poll_weather_risk(run):
+    if run is not _risk_run:
+        return
+    from weather_risk import risk_text
+    for event in run.poll():
+        if event["event"] == "progress":
+            risk_label.config(text=f"Simulating weather years... {event['done']}/{event['total']}")
+        elif event["event"] == "done":
+            risk_label.config(text=risk_text(event["risk"]))
+        elif event["event"] == "error":
+            risk_label.config(text=f"Weather risk failed: {event['error']}")
+    if not run.finished:
+        root.after(RISK_POLL_MS, poll_weather_risk, run)
+
+def cancel_weather_risk():
+    global _risk_run, _risk_inputs
+    if _risk_run is not None:
+        _risk_run.cancel()
+    _risk_run = None
+    _risk_inputs = None
+    risk_label.config(text="")
+
+def invalidate_weather_risk():
+    if _risk_inputs is not None and _risk_inputs != (load_model.rows(), _sizing_result):
+        cancel_weather_risk()
+
+def show_minute_stats():
+    global _minute_run, _minute_inputs
+    recompute.request("size")
+    recompute.flush()
+    if _sizing_result is None:
+        messagebox.showerror("Minute Load Error", "No data available to synthesize the minute load.")
+        return
+    cancel_minute_stats()
+    from load_synthesis import MinuteStatsRun
+    rows = load_model.rows()
+    _minute_run = MinuteStatsRun(rows, _sizing_result)
+    _minute_inputs = (rows, _sizing_result)
+    minute_label.config(text="Synthesizing minute load...")
+    root.after(MINUTE_POLL_MS, poll_minute_stats, _minute_run)
+
+def poll_minute_stats(run):
+    if run is not _minute_run:
+        return
+    from load_synthesis import minute_text
+    for event in run.poll():
+        if event["event"] == "progress":
+            minute_label.config(text=f"Synthesizing minute load... day {event['done']}/{event['total']}")
+        elif event["event"] == "done":
+            minute_label.config(text=minute_text(event["stats"]))
+        elif event["event"] == "error":
+            minute_label.config(text=f"Minute load failed: {event['error']}")
+    if not run.finished:
+        root.after(MINUTE_POLL_MS, poll_minute_stats, run)
+
+def cancel_minute_stats():
+    global _minute_run, _minute_inputs
+    if _minute_run is not None:
+        _minute_run.cancel()
+    _minute_run = None
+    _minute_inputs = None
+    minute_label.config(text="")
+
+def invalidate_minute_stats():
+    if _minute_inputs is not None and _minute_inputs != (load_model.rows(), _sizing_result):
+        cancel_minute_stats()
+
+def open_optimizer():
+    global _optimizer
+    from design_search import DESIGN_COLUMNS, design_rows, search_designs
+    designs = search_designs(load_model.summary())
+    if not designs:
+        messagebox.showinfo("Optimize", "No design in the catalog meets the current load.")
+        return
+    close_optimizer()
+    window = tk.Toplevel(root)
+    window.title("Cheapest Designs")
+    table = ttk.Treeview(window, columns=DESIGN_COLUMNS, show="headings", height=len(designs))
+    for col in DESIGN_COLUMNS:
+        table.heading(col, text=col)
+        table.column(col, width=160, anchor="center")
+    for index, row_values in enumerate(design_rows(designs)):
+        table.insert("", "end", iid=str(index), values=row_values)
+    table.pack(fill="both", expand=True, padx=5, pady=5)
+    table.bind("<Double-1>", lambda event: apply_design())
+    ttk.Button(window, text="Apply", command=apply_design, width=8).pack(pady=5)
+    window.protocol("WM_DELETE_WINDOW", close_optimizer)
+    _optimizer = (window, table, designs)
+
+def apply_design():
+    if _optimizer is None:
+        return
+    _, table, designs = _optimizer
+    selected = table.selection()
+    if not selected:
+        return
+    design = designs[int(selected[0])]
+    system_voltage_combobox.set(f"{design.system_voltage:g}")
+    dod_combobox.set(f"{design.dod:g}")
+    panel_size_combobox.set(f"{design.panel_size:g}")
+    recalc_totals()
+
+def close_optimizer():
+    global _optimizer
+    if _optimizer is not None:
+        _optimizer[0].destroy()
+        _optimizer = None
+
+def open_lolp():
+    global _lolp
+    if _lolp is not None:
+        _lolp[0].lift()
+        return
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+    window = tk.Toplevel(root)
+    window.title("PV / Battery Trade-off")
+    figure = Figure(figsize=LOLP_FIGSIZE, dpi=100)
+    canvas = FigureCanvasTkAgg(figure, master=window)
+    canvas.get_tk_widget().pack(fill="both", expand=True)
+    _lolp = (window, figure.subplots(), canvas)
+    window.protocol("WM_DELETE_WINDOW", close_lolp)
+    update_lolp()
+
+def update_lolp():
+    if _lolp is None:
+        return
+    _, ax, canvas = _lolp
+    if _sizing_result is None:
+        ax.clear()
+    else:
+        from lolp_curve import lolp_surface, plot_curve
+        plot_curve(ax, lolp_surface(load_model.rows(), _sizing_result), _sizing_result)
+    canvas.draw_idle()
+
+def close_lolp():
+    global _lolp
+    if _lolp is not None:
+        _lolp[0].destroy()
+        _lolp = None
 
 def open_image(filepath):
     try:
@@ -443,139 +606,215 @@ def open_csv():
         messagebox.showerror("Open Error", f"Error opening the CSV file: {e}")
 
 def calculate_gen_set():
-    global total_consumption_kWh, total_wattage
-    global _battery_Ah_req, _num_panels, _total_pv_capacity, _inverter_sel, _mppt_sel, _scc_sel
-    global _active_balancer_sel, _fuse_sel, _system_voltage, _dc_breaker_sel, _ac_breaker_sel, _cable_sel
-
-    # Clear previous entries
-    for item in solar_tree.get_children():
-        solar_tree.delete(item)
+    global _sizing_result
 
     if total_consumption_kWh <= 0 or total_wattage <= 0:
+        _sizing_result = None
+        solar_rows.show([])
         summary_label.config(text="")
+        invalidate_weather_risk()
+        invalidate_minute_stats()
+        if _lolp is not None:
+            recompute.request("lolp")
         return
 
     try:
-        _system_voltage = float(system_voltage_var.get())
-        print("System Voltage:", _system_voltage)  # Debug print
-        dod = float(dod_var.get())
-        panel_size = float(panel_size_var.get())
+        params = SizingParams(
+            system_voltage=float(system_voltage_var.get()),
+            dod=float(dod_var.get()),
+            panel_size=float(panel_size_var.get())
+        )
+        print("System Voltage:", params.system_voltage)  # Debug print
     except ValueError:
+        _sizing_result = None
+        solar_rows.show([])
         messagebox.showerror("Input Error", "Please ensure all solar parameters are valid numbers.")
+        invalidate_weather_risk()
+        invalidate_minute_stats()
         return
 
-    # Constants and margins
-    sun_hours = 5.5
-    battery_margin = 1.20
-    inverter_margin = 1.25
-    pv_margin = 1.20
-    performance_ratio = 0.8
-
-    daily_consumption_Wh = total_consumption_kWh * 1000
-    _battery_Ah_req = (daily_consumption_Wh * battery_margin) / (_system_voltage * (dod / 100))
-
-    inverter_required = total_wattage * inverter_margin
-    _inverter_sel = next((inv for inv in sorted(INVERTER_SIZES) if inv >= inverter_required), None)
-    if _inverter_sel is None:
-        _inverter_sel = f"> {max(INVERTER_SIZES)}"
-
-    pv_capacity_required = (daily_consumption_Wh * pv_margin) / (sun_hours * performance_ratio)
-    _num_panels = math.ceil(pv_capacity_required / panel_size)
-    _total_pv_capacity = _num_panels * panel_size
-
-    current_per_panel = panel_size / _system_voltage
-    total_pv_current = _num_panels * current_per_panel
-
-    _mppt_sel = next((mppt for mppt in sorted(MPPT_SIZES) if mppt >= total_pv_current), None)
-    if _mppt_sel is None:
-        _mppt_sel = f"> {max(MPPT_SIZES)}"
-
-    _scc_sel = next((scc for scc in sorted(SCC_SIZES) if scc >= total_pv_current), None)
-    if _scc_sel is None:
-        _scc_sel = f"> {max(SCC_SIZES)}"
-
-    dc_breaker_required = total_pv_current * 1.20
-    _dc_breaker_sel = next((dc for dc in sorted(DC_BREAKER_SIZES) if dc >= dc_breaker_required), None)
-    if _dc_breaker_sel is None:
-        _dc_breaker_sel = f"> {max(DC_BREAKER_SIZES)}"
-
-    inverter_ac_current = (_inverter_sel / 230) if isinstance(_inverter_sel, (int, float)) else (
-                inverter_required / 230)
-    ac_breaker_required = inverter_ac_current * 1.25
-    _ac_breaker_sel = next((ac for ac in sorted(BREAKER_SIZES) if ac >= ac_breaker_required), None)
-    if _ac_breaker_sel is None:
-        _ac_breaker_sel = f"> {max(BREAKER_SIZES)}"
-
-    inverter_current = (_inverter_sel / _system_voltage) if isinstance(_inverter_sel, (int, float)) else (
-                inverter_required / _system_voltage)
-    cable_required = inverter_current * 1.25
-    cable_selected = None
-    for size in sorted(CABLE_SIZES):
-        if AMPACITY_RATING.get(size, 0) >= cable_required:
-            cable_selected = size
-            break
-    if cable_selected is None:
-        cable_selected = f"> {max(CABLE_SIZES)}"
-    _cable_sel = cable_selected
-
-    active_balancer_required = _battery_Ah_req * 0.05
-    active_balancer_required = max(active_balancer_required, 5)
-    _active_balancer_sel = next((bal for bal in sorted(ACTIVE_BALANCER_SIZES) if bal >= active_balancer_required), None)
-    if _active_balancer_sel is None:
-        _active_balancer_sel = f"> {max(ACTIVE_BALANCER_SIZES)}"
-
-    fuse_required = inverter_current * 1.25
-    _fuse_sel = next((f for f in sorted(FUSE_SIZES) if f >= fuse_required), None)
-    if _fuse_sel is None:
-        _fuse_sel = f"> {max(FUSE_SIZES)}"
-
-    # Insert rows into solar_tree
-    solar_tree.insert("", "end",
-                      values=("Daily Consumption (Wh)", f"{daily_consumption_Wh:,.0f}", "From appliance loads"))
-    solar_tree.insert("", "end",
-                      values=("Battery Capacity (Ah)", f"{_battery_Ah_req:,.0f}", f"{_system_voltage}V, DOD: {dod}%"))
-    solar_tree.insert("", "end",
-                      values=("Inverter Size (W)", f"{_inverter_sel}", f"Required: {inverter_required:,.0f}W"))
-    solar_tree.insert("", "end", values=(
-    "PV Array Capacity (W)", f"{_total_pv_capacity:,.0f}", f"{_num_panels} panels @ {panel_size}W each"))
-    solar_tree.insert("", "end",
-                      values=("MPPT Controller (A)", f"{_mppt_sel}", f"Total PV Current: {total_pv_current:.2f}A"))
-    solar_tree.insert("", "end",
-                      values=("Charge Controller (A)", f"{_scc_sel}", f"Total PV Current: {total_pv_current:.2f}A"))
-    solar_tree.insert("", "end",
-                      values=("DC Circuit Breaker (A)", f"{_dc_breaker_sel}", f"Required: {dc_breaker_required:.2f}A"))
-    solar_tree.insert("", "end", values=(
-    "AC Circuit Breaker (A)", f"{_ac_breaker_sel}", f"Inverter AC Current: {inverter_ac_current:.2f}A"))
-    solar_tree.insert("", "end",
-                      values=("Cable Size (mm²)", f"{_cable_sel}", f"Required Ampacity for {cable_required:.2f}A"))
-    solar_tree.insert("", "end", values=(
-    "Active Balancer (A)", f"{_active_balancer_sel}", f"Required: {active_balancer_required:.2f}A"))
-    solar_tree.insert("", "end", values=("Fuse Size (A)", f"{_fuse_sel}", f"Required: {fuse_required:.2f}A"))
-
-    summary_text = (
-        f"Battery: {_system_voltage}V, {_battery_Ah_req:,.0f}Ah | "
-        f"Panels: {_num_panels} ({_total_pv_capacity:,}W total) | "
-        f"Inverter: {_inverter_sel}W | "
-        f"MPPT: {_mppt_sel}A | "
-        f"SCC: {_scc_sel}A | "
-        f"Balancer: {_active_balancer_sel}A | "
-        f"Fuse: {_fuse_sel}A"
-    )
-    summary_label.config(text=summary_text)
+    peaks = load_model.peaks()
+    _sizing_result = sizing_cache.size(load_model.summary(peaks), params, compute=sizing_graph.evaluate)
+    system_voltage = _sizing_result.system_voltage
+    rows = result_rows(_sizing_result)
+
+    surge_name = None
+    if peaks.surge_row >= 0:
+        surge_name = load_model.record(load_model.row_ids()[peaks.surge_row])["appliance"]
+    rows += peak_rows(peaks, total_wattage, surge_name, params)
+
+    # Check the design against a simulated year (imports NumPy on first use, off the startup path)
+    from year_simulation import simulation_rows
+    simulation = sizing_cache.simulate(load_model.profile(), _sizing_result)
+    rows += simulation_rows(simulation, _sizing_result)
+
+    summary_label.config(text=summary_text(_sizing_result))
+    update_preview()
+    invalidate_weather_risk()
+    invalidate_minute_stats()
+    if _lolp is not None:
+        recompute.request("lolp")
 
     # Insert Battery Configuration row
     try:
-        if _system_voltage >= 12:
-            series_count = int(_system_voltage / 12)
+        if system_voltage >= 12:
+            series_count = int(system_voltage / 12)
             batt_config_str = f"{series_count}S"  # e.g., "2S" for 24V system
             print("Inserting Battery Configuration:", batt_config_str)  # Debug print
-            solar_tree.insert("", "end", values=(
+            rows.append((
                 "Battery Configuration",
                 batt_config_str,
-                f"{_system_voltage}V system: {_system_voltage} ÷ 12V = {series_count} batteries in series"
+                f"{system_voltage}V system: {system_voltage} ÷ 12V = {series_count} batteries in series"
             ))
     except Exception as e:
         print(f"Error calculating battery configuration: {e}")
+    solar_rows.show(rows)
+
+def load_appliance_catalog():
+    global appliance_catalog, appliance_index
+    appliance_catalog = load_catalog(resource_path("Appliances.csv"))
+    appliance_index = ApplianceIndex(appliance_catalog.names)
+    PROFILE.mark("appliance catalog")
+    appliance_combobox['values'] = appliance_catalog.names
+    if appliance_catalog.names:
+        appliance_var.set(appliance_catalog.names[0])
+
+def restore_schedule():
+    load_model.extend(journal.replay())
+    tree.refresh()
+    PROFILE.mark("schedule restored")
+    if len(load_model):
+        recalc_totals()
+    if journal.read_only:
+        messagebox.showwarning("Schedule In Use",
+                               f"{os.path.basename(csv_filename)} is open in another window. "
+                               "Changes made in this window will not be saved.")
+
+def report_startup():
+    PROFILE.mark("first idle frame")
+    PROFILE.report()
+
+def update_autosave_status():
+    status = autosave.status()
+    if status["last_error"] is not None:
+        text = f"Could not save '{csv_filename}' (is it open in another application?) - retrying..."
+    elif status["pending"]:
+        text = f"Saving '{csv_filename}'..."
+    elif status["writes"]:
+        text = (f"Saved '{csv_filename}' in {status['last_write_ms']:.1f} ms "
+                f"(max {status['max_write_ms']:.1f} ms, {status['coalesced']} saves coalesced)")
+    else:
+        text = ""
+    autosave_label.config(text=text)
+    root.after(AUTOSAVE_POLL_MS, update_autosave_status)
+
+def import_schedule():
+    global _import
+    if _import is not None:
+        messagebox.showinfo("Import", "An import is already running.")
+        return
+    path = filedialog.askopenfilename(title="Import Load Schedule",
+                                      filetypes=[("Load schedules", "*.csv *.parquet"), ("All files", "*.*")])
+    if not path:
+        return
+    try:
+        _import = ScheduleImport(path, appliance_catalog)
+    except (OSError, ValueError, ImportError) as e:
+        messagebox.showerror("Import Error", f"Cannot import {os.path.basename(path)}: {e}")
+        return
+    import_button.config(state="disabled")
+    import_cancel_button.config(state="normal")
+    import_progress["value"] = 0
+    root.after(IMPORT_STEP_MS, import_next_chunk, _import)
+
+def import_next_chunk(run):
+    if run is not _import:
+        return
+    chunk = run.next_chunk()
+    if chunk:
+        rows = [(journal.new_id(), fields) for fields in chunk]
+        load_model.extend(rows)
+        journal.add_many(rows)
+        tree.refresh(*(row_id for row_id, _ in rows))
+    if run.finished:
+        finish_import()
+        return
+    import_progress["value"] = run.done * 100
+    import_label.config(text=f"Importing... {run.rows:,} rows")
+    root.after(IMPORT_STEP_MS, import_next_chunk, run)
+
+def finish_import():
+    global _import
+    run, _import = _import, None
+    import_button.config(state="normal")
+    import_cancel_button.config(state="disabled")
+    import_progress["value"] = 0
+    import_label.config(text=run.report())
+    recalc_totals()
+    if run.cancelled:
+        return
+    problems = sorted(run.errors + run.warnings)
+    lines = [f"Line {line}: {reason}" for line, reason in problems[:IMPORT_ERRORS_SHOWN]]
+    if run.skipped + run.cleared > len(lines):
+        lines.append(f"... and {run.skipped + run.cleared - len(lines):,} more")
+    message = run.report() + "." + ("\n\n" + "\n".join(lines) if lines else "")
+    if run.stopped is not None:
+        messagebox.showerror("Import Error", message)
+    elif lines:
+        messagebox.showwarning("Import", message)
+
+def cancel_import():
+    if _import is not None:
+        _import.cancel()
+        finish_import()
+
+def open_debug_view():
+    global _debug
+    if _debug is not None:
+        _debug[0].lift()
+        return
+    window = tk.Toplevel(root)
+    window.title("Debug")
+    label = ttk.Label(window, text="", justify="left", font=("Courier", 10))
+    label.pack(fill="both", expand=True, padx=10, pady=10)
+    window.protocol("WM_DELETE_WINDOW", close_debug_view)
+    _debug = (window, label)
+    update_debug_view()
+
+def update_debug_view():
+    if _debug is None:
+        return
+    counters = (
+        ("Load model", load_model.stats()),
+        ("Sizing cache", sizing_cache.sizing.stats()),
+        ("Sizing graph", sizing_graph.stats()),
+        ("Solar table", solar_rows.stats()),
+        ("Simulation cache", sizing_cache.simulations.stats()),
+        ("Diagram cache", diagram_cache.stats()),
+        ("Recompute", recompute.stats()),
+    )
+    _debug[1].config(text="\n".join(
+        f"{name:<18}" + ", ".join(f"{key} {value}" for key, value in stats.items()) for name, stats in counters
+    ))
+    root.after(DEBUG_POLL_MS, update_debug_view)
+
+def close_debug_view():
+    global _debug
+    if _debug is not None:
+        _debug[0].destroy()
+        _debug = None
+
+def on_close():
+    close_lolp()
+    close_debug_view()
+    cancel_import()
+    cancel_minute_stats()
+    recompute.flush()
+    journal.close()
+    autosave.close()
+    renderer.close()
+    cancel_weather_risk()
+    root.destroy()
 
 # ------------------------- Build the GUI -------------------------
 root = tk.Tk()
@@ -586,25 +825,30 @@ root.grid_columnconfigure(0, weight=1)
 root.grid_rowconfigure(1, weight=1)
 root.grid_rowconfigure(2, weight=2)
 
+# Sizing and CSV saves run once per burst of UI events instead of once per event
+recompute = RecomputeScheduler(root)
+recompute.register("size", calculate_gen_set)
+recompute.register("save", save_to_csv)
+recompute.register("lolp", update_lolp)
+root.protocol("WM_DELETE_WINDOW", on_close)
+root.bind("<F12>", lambda event: open_debug_view())
+
 top_frame = ttk.Frame(root, padding="5")
 top_frame.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
 
 appliance_label = ttk.Label(top_frame, text="Appliance:")
 appliance_label.grid(row=0, column=0, padx=5, pady=2, sticky="w")
 appliance_var = tk.StringVar()
-appliance_combobox = ttk.Combobox(top_frame, textvariable=appliance_var,
-                                  values=appliance_data['Appliance'].tolist(), width=45)
+appliance_combobox = ttk.Combobox(top_frame, textvariable=appliance_var, values=[], width=45)
 appliance_combobox.grid(row=0, column=1, padx=5, pady=2)
-appliance_var.set(appliance_data.iloc[0]['Appliance'])
 appliance_var.trace_add("write", update_fields)
-appliance_combobox.bind("<<ComboboxSelected>>", lambda event: calculate_gen_set())
+appliance_combobox.bind("<<ComboboxSelected>>", lambda event: recompute.request("size"))
 appliance_combobox.bind("<KeyRelease>", on_combobox_keyrelease)
 
 rated_power_label = ttk.Label(top_frame, text="Rated Power (W):")
 rated_power_label.grid(row=0, column=2, padx=5, pady=2, sticky="w")
 rated_power_combobox = ttk.Combobox(top_frame, width=10)
 rated_power_combobox.grid(row=0, column=3, padx=5, pady=2)
-rated_power_combobox.set(appliance_data.iloc[0]['Rated Power (W)'])
 
 usage_hours_label = ttk.Label(top_frame, text="Usage Hours:")
 usage_hours_label.grid(row=0, column=4, padx=5, pady=2, sticky="w")
@@ -622,6 +866,17 @@ counts_combobox.set("1")
 counts_combobox.bind("<<ComboboxSelected>>", lambda event: recalc_totals())
 counts_combobox.bind("<KeyRelease>", lambda event: recalc_totals())
 
+# Optional daily running window; blank runs at any time (counted as always on for the peaks)
+clock_values = [""] + [f"{hour:02d}:00" for hour in range(24)]
+start_label = ttk.Label(top_frame, text="Start:")
+start_label.grid(row=1, column=2, padx=5, pady=2, sticky="w")
+start_combobox = ttk.Combobox(top_frame, values=clock_values, width=10)
+start_combobox.grid(row=1, column=3, padx=5, pady=2)
+end_label = ttk.Label(top_frame, text="End:")
+end_label.grid(row=1, column=4, padx=5, pady=2, sticky="w")
+end_combobox = ttk.Combobox(top_frame, values=clock_values, width=8)
+end_combobox.grid(row=1, column=5, padx=5, pady=2)
+
 add_button = ttk.Button(top_frame, text="Add", command=add_appliance, width=8)
 add_button.grid(row=0, column=8, padx=5, pady=2)
 
@@ -635,16 +890,62 @@ draw_button.grid(row=0, column=10, padx=5, pady=2)
 csv_button = ttk.Button(top_frame, text="Open CSV", command=open_csv, width=12)
 csv_button.grid(row=0, column=11, padx=5, pady=2)
 
-tree = ttk.Treeview(root,
-                    columns=("Appliance", "Power (W)", "PF", "Eff(%)", "Surge(W)", "Usage (Hrs)", "Count", "Consumption (kWh)"),
+preview_button = ttk.Button(top_frame, text="Preview", command=open_preview, width=8)
+preview_button.grid(row=0, column=12, padx=5, pady=2)
+
+risk_button = ttk.Button(top_frame, text="Risk", command=start_weather_risk, width=8)
+risk_button.grid(row=0, column=13, padx=5, pady=2)
+
+optimize_button = ttk.Button(top_frame, text="Optimize", command=open_optimizer, width=8)
+optimize_button.grid(row=0, column=14, padx=5, pady=2)
+
+lolp_button = ttk.Button(top_frame, text="LOLP", command=open_lolp, width=8)
+lolp_button.grid(row=0, column=15, padx=5, pady=2)
+
+minutes_button = ttk.Button(top_frame, text="Minutes", command=show_minute_stats, width=8)
+minutes_button.grid(row=0, column=16, padx=5, pady=2)
+
+import_button = ttk.Button(top_frame, text="Import", command=import_schedule, width=8)
+import_button.grid(row=0, column=17, padx=5, pady=2)
+
+# The schedule table only creates Tk items for the rows on screen (see virtual_table.py);
+# clicking a heading sorts it and the filter entry narrows it down.
+table_frame = ttk.Frame(root)
+table_frame.grid(row=1, column=0, padx=5, pady=5, sticky="nsew")
+table_frame.grid_rowconfigure(0, weight=1)
+table_frame.grid_columnconfigure(0, weight=1)
+
+tree = VirtualTable(table_frame, load_model,
+                    columns=SCHEDULE_COLUMNS,
                     show="headings", selectmode="extended", height=8)
-tree.grid(row=1, column=0, padx=5, pady=5, sticky="nsew")
+tree.grid(row=0, column=0, sticky="nsew")
+tree_scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
+tree_scrollbar.grid(row=0, column=1, sticky="ns")
+tree.configure(yscrollcommand=tree_scrollbar.set)
 for col in tree["columns"]:
     tree.heading(col, text=col)
     tree.column(col, width=120, anchor="center")
 tree.bind("<<TreeviewSelect>>", on_tree_select)
 tree.bind("<Double-1>", on_tree_double_click)
 
+filter_frame = ttk.Frame(table_frame)
+filter_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(2, 0))
+filter_label = ttk.Label(filter_frame, text="Filter:")
+filter_label.grid(row=0, column=0, padx=5, sticky="w")
+filter_var = tk.StringVar()
+filter_entry = ttk.Entry(filter_frame, textvariable=filter_var, width=30)
+filter_entry.grid(row=0, column=1, padx=5, sticky="w")
+filter_entry.bind("<KeyRelease>", lambda event: tree.set_filter(filter_var.get()))
+table_status_label = ttk.Label(filter_frame, textvariable=tree.status)
+table_status_label.grid(row=0, column=2, padx=5, sticky="e")
+import_label = ttk.Label(filter_frame, text="", foreground="gray")
+import_label.grid(row=0, column=3, padx=5, sticky="e")
+import_progress = ttk.Progressbar(filter_frame, mode="determinate", length=150, maximum=100)
+import_progress.grid(row=0, column=4, padx=5, sticky="e")
+import_cancel_button = ttk.Button(filter_frame, text="Cancel", command=cancel_import, width=8, state="disabled")
+import_cancel_button.grid(row=0, column=5, padx=5, sticky="e")
+filter_frame.grid_columnconfigure(2, weight=1)
+
 solar_frame = ttk.LabelFrame(root, text="Solar Gen Set Requirements", padding="5")
 solar_frame.grid(row=2, column=0, sticky="nsew", padx=5, pady=5)
 
@@ -690,6 +991,15 @@ panel_size_combobox.set("100")
 panel_size_combobox.bind("<<ComboboxSelected>>", lambda event: recalc_totals())
 panel_size_combobox.bind("<KeyRelease>", lambda event: recalc_totals())
 
+drawing_format_label = ttk.Label(solar_frame, text="Drawing Format:")
+drawing_format_label.grid(row=0, column=6, padx=5, pady=2, sticky="w")
+drawing_format_var = tk.StringVar()
+drawing_format_combobox = ttk.Combobox(solar_frame, textvariable=drawing_format_var,
+                                       values=DRAWING_FORMATS, width=6, state="readonly")
+drawing_format_combobox.grid(row=0, column=7, padx=5, pady=2)
+drawing_format_combobox.set("PNG")
+drawing_format_combobox.bind("<<ComboboxSelected>>", lambda event: start_renderer())
+
 # Create the Treeview for solar requirements
 solar_tree = ttk.Treeview(
     solar_frame,
@@ -697,6 +1007,7 @@ solar_tree = ttk.Treeview(
     show="headings", height=12
 )
 solar_tree.grid(row=1, column=0, columnspan=6, padx=5, pady=5, sticky="nsew")
+solar_rows = TreeRows(solar_tree)
 
 # Set up headings and columns
 for col in solar_tree["columns"]:
@@ -713,6 +1024,20 @@ summary_frame = ttk.Frame(solar_frame, padding="5")
 summary_frame.grid(row=2, column=0, columnspan=6, sticky="ew", padx=5, pady=5)
 summary_label = ttk.Label(summary_frame, text="", font=("Arial", 11, "bold"))
 summary_label.pack(fill="x")
+autosave_label = ttk.Label(summary_frame, text="", foreground="gray")
+autosave_label.pack(fill="x")
+render_frame = ttk.Frame(summary_frame)
+render_frame.pack(fill="x")
+render_label = ttk.Label(render_frame, text="", foreground="gray")
+render_label.pack(side="left")
+cancel_render_button = ttk.Button(render_frame, text="Cancel", command=cancel_render, width=8, state="disabled")
+cancel_render_button.pack(side="right", padx=5)
+render_progress = ttk.Progressbar(render_frame, mode="indeterminate", length=150)
+render_progress.pack(side="right")
+risk_label = ttk.Label(summary_frame, text="", foreground="gray", wraplength=900, justify="left")
+risk_label.pack(fill="x")
+minute_label = ttk.Label(summary_frame, text="", foreground="gray", wraplength=900, justify="left")
+minute_label.pack(fill="x")
 
 # Configure grid weights to allow treeview expansion
 solar_frame.grid_rowconfigure(1, weight=1)
@@ -721,4 +1046,10 @@ solar_frame.grid_columnconfigure(0, weight=1)
 # -------------------------
 # Start the Application
 # -------------------------
+PROFILE.mark("window built")
+root.after_idle(restore_schedule)
+root.after_idle(load_appliance_catalog)
+root.after_idle(report_startup)
+root.after_idle(start_renderer)
+root.after(AUTOSAVE_POLL_MS, update_autosave_status)
 root.mainloop()
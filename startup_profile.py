@@ -0,0 +1,45 @@
+# startup_profile.py
+# This file times the phases of application startup.
+# Run the GUI with --profile-startup (or set SOLAR_PROFILE_STARTUP=1) to print a breakdown of
+# where cold start time goes: imports, catalog load, window build and first idle frame.
+# For a per-module view of the imports, Python's own "python -X importtime solar.py" also works.
+
+import os
+import sys
+import time
+
+# The clock starts when this module is first imported, which the GUIs do before anything else.
+_T0 = time.perf_counter()
+
+
+class StartupProfile:
+    """
+    Records named checkpoints since process start and prints the time spent in each phase.
+    """
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self._marks = [("start", _T0)]
+
+    def mark(self, label):
+        """
+        Records the end of a startup phase.
+        """
+        self._marks.append((label, time.perf_counter()))
+
+    def report(self, out=None):
+        """
+        Prints the time of every phase and the total, if profiling is enabled.
+        """
+        if not self.enabled:
+            return
+        out = out or sys.stderr
+        print("Startup time breakdown:", file=out)
+        for (_, previous), (label, at) in zip(self._marks, self._marks[1:]):
+            print(f"  {label:<28} {(at - previous) * 1000:8.1f} ms", file=out)
+        print(f"  {'total':<28} {(self._marks[-1][1] - _T0) * 1000:8.1f} ms", file=out)
+        heavy = [name for name in ("pandas", "numpy", "matplotlib") if name in sys.modules]
+        print(f"  heavy modules loaded: {', '.join(heavy) or 'none'}", file=out)
+
+
+PROFILE = StartupProfile("--profile-startup" in sys.argv or bool(os.environ.get("SOLAR_PROFILE_STARTUP")))
@@ -0,0 +1,8 @@
+# tests/conftest.py
+# This file puts the repository root on sys.path, so the tests import the flat top-level
+# modules (sizing_engine, load_model, ...) the same way the GUIs do.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
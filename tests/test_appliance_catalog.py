@@ -0,0 +1,67 @@
+# tests/test_appliance_catalog.py
+# This file checks that the binary appliance cache serves the same catalog as the CSV, is
+# rebuilt when the CSV changes, and leaves no mapping open behind the returned columns.
+
+import os
+import shutil
+from array import array
+
+import pytest
+
+from appliance_catalog import ApplianceCatalog, load_catalog
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def catalog_csv(tmp_path):
+    path = str(tmp_path / "Appliances.csv")
+    shutil.copy(os.path.join(REPO, "Appliances.csv"), path)
+    return path
+
+
+def _as_float32(values):
+    return list(array('f', values))
+
+
+def test_cache_serves_the_csv_values(catalog_csv, tmp_path):
+    cache = str(tmp_path / "Appliances.cache")
+    parsed = ApplianceCatalog.from_csv(catalog_csv)
+    first = load_catalog(catalog_csv, cache)
+    assert os.path.exists(cache)
+    second = load_catalog(catalog_csv, cache)
+    for catalog in (first, second):
+        assert catalog.names == parsed.names
+        assert isinstance(catalog.power, array)  # Copied out of the mapping, not a view into it
+        for column in ("power", "power_factor", "efficiency", "surge"):
+            assert list(getattr(catalog, column)) == pytest.approx(_as_float32(getattr(parsed, column)), nan_ok=True)
+    name = parsed.names[0]
+    assert second.record(name) == first.record(name)
+    assert second.record("No such appliance") is None
+
+
+def test_cache_follows_changes_to_the_csv(catalog_csv, tmp_path):
+    cache = str(tmp_path / "Appliances.cache")
+    load_catalog(catalog_csv, cache)
+
+    # Same contents, new mtime: the cached columns are reused and the cache is rewritten in place.
+    stat = os.stat(catalog_csv)
+    os.utime(catalog_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert load_catalog(catalog_csv, cache).names == ApplianceCatalog.from_csv(catalog_csv).names
+    with open(cache, 'rb') as file:
+        header = file.read(24)
+    assert int.from_bytes(header[8:16], 'little', signed=True) == stat.st_mtime_ns + 10 ** 9
+
+    with open(catalog_csv, 'a', encoding='utf-8') as file:
+        file.write("Test Heater,1234,0.95,99,2468\n")
+    catalog = load_catalog(catalog_csv, cache)
+    assert catalog.record("Test Heater") == ("Test Heater", 1234.0, pytest.approx(0.95), 99.0, 2468.0)
+
+
+def test_broken_cache_is_rebuilt(catalog_csv, tmp_path):
+    cache = str(tmp_path / "Appliances.cache")
+    with open(cache, 'wb') as file:
+        file.write(b"not a cache")
+    assert len(load_catalog(catalog_csv, cache)) == len(ApplianceCatalog.from_csv(catalog_csv))
+    with open(cache, 'rb') as file:
+        assert file.read(8) == b"APLCAT01"
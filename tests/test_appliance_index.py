@@ -0,0 +1,69 @@
+# tests/test_appliance_index.py
+# This file checks the appliance search index against a brute-force ranking of every name.
+
+import math
+import random
+
+from appliance_index import FUZZY_THRESHOLD, ApplianceIndex, _trigrams
+
+NAMES = [
+    "Refrigerator", "Refrigerator (Inverter)", "Chest Freezer", "Ceiling Fan", "Stand Fan", "Fan",
+    "Electric Fan Heater", "Water Pump", "Submersible Pump", "Pump", "LED Bulb", "LED TV 32in",
+    "Laptop", "Desktop Computer", "Microwave Oven", "Electric Oven", "Rice Cooker", "Air Conditioner",
+    "Air Conditioner (Inverter)", "Washing Machine", "Iron", "Hair Dryer", "Water Heater",
+]
+
+
+def _brute_force(names, query, limit):
+    query = query.strip().lower()
+    ranked = []
+    for name in dict.fromkeys(names):
+        lowered = name.lower()
+        similarity = 0
+        if lowered == query:
+            tier = 0
+        elif lowered.startswith(query):
+            tier = 1
+        elif any(word.startswith(query) for word in lowered.split()):
+            tier = 2
+        elif query in lowered:
+            tier = 3
+        else:
+            query_grams, grams = _trigrams(query), _trigrams(lowered)
+            if len(query_grams & grams) < max(1, math.ceil(len(query_grams) * FUZZY_THRESHOLD)):
+                continue
+            tier, similarity = 4, len(query_grams & grams) / len(query_grams | grams)
+        ranked.append(((tier, -similarity, len(lowered), lowered), name))
+    return [name for _, name in sorted(ranked)[:limit]]
+
+
+def test_tiers_put_exact_and_prefix_matches_first():
+    index = ApplianceIndex(NAMES)
+    assert index.search("fan")[:3] == ["Fan", "Stand Fan", "Ceiling Fan"]
+    assert index.search("Pump") == ["Pump", "Water Pump", "Submersible Pump"]
+    assert index.search("refrig", limit=1) == ["Refrigerator"]
+    assert index.search("inverter") == ["Refrigerator (Inverter)", "Air Conditioner (Inverter)"]
+
+
+def test_typos_fall_back_to_fuzzy_matches():
+    index = ApplianceIndex(NAMES)
+    assert index.search("refridgerator")[:2] == ["Refrigerator", "Refrigerator (Inverter)"]
+    assert "Microwave Oven" in index.search("microwav oven")
+    assert index.search("zzzz") == []
+
+
+def test_empty_query_and_duplicates():
+    index = ApplianceIndex(NAMES + ["Fan", float("nan"), None])
+    assert len(index) == len(NAMES)
+    assert index.search("   ") == NAMES
+
+
+def test_matches_brute_force_ranking():
+    rng = random.Random(11)
+    words = ["pump", "fan", "led", "oven", "heater", "water", "air", "cooker", "tv", "motor", "drill", "light"]
+    names = [" ".join(rng.choice(words).title() for _ in range(rng.randint(1, 3))) + f" {i}" for i in range(400)]
+    index = ApplianceIndex(names, limit=20)
+    queries = ["p", "pu", "pump", "wat", "water h", "ovn", "lihgt", "heatr", "12", "fan 3", "tv 1", "xyz"]
+    for query in queries:
+        assert index.search(query) == _brute_force(names, query, 20), query
+        assert index.search(query, limit=400) == _brute_force(names, query, 400), query
@@ -0,0 +1,78 @@
+# tests/test_autosave.py
+# This file checks that the background writer saves the latest snapshot atomically,
+# folds bursts of edits into one write, and retries a save that failed.
+
+import csv
+import os
+import time
+
+from autosave import AutosaveWriter
+
+
+def _read(path):
+    with open(path, newline='') as file:
+        return list(csv.reader(file))
+
+
+def test_submit_writes_the_rows(tmp_path):
+    path = str(tmp_path / "load_Sched.csv")
+    writer = AutosaveWriter(path)
+    try:
+        writer.submit([["Appliance", "Power"], ["Fan", "60"]])
+        assert writer.flush(timeout=5)
+        assert _read(path) == [["Appliance", "Power"], ["Fan", "60"]]
+        assert not os.path.exists(path + ".tmp")
+        status = writer.status()
+        assert (status["writes"], status["failures"], status["pending"]) == (1, 0, False)
+    finally:
+        writer.close()
+
+
+def test_burst_is_folded_into_the_latest_snapshot(tmp_path):
+    path = str(tmp_path / "load_Sched.csv")
+    writer = AutosaveWriter(path, min_interval=0.5)
+    try:
+        writer.submit([["first"]])
+        assert writer.flush(timeout=5)
+        for i in range(20):
+            writer.submit([[str(i)]])
+        assert writer.flush(timeout=5)
+        assert _read(path) == [["19"]]
+        status = writer.status()
+        assert status["submitted"] == 21
+        assert status["writes"] == 2
+        assert status["coalesced"] == 19
+    finally:
+        writer.close()
+
+
+def test_failed_write_is_retried(tmp_path):
+    folder = tmp_path / "missing"
+    path = str(folder / "load_Sched.csv")
+    writer = AutosaveWriter(path, retry_delay=0.05)
+    try:
+        writer.submit([["Fan", "60"]])
+        assert not writer.flush(timeout=5)
+        assert writer.status()["failures"] >= 1
+        assert isinstance(writer.status()["last_error"], OSError)
+        folder.mkdir()
+        writer.submit([["Pump", "750"]])
+        # flush() does not wait while the last write is failing, so wait for the retry instead.
+        deadline = time.monotonic() + 5
+        while writer.status()["writes"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert writer.flush(timeout=5)
+        assert _read(path) == [["Pump", "750"]]
+        assert writer.status()["last_error"] is None
+    finally:
+        writer.close()
+
+
+def test_close_writes_the_pending_snapshot(tmp_path):
+    path = str(tmp_path / "load_Sched.csv")
+    writer = AutosaveWriter(path, min_interval=60)
+    writer.submit([["first"]])
+    assert writer.flush(timeout=5)
+    writer.submit([["last"]])
+    writer.close()
+    assert _read(path) == [["last"]]
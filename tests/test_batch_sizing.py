@@ -0,0 +1,74 @@
+# tests/test_batch_sizing.py
+# This file checks that size_batch() gives what size_system() gives one scenario at a time.
+
+import math
+from dataclasses import fields
+
+import numpy as np
+
+from batch_sizing import BatchSizingResult, size_batch
+from component_catalog import CATALOG
+from sizing_engine import LoadSummary, SizingParams, size_system
+
+BATCH_FIELDS = [field.name for field in fields(BatchSizingResult) if field.name != "valid"]
+
+
+def _scenarios():
+    rng = np.random.default_rng(2)
+    n = 500
+    daily_Wh = rng.uniform(0, 60000, n)
+    peak_W = rng.uniform(0, 1.5 * CATALOG.ratings("inverter")[-1], n)
+    surge_W = peak_W * rng.uniform(0, 4, n)
+    voltage = rng.choice([12, 24, 48], n)
+    dod = rng.choice([50, 80, 100], n)
+    panel = rng.choice([100, 300, 550], n)
+    daily_Wh[:5] = 0  # No load: no result
+    return daily_Wh, peak_W, surge_W, voltage, dod, panel
+
+
+def test_batch_matches_size_system():
+    daily_Wh, peak_W, surge_W, voltage, dod, panel = _scenarios()
+    batch = size_batch(daily_Wh, peak_W, voltage, dod, panel, surge_W=surge_W)
+    assert len(batch) == len(daily_Wh)
+
+    for i in range(len(daily_Wh)):
+        single = size_system(LoadSummary(peak_W[i], daily_Wh[i] / 1000, coincident_W=peak_W[i], surge_W=surge_W[i]),
+                             SizingParams(system_voltage=voltage[i], dod=dod[i], panel_size=panel[i]))
+        if single is None:
+            assert not batch.valid[i]
+            assert all(math.isnan(getattr(batch, name)[i]) for name in BATCH_FIELDS)
+            continue
+        assert batch.valid[i]
+        for name in BATCH_FIELDS:
+            expected = getattr(single, name)
+            value = getattr(batch, name)[i]
+            if isinstance(expected, str):  # "> max": NaN in the batch
+                assert math.isnan(value), name
+            else:
+                assert math.isclose(value, expected, rel_tol=1e-12), (name, i, value, expected)
+
+
+def test_scalars_broadcast():
+    batch = size_batch([3000, 6000], 1000, 24, 50, 300)
+    assert batch.valid.tolist() == [True, True]
+    assert batch.inverter_sel[0] == batch.inverter_sel[1] == CATALOG.select("inverter", 1250)
+    assert batch.battery_Ah_req[1] == 2 * batch.battery_Ah_req[0]
+
+
+def test_validity_follows_the_total_wattage_like_size_system():
+    # No coincident running load, but appliances on the schedule: size_system still sizes it
+    daily_Wh = np.array([3000.0, 3000.0, 3000.0, 0.0])
+    running_W = np.array([0.0, 0.0, 800.0, 800.0])
+    total_W = np.array([1200.0, 0.0, 1200.0, 1200.0])
+    batch = size_batch(daily_Wh, running_W, 24, 50, 300, surge_W=900.0, total_W=total_W)
+
+    for i in range(len(daily_Wh)):
+        single = size_system(LoadSummary(total_W[i], daily_Wh[i] / 1000, coincident_W=running_W[i], surge_W=900.0),
+                             SizingParams(system_voltage=24, dod=50, panel_size=300))
+        assert batch.valid[i] == (single is not None)
+        if single is not None:
+            for name in BATCH_FIELDS:
+                assert math.isclose(getattr(batch, name)[i], getattr(single, name), rel_tol=1e-12), name
+    assert batch.valid.tolist() == [True, False, True, False]
+    # Without total_W the running load stands in for it
+    assert size_batch(daily_Wh, running_W, 24, 50, 300).valid.tolist() == [False, False, True, False]
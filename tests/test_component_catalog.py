@@ -0,0 +1,57 @@
+# tests/test_component_catalog.py
+# This file checks the binary-search lookups of ComponentCatalog against a plain linear scan
+# (the "first rating that covers the requirement" rule the GUIs used before the index).
+
+import math
+
+import numpy as np
+import pytest
+
+import predefined_values
+from component_catalog import CATALOG, RATING_TABLES, ComponentCatalog
+
+
+def _linear(kind, required):
+    if kind == "cable":
+        for size in predefined_values.CABLE_SIZES:
+            if predefined_values.AMPACITY_RATING.get(size, 0) >= required:
+                return size
+        return f"> {max(predefined_values.CABLE_SIZES)}"
+    sizes = sorted(getattr(predefined_values, RATING_TABLES[kind]))
+    for size in sizes:
+        if size >= required:
+            return size
+    return f"> {sizes[-1]}"
+
+
+@pytest.mark.parametrize("kind", sorted(RATING_TABLES) + ["cable"])
+def test_select_matches_a_linear_scan(kind):
+    top = max(CATALOG.ratings(kind)) if kind != "cable" else max(predefined_values.AMPACITY_RATING.values())
+    values = list(np.linspace(0, top * 1.2, 400)) + list(CATALOG.ratings(kind)) + [0.5, top, top + 0.001]
+    for required in values:
+        assert CATALOG.select(kind, required) == _linear(kind, required), (kind, required)
+
+
+@pytest.mark.parametrize("kind", sorted(RATING_TABLES) + ["cable"])
+def test_select_array_matches_select(kind):
+    top = max(CATALOG.ratings(kind))
+    required = np.concatenate([np.linspace(0, top * 3, 301), [np.nan]])
+    selected = CATALOG.select_array(kind, required)
+    for value, result in zip(required[:-1], selected[:-1]):
+        single = CATALOG.select(kind, value)
+        if isinstance(single, str):
+            assert math.isnan(result)
+        else:
+            assert result == single
+    assert math.isnan(selected[-1])
+
+
+def test_exact_rating_selects_itself_and_overflow_is_labelled():
+    catalog = ComponentCatalog({"fuse": [30, 10, 20]}, [1.5, 2.5], {1.5: 14, 2.5: 20})
+    assert catalog.ratings("fuse") == (10, 20, 30)
+    assert catalog.select("fuse", 20) == 20
+    assert catalog.select("fuse", 20.01) == 30
+    assert catalog.select("fuse", 31) == "> 30"
+    assert catalog.select("cable", 15) == 2.5
+    assert catalog.select("cable", 21) == "> 2.5"
+    assert set(catalog.kinds()) == {"fuse", "cable"}
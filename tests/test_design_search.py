@@ -0,0 +1,99 @@
+# tests/test_design_search.py
+# This file checks the design search against a brute-force loop of size_system() calls priced
+# with the same cost model, and the battery bank and voltage pruning steps.
+
+import math
+
+import numpy as np
+import pytest
+
+from design_search import SELECTION_FIELDS, battery_banks, cheapest_battery_units, search_designs
+from predefined_values import (
+    AH, BATTERY_PRICE_PER_KWH, BATTERY_UNIT_COST, BATTERY_UNIT_VOLTAGE, COMPONENT_PRICES, DOD, PANEL_INSTALL_COST,
+    PANEL_PRICE_PER_W, PANEL_SIZES, VOLTAGES,
+)
+from sizing_engine import LoadSummary, SizingParams, size_system
+
+LOADS = [
+    LoadSummary(total_wattage=3000.0, total_consumption_kWh=12.0),
+    LoadSummary(total_wattage=920.0, total_consumption_kWh=7.68, coincident_W=860.0, surge_W=2400.0),
+    LoadSummary(total_wattage=150.0, total_consumption_kWh=0.9),
+    # Large enough that voltages below 72V overflow the fuse, cable or controller ratings
+    LoadSummary(total_wattage=9000.0, total_consumption_kWh=40.0, coincident_W=7000.0, surge_W=20000.0),
+    # No running load in common, but appliances to size for (the inverter carries the surge)
+    LoadSummary(total_wattage=1200.0, total_consumption_kWh=3.0, coincident_W=0.0, surge_W=900.0),
+]
+
+
+def _brute_force(loads):
+    designs = []
+    for voltage in VOLTAGES:
+        if voltage % BATTERY_UNIT_VOLTAGE:
+            continue
+        series = voltage // BATTERY_UNIT_VOLTAGE
+        for dod in DOD:
+            for panel_size in PANEL_SIZES:
+                result = size_system(loads, SizingParams(system_voltage=float(voltage), dod=float(dod),
+                                                         panel_size=float(panel_size)))
+                if any(isinstance(getattr(result, field), str) for field in SELECTION_FIELDS.values()):
+                    continue  # A component above the largest rating
+                electronics = sum(base + per_unit * getattr(result, SELECTION_FIELDS[kind])
+                                  for kind, (base, per_unit) in COMPONENT_PRICES.items())
+                pv = result.num_panels * (panel_size * PANEL_PRICE_PER_W + PANEL_INSTALL_COST)
+                bank = None
+                for unit in AH:
+                    strings = math.ceil(result.battery_Ah_req / unit)
+                    cost = series * strings * (unit * BATTERY_UNIT_VOLTAGE / 1000 * BATTERY_PRICE_PER_KWH
+                                               + BATTERY_UNIT_COST)
+                    if bank is None or cost < bank[2]:
+                        bank = (unit, strings, cost)
+                banks = int(battery_banks(dod))
+                designs.append((electronics + pv + bank[2] * banks, voltage, dod, panel_size, result.num_panels,
+                                bank[0], series, bank[1], banks))
+    return sorted(designs)
+
+
+@pytest.mark.parametrize("loads", LOADS)
+def test_search_matches_brute_force(loads):
+    expected = _brute_force(loads)
+    designs = search_designs(loads, top_n=10 ** 6)
+    assert len(designs) == len(expected)
+    for design, (total, *fields) in zip(designs, expected):
+        assert [design.system_voltage, design.dod, design.panel_size, design.num_panels, design.battery_unit_Ah,
+                design.battery_series, design.battery_strings, design.battery_banks] == fields
+        assert design.total_cost == pytest.approx(total, rel=1e-12)
+        assert design.total_cost == pytest.approx(design.electronics_cost + design.pv_cost + design.battery_cost)
+    assert search_designs(loads, top_n=5) == designs[:5]
+
+
+def test_overflowing_designs_are_excluded():
+    designs = search_designs(LOADS[3], top_n=10 ** 6)
+    assert {design.system_voltage for design in designs} == {72.0, 84.0, 96.0, 108.0}
+    assert all(math.isfinite(design.total_cost) for design in designs)
+    # Every 60V design of this load overflows at least one component, so its cost is NaN.
+    for dod in DOD:
+        result = size_system(LOADS[3], SizingParams(system_voltage=60.0, dod=float(dod), panel_size=400.0))
+        assert any(isinstance(getattr(result, field), str) for field in SELECTION_FIELDS.values())
+
+
+def test_voltages_that_batteries_cannot_build_are_dropped():
+    loads = LOADS[0]
+    assert search_designs(loads, voltages=[3, 5, 7, 9]) == []
+    designs = search_designs(loads, top_n=10 ** 6, voltages=[3, 5, 7, 9, 48])
+    assert {design.system_voltage for design in designs} == {48.0}
+    assert {design.system_voltage for design in search_designs(loads, top_n=10 ** 6)} <= {
+        float(v) for v in VOLTAGES if v >= 12 and v % 12 == 0}
+    assert search_designs(LoadSummary(total_wattage=0.0, total_consumption_kWh=5.0)) == []
+
+
+def test_cheapest_battery_units():
+    unit_price = {unit: unit * 12 / 1000 * BATTERY_PRICE_PER_KWH + BATTERY_UNIT_COST for unit in (100, 200)}
+    units, strings, cost = cheapest_battery_units(np.array([150.0, 200.0, 90.0]), np.array([2, 4, 1]),
+                                                  unit_sizes=(100, 200))
+    # 150 Ah: 2 x 100 Ah costs more than 1 x 200 Ah; 90 Ah: one 100 Ah unit.
+    assert units.tolist() == [200.0, 200.0, 100.0]
+    assert strings.tolist() == [1.0, 1.0, 1.0]
+    assert cost.tolist() == pytest.approx([2 * unit_price[200], 4 * unit_price[200], unit_price[100]])
+    # A requirement that exactly fills whole units needs no extra string.
+    units, strings, _ = cheapest_battery_units(np.array([300.0]), np.array([1]), unit_sizes=(100,))
+    assert (units.tolist(), strings.tolist()) == ([100.0], [3.0])
@@ -0,0 +1,88 @@
+# tests/test_diagram_cache.py
+# This file checks the content-hash keys of the diagram cache and its least-recently-used
+# eviction by entry count and by size.
+
+import os
+import time
+
+from diagram_cache import DiagramCache
+
+LABELS = {"solar": "4 x 400W", "inverter": "3000W", "battery": "48V 200Ah"}
+
+
+def _source(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(name.encode() * (size // len(name)))
+    return str(path)
+
+
+def _age(cache, key, seconds_ago):
+    path = os.path.join(cache.directory, key)
+    then = time.time_ns() - seconds_ago * 10 ** 9
+    os.utime(path, ns=(then, then))
+
+
+def _keys(cache):
+    return sorted(os.listdir(cache.directory))
+
+
+def test_key_depends_on_the_content_only():
+    key = DiagramCache.key(LABELS, 150)
+    assert key == DiagramCache.key(dict(reversed(list(LABELS.items()))), 150)
+    assert key.endswith(".png") and len(key) == 64 + 4
+    assert DiagramCache.key({**LABELS, "inverter": "5000W"}, 150) != key
+    assert DiagramCache.key(LABELS, 300) != key
+    assert DiagramCache.key(LABELS, 150, "svg").endswith(".svg")
+
+
+def test_put_and_get(tmp_path):
+    cache = DiagramCache(str(tmp_path / "cache"))
+    key = DiagramCache.key(LABELS, 150)
+    target = str(tmp_path / "Solar_Setup.png")
+    assert not cache.get(key, target)
+    cache.put(key, _source(tmp_path, "diagram", 1000))
+    assert cache.get(key, target)
+    with open(target, 'rb') as file:
+        assert file.read() == (tmp_path / "diagram").read_bytes()
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_oldest_entries_are_evicted_first(tmp_path):
+    cache = DiagramCache(str(tmp_path / "cache"), max_entries=3)
+    source = _source(tmp_path, "diagram", 100)
+    for i, key in enumerate("abc"):
+        cache.put(key, source)
+        _age(cache, key, 100 - i)  # a is the oldest
+    assert cache.get("a", str(tmp_path / "out.png"))  # A hit makes a the newest
+    cache.put("d", source)
+    assert _keys(cache) == ["a", "c", "d"]
+    assert cache.evictions == 1
+
+
+def test_size_bound_keeps_the_newest_entry(tmp_path):
+    cache = DiagramCache(str(tmp_path / "cache"), max_bytes=2500)
+    for i, key in enumerate("abc"):
+        cache.put(key, _source(tmp_path, f"diagram{key}", 1000))
+        _age(cache, key, 100 - i)
+    assert _keys(cache) == ["b", "c"]
+    # An entry bigger than the whole cache is still kept, on its own
+    cache.put("big", _source(tmp_path, "huge", 10000))
+    assert _keys(cache) == ["big"]
+    assert cache.evictions == 3
+
+
+def test_cache_problems_never_raise(tmp_path):
+    blocked = tmp_path / "not_a_directory"
+    blocked.write_text("file")
+    cache = DiagramCache(str(blocked))
+    cache.put("a", _source(tmp_path, "diagram", 100))
+    assert not cache.get("a", str(tmp_path / "out.png"))
+    assert cache.misses == 1
+
+
+def test_temporary_files_are_not_entries(tmp_path):
+    cache = DiagramCache(str(tmp_path / "cache"), max_entries=1)
+    os.makedirs(cache.directory)
+    (tmp_path / "cache" / "a.tmp").write_bytes(b"partial")
+    cache.put("b", _source(tmp_path, "diagram", 100))
+    assert _keys(cache) == ["a.tmp", "b"] and cache.evictions == 0
@@ -0,0 +1,166 @@
+# tests/test_load_model.py
+# This file checks that the running totals of LoadModel stay exact through adds, edits and
+# removals, that bulk and single-row paths build the same rows, and that the cached peaks and
+# load profile are recomputed after every change.
+
+import math
+import random
+
+import numpy as np
+
+from load_model import SCHEDULE_COLUMNS, LoadModel, _RunningSum
+from load_sweep import load_peaks
+from year_simulation import schedule_profile
+
+
+def _expected_totals(rows):
+    return (math.fsum(power * count for power, _, count, *_ in rows),
+            math.fsum(usage * count for _, usage, count, *_ in rows),
+            math.fsum(count for _, _, count, *_ in rows),
+            math.fsum(row[3] for row in rows))
+
+
+def _totals(model):
+    return model.total_wattage, model.total_usage_hours, model.appliance_count, model.total_consumption_kWh
+
+
+def test_totals_are_exact_after_random_edits():
+    rng = random.Random(5)
+    model = LoadModel()
+    next_id = 0
+    for _ in range(3000):
+        action = rng.random()
+        ids = model.row_ids()
+        if action < 0.5 or not ids:
+            next_id += 1
+            power, usage, count = rng.uniform(0.1, 5000), rng.uniform(0.1, 24), rng.randint(1, 9)
+            model.add(f"r{next_id}", power, usage, count, power * usage * count / 1000)
+        elif action < 0.8:
+            model.update(rng.choice(ids), power=rng.uniform(0.1, 5000), count=rng.randint(1, 9),
+                         consumption_kWh=rng.uniform(0, 50))
+        elif action < 0.95:
+            model.remove(rng.choice(ids))
+        else:
+            model.remove_many(rng.sample(ids, min(len(ids), 5)))
+        if rng.random() < 0.05:
+            assert _totals(model) == _expected_totals(model.rows())
+    assert _totals(model) == _expected_totals(model.rows())
+
+
+def test_adding_and_removing_leaves_no_residue():
+    model = LoadModel()
+    model.add("keep", 0.1, 1, 3, 0.1)
+    for i in range(1000):
+        model.add(f"r{i}", 1e15 + 0.1 * i, 0.3, 7, 1e10 + 0.7)
+    model.remove_many([f"r{i}" for i in range(0, 1000, 2)])
+    for i in range(1, 1000, 2):
+        model.remove(f"r{i}")
+    assert _totals(model) == (0.1 * 3, 3.0, 3.0, 0.1)
+
+
+def test_running_sum_extend_matches_fsum():
+    values = [1e16, 1.0, -1e16, 0.1, 0.2, -0.3, 1e-300, 3.0] * 50
+    total = _RunningSum()
+    total.extend(values)
+    total.add(0.7)
+    total.extend([-v for v in values])
+    assert total.value() == 0.7
+
+
+def test_extend_builds_the_same_rows_as_add():
+    one_by_one = LoadModel()
+    one_by_one.add("r1", 100, 6, 2, 1.2, surge=300, start_hour=18, end_hour=23.5, appliance="Pump",
+                   power_factor=0.9, efficiency=85)
+    one_by_one.add("r2", 60, 8, 1, 0.48, appliance="Fan")
+    bulk = LoadModel()
+    bulk.extend((row_id, one_by_one.record(row_id)) for row_id in one_by_one.row_ids())
+
+    assert bulk.rows() == one_by_one.rows()
+    assert bulk.display_rows() == one_by_one.display_rows()
+    assert _totals(bulk) == _totals(one_by_one)
+    assert bulk.rows()[0] == (100.0, 6.0, 2.0, 1.2, 300.0, 18.0, 23.5)
+    assert bulk.rows()[1][4:] == (60.0, None, None)  # No surge rating: starts at rated power
+
+
+def test_readding_an_id_replaces_the_row():
+    model = LoadModel()
+    model.add("r1", 100, 1, 1, 0.1)
+    model.add("r2", 200, 1, 1, 0.2)
+    model.add("r1", 50, 2, 1, 0.1)
+    assert model.row_ids() == ["r2", "r1"]
+    assert model.total_wattage == 250
+    model.extend([("r2", {**model.record("r2"), "power": 20.0})])
+    assert model.row_ids() == ["r1", "r2"]
+    assert model.total_wattage == 70
+
+
+def test_remove_many_keeps_table_order():
+    model = LoadModel()
+    for i in range(10):
+        model.add(f"r{i}", i + 1, 1, 1, 0)
+    model.remove_many(["r3", "r0", "r9", "r3"])
+    assert model.row_ids() == ["r1", "r2", "r4", "r5", "r6", "r7", "r8"]
+    assert [row[0] for row in model.rows()] == [2, 3, 5, 6, 7, 8, 9]
+    assert "r3" not in model and "r4" in model and len(model) == 7
+
+
+def test_display_record_and_window():
+    model = LoadModel()
+    model.add("r1", 1500, 2.5, 2, 7.5, surge=4500, appliance="Pump", power_factor=0.8, efficiency=90)
+    model.set_window("r1", 6, 8.25)
+    assert model.display("r1") == ("Pump", "1,500.0", "0.80", "90", "4,500.0", "2.5", "2", "7.5000", "06:00", "08:15")
+    record = model.record("r1")
+    assert (record["start"], record["end"], record["appliance"]) == ("06:00", "08:15", "Pump")
+    model.set_window("r1", None, None)
+    assert model.row("r1")[5:] == (None, None)
+    assert model.display("r1")[8:] == ("", "")
+
+
+def test_sort_keys_put_rows_without_times_last():
+    model = LoadModel()
+    model.add("a", 1, 1, 1, 0, start_hour=20, appliance="beta")
+    model.add("b", 1, 1, 1, 0, appliance="Alpha")
+    model.add("c", 1, 1, 1, 0, start_hour=6, appliance="gamma")
+    start = dict(zip(model.row_ids(), model.sort_keys("Start")))
+    assert sorted(start, key=start.get) == ["c", "a", "b"]
+    names = dict(zip(model.row_ids(), model.sort_keys(SCHEDULE_COLUMNS[0])))
+    assert sorted(names, key=names.get) == ["b", "a", "c"]
+
+
+def test_summary_uses_the_peaks_of_timed_rows():
+    model = LoadModel()
+    model.add("day", 1000, 2, 1, 2, start_hour=8, end_hour=10)
+    model.add("night", 500, 2, 1, 1, start_hour=20, end_hour=22)
+    summary = model.summary()
+    assert summary.total_wattage == 1500
+    assert summary.coincident_W == 1000
+    model.clear()
+    assert len(model) == 0 and model.total_wattage == 0
+
+
+def test_peaks_and_profile_follow_every_change():
+    model = LoadModel()
+    model.add("day", 1000, 2, 1, 2, start_hour=8, end_hour=10)
+    model.add("fan", 60, 10, 2, 1.2)
+
+    def check():
+        peaks, profile = model.peaks(), model.profile()
+        assert peaks == load_peaks(model.rows())
+        assert np.allclose(profile, schedule_profile(model.rows()), rtol=0, atol=1e-9)
+        # Cached until the rows change, and read-only so callers cannot corrupt the cache
+        assert model.peaks() is peaks and model.profile() is profile
+        assert not profile.flags.writeable
+
+    check()
+    for change in (lambda: model.add("night", 500, 3, 1, 1.5, start_hour=22),
+                   lambda: model.update("fan", count=5),
+                   lambda: model.set_window("day", 12, 14),
+                   lambda: model.extend([("pump", dict(model.record("night"), power=750.0))]),
+                   lambda: model.remove("night"),
+                   lambda: model.remove_many(["fan"])):
+        before = model.profile().copy(), model.peaks()
+        change()
+        assert not np.array_equal(model.profile(), before[0]) or model.peaks() != before[1]
+        check()
+    model.clear()
+    assert model.peaks() == load_peaks([]) and not model.profile().any()
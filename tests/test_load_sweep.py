@@ -0,0 +1,118 @@
+# tests/test_load_sweep.py
+# This file checks the coincident and surge peaks of the sweep against sampling every event
+# time, and the time-of-day helpers.
+
+import datetime
+import random
+
+import numpy as np
+import pytest
+
+from load_sweep import format_clock, load_peaks, parse_clock, peak_rows, window_hours
+from sizing_engine import SizingParams
+from year_simulation import schedule_profile
+
+
+def _runs_at(row, hour):
+    start, end = row[5], row[6]
+    if start is None or end is None or start == end:
+        return True
+    if start < end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+def _brute_force(rows):
+    # The load only rises when a window starts, and every untimed or wrapping row runs at 00:00.
+    coincident_W = surge_W = 0.0
+    for hour in {0.0} | {row[5] for row in rows if row[5] is not None}:
+        active = [row for row in rows if _runs_at(row, hour)]
+        load = sum(row[0] * row[2] for row in active)
+        coincident_W = max(coincident_W, load)
+        surge_W = max(surge_W, load + max([max(row[4] - row[0], 0) for row in active], default=0))
+    return coincident_W, surge_W
+
+
+def _random_rows(rng, n):
+    rows = []
+    for _ in range(n):
+        power = float(rng.randint(1, 3000))
+        surge = power * rng.choice([1, 1, 2, 3])
+        start_hour = end_hour = None
+        if rng.random() < 0.8:
+            start_hour, end_hour = rng.randint(0, 95) / 4, rng.randint(0, 96) / 4
+        rows.append((power, 1.0, float(rng.randint(1, 4)), 0.0, surge, start_hour, end_hour))
+    return rows
+
+
+def test_peaks_match_sampling_every_event():
+    rng = random.Random(19)
+    for n in (1, 2, 5, 20, 200):
+        for _ in range(20):
+            rows = _random_rows(rng, n)
+            peaks = load_peaks(rows)
+            assert (peaks.coincident_W, peaks.surge_W) == _brute_force(rows)
+            if peaks.surge_row >= 0:
+                row = rows[peaks.surge_row]
+                assert peaks.surge_W - max(row[4] - row[0], 0) <= peaks.coincident_W
+
+
+def test_back_to_back_windows_do_not_overlap():
+    rows = [(1000.0, 2.0, 1.0, 2.0, 3000.0, 6.0, 8.0), (500.0, 2.0, 2.0, 2.0, 500.0, 8.0, 10.0),
+            (200.0, 4.0, 1.0, 0.8, 200.0, 22.0, 2.0)]
+    peaks = load_peaks(rows)
+    assert (peaks.coincident_W, peaks.coincident_hour) == (1000.0, 6.0)
+    assert (peaks.surge_W, peaks.surge_hour, peaks.surge_row) == (3000.0, 6.0, 0)
+    assert load_peaks([]).surge_row == -1
+
+
+def test_untimed_rows_run_all_day():
+    rows = [(100.0, 1.0, 3.0, 0.3, 100.0, None, None), (750.0, 1.0, 1.0, 0.75, 2250.0, 5.0, 5.0)]
+    peaks = load_peaks(rows)
+    assert (peaks.coincident_W, peaks.surge_W) == (1050.0, 2550.0)
+
+
+@pytest.mark.parametrize("text, hours", [
+    ("18", 18.0), ("18:30", 18.5), ("6:05", 6 + 5 / 60), ("18:30:00", 18.5), ("06:00:36", 6.01),
+    ("6:30 PM", 18.5), ("12:00 am", 0.0), ("12 PM", 12.0), ("24:00", 24.0), ("  ", None),
+    (datetime.time(7, 15), 7.25), (datetime.datetime(2024, 1, 1, 21, 45), 21.75),
+])
+def test_parse_clock(text, hours):
+    if hours is None:
+        assert parse_clock(text) is None
+    else:
+        assert parse_clock(text) == pytest.approx(hours)
+
+
+@pytest.mark.parametrize("text", ["25:00", "24:30", "18:60", "0:00 AM", "13 PM", "6pm tonight", "1:2:3:4", "x"])
+def test_parse_clock_rejects(text):
+    with pytest.raises(ValueError, match="Invalid time of day"):
+        parse_clock(text)
+
+
+def test_clock_and_window_helpers():
+    assert format_clock(None) == ""
+    assert format_clock(parse_clock("23:59")) == "23:59"
+    assert format_clock(6.5) == "06:30"
+    assert window_hours(None, 8) == 24
+    assert window_hours(8, 8) == 24
+    assert window_hours(22, 6) == 8
+    assert window_hours(6, 8.25) == 2.25
+
+
+def test_usage_runs_inside_the_window():
+    # Four usage hours in a two-hour window only run for the window.
+    profile = schedule_profile([(100.0, 4.0, 1.0, 0.4, 100.0, 6.0, 8.0), (50.0, 3.0, 2.0, 0.3, 50.0, 23.0, None)])
+    expected = np.zeros(24)
+    expected[6:8] += 100
+    expected[[23, 0, 1]] += 100
+    assert np.allclose(profile, expected)
+
+
+def test_peak_rows_tell_what_sized_the_inverter():
+    params = SizingParams(system_voltage=48, dod=80, panel_size=400)
+    rows = [(1000.0, 1.0, 1.0, 1.0, 4000.0, 6.0, 8.0)]
+    last = peak_rows(load_peaks(rows), 1000.0, "Pump", params)[-1]
+    assert last[:2] == ("Inverter Sized For", "Surge peak")
+    assert last[2].endswith("= 2,000W")
+    assert peak_rows(load_peaks(rows[:0]), 0.0)[1][2] == "at 00:00"
@@ -0,0 +1,78 @@
+# tests/test_load_synthesis.py
+# This file checks the synthesized minute traces: units stay inside their running windows,
+# every start adds its surge headroom once, and the background run returns minute_stats().
+
+import time
+
+import numpy as np
+import pytest
+
+from load_synthesis import MINUTES_PER_DAY, MinuteStatsRun, minute_stats, synthesize_minutes
+from sizing_engine import LoadSummary, SizingParams, size_system
+from year_simulation import Losses
+
+RESULT = size_system(LoadSummary(total_wattage=2000, total_consumption_kWh=10),
+                     SizingParams(system_voltage=48, dod=80, panel_size=400))
+
+
+def _minutes(start, end):
+    return np.arange(start * 60, end * 60) % MINUTES_PER_DAY
+
+
+def test_chunks_cover_the_days():
+    rows = [(100.0, 2.0, 1.0, 0.2, 100.0, None, None)]
+    chunks = list(synthesize_minutes(rows, days=10, chunk_days=7, seed=1))
+    assert [(chunk.first_day, chunk.load_W.shape) for chunk in chunks] == [(0, (7, 1440)), (7, (3, 1440))]
+    again = list(synthesize_minutes(rows, days=10, chunk_days=7, seed=1))
+    assert all(np.array_equal(a.load_W, b.load_W) for a, b in zip(chunks, again))
+
+
+def test_always_on_units_never_start():
+    rows = [(50.0, 24.0, 3.0, 3.6, 200.0, None, None)]
+    chunk = next(synthesize_minutes(rows, days=7, seed=2))
+    assert np.array_equal(chunk.load_W, np.full((7, MINUTES_PER_DAY), 150.0))
+    assert not chunk.start_W.any()
+    assert chunk.capacity_W == 150.0
+
+
+@pytest.mark.parametrize("start, end", [(6, 8), (22, 2), (23.5, 0.5)])
+def test_timed_units_stay_inside_their_window(start, end):
+    rows = [(1000.0, 1.0, 4.0, 4.0, 3000.0, start, end), (10.0, 30.0, 1.0, 0.3, 10.0, start, end)]
+    chunk = next(synthesize_minutes(rows, days=7, seed=3))
+    outside = np.setdiff1d(np.arange(MINUTES_PER_DAY), _minutes(start, end if end > start else end + 24))
+    assert not chunk.load_W[:, outside].any()
+    assert not chunk.start_W[:, outside].any()
+    assert chunk.load_W.max() <= chunk.capacity_W and chunk.load_W.min() >= -1e-9
+    # Four units start once a day, each adding 2000W of headroom; the long row fills the window.
+    assert np.array_equal(chunk.start_W.sum(axis=1), np.full(7, 8000.0))
+
+
+def test_minute_stats_of_a_constant_load():
+    rows = [(500.0, 24.0, 2.0, 24.0, 500.0, None, None)]
+    stats = minute_stats(synthesize_minutes(rows, days=14, seed=4), RESULT)
+    assert stats.days == 14
+    assert stats.mean_W == stats.hourly_peak_W == stats.peak_W == stats.surge_peak_W == 1000.0
+    assert stats.p99_W == pytest.approx(1000.0, rel=1e-3)
+    losses = Losses()
+    battery_W = losses.inverter_efficiency * losses.discharge_efficiency * 48 * RESULT.battery_Ah_req
+    assert stats.peak_c_rate == pytest.approx(1000.0 / battery_W)
+    assert minute_stats(iter(()), RESULT).days == 0
+
+
+def test_background_run_returns_the_same_stats():
+    rows = [(1000.0, 2.0, 2.0, 4.0, 3000.0, 18.0, 23.0), (60.0, 8.0, 3.0, 1.44, 60.0, None, None)]
+    run = MinuteStatsRun(rows, RESULT, days=30, seed=5)
+    events = []
+    deadline = time.monotonic() + 30
+    while not run.finished and time.monotonic() < deadline:
+        events.extend(run.poll())
+        time.sleep(0.01)
+    assert [event["event"] for event in events[:-1]] == ["progress"] * 5
+    assert events[-2]["done"] == events[-2]["total"] == 30
+    assert events[-1] == {"event": "done", "stats": minute_stats(synthesize_minutes(rows, 30, seed=5), RESULT)}
+
+
+def test_cancelled_run_reports_nothing():
+    run = MinuteStatsRun([(100.0, 2.0, 1.0, 0.2, 100.0, None, None)], RESULT, seed=6)
+    run.cancel()
+    assert run.finished and run.poll() == []
@@ -0,0 +1,62 @@
+# tests/test_lolp_curve.py
+# This file checks the PV/battery trade-off curve: the grid simulation agrees with single
+# simulate_year() calls, and the curve picks the smallest battery that meets the target.
+
+import numpy as np
+
+from lolp_curve import LolpSurface, lolp_surface
+from sizing_engine import LoadSummary, SizingParams, size_system
+from year_simulation import HOURS_PER_YEAR, default_pv_profile, schedule_profile, simulate_year
+
+ROWS = [(800.0, 6.0, 1.0, 4.8, 2400.0, 18.0, 0.0), (60.0, 24.0, 2.0, 2.88, 60.0, None, None),
+        (1500.0, 1.5, 1.0, 2.25, 1500.0, 12.0, 14.0)]
+RESULT = size_system(LoadSummary(total_wattage=2420.0, total_consumption_kWh=9.93),
+                     SizingParams(system_voltage=48.0, dod=80.0, panel_size=400.0))
+
+
+def test_curve_of_a_hand_built_surface():
+    surface = LolpSurface(
+        pv_W=np.array([100.0, 200.0, 300.0, 400.0]),
+        battery_Ah=np.array([10.0, 20.0, 40.0]),
+        lolp=np.array([
+            [0.50, 0.30, 0.020],  # Misses 1% even with the largest battery: dropped
+            [0.20, 0.05, 0.010],  # Exactly on target
+            [0.10, 0.005, 0.0],
+            [0.0, 0.0, 0.0],
+        ]),
+    )
+    pv_W, battery_Ah = surface.curve()
+    assert pv_W.tolist() == [200.0, 300.0, 400.0]
+    assert battery_Ah.tolist() == [40.0, 20.0, 10.0]
+    pv_W, battery_Ah = surface.curve(target=0.25)
+    assert pv_W.tolist() == [100.0, 200.0, 300.0, 400.0]
+    assert battery_Ah.tolist() == [40.0, 10.0, 10.0, 10.0]
+    assert surface.curve(target=-1)[0].size == 0
+
+
+def test_surface_matches_single_simulations():
+    surface = lolp_surface(ROWS, RESULT, pv_factors=[0.5, 1.0, 2.0], battery_factors=[0.25, 1.0, 3.0])
+    load_W = schedule_profile(ROWS)
+    for i, pv_W in enumerate(surface.pv_W):
+        for j, battery_Ah in enumerate(surface.battery_Ah):
+            single = simulate_year(load_W, default_pv_profile(), pv_W, battery_Ah * RESULT.system_voltage, RESULT.dod)
+            assert surface.lolp[i, j] == single.loss_of_load_hours / HOURS_PER_YEAR
+    assert surface.pv_W.tolist() == [RESULT.total_pv_capacity * f for f in (0.5, 1.0, 2.0)]
+
+
+def test_battery_shrinks_as_the_array_grows():
+    rng = np.random.default_rng(18)
+    for _ in range(50):
+        # LOLP that falls with more PV and with more battery
+        lolp = rng.random((12, 15))
+        lolp = np.flip(np.maximum.accumulate(np.flip(lolp, 0), axis=0), 0)
+        lolp = np.flip(np.maximum.accumulate(np.flip(lolp, 1), axis=1), 1)
+        surface = LolpSurface(np.arange(1.0, 13.0), np.arange(1.0, 16.0), lolp)
+        for target in (0.05, 0.2, 0.5):
+            pv_W, battery_Ah = surface.curve(target)
+            assert np.all(np.diff(battery_Ah) <= 0)
+            assert pv_W.size == 0 or pv_W[-1] == 12.0
+
+    pv_W, battery_Ah = lolp_surface(ROWS, RESULT).curve()
+    assert pv_W.size > 0
+    assert np.all(np.diff(battery_Ah) <= 0)
@@ -0,0 +1,108 @@
+# tests/test_recompute_scheduler.py
+# This file checks that the recompute scheduler folds bursts of requests into one run, runs
+# tasks in registration order, and does not let a steady stream of events delay them forever.
+
+import types
+
+import pytest
+
+import recompute_scheduler
+from recompute_scheduler import RecomputeScheduler
+
+
+class FakeRoot:
+    """
+    Records root.after / after_cancel and runs the callbacks on a virtual clock (ms).
+    """
+
+    def __init__(self):
+        self.now_ms = 0
+        self.timers = {}
+        self.next_id = 0
+        self.cancelled = 0
+
+    def after(self, delay_ms, callback):
+        self.next_id += 1
+        self.timers[self.next_id] = (self.now_ms + delay_ms, callback)
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        del self.timers[after_id]
+        self.cancelled += 1
+
+    def advance(self, ms):
+        end = self.now_ms + ms
+        while True:
+            due = [(when, after_id) for after_id, (when, _) in self.timers.items() if when <= end]
+            if not due:
+                break
+            when, after_id = min(due)
+            self.now_ms = when
+            self.timers.pop(after_id)[1]()
+        self.now_ms = end
+
+
+@pytest.fixture
+def root(monkeypatch):
+    root = FakeRoot()
+    monkeypatch.setattr(recompute_scheduler, "time", types.SimpleNamespace(monotonic=lambda: root.now_ms / 1000))
+    return root
+
+
+def _scheduler(root, log, **kwargs):
+    scheduler = RecomputeScheduler(root, **kwargs)
+    scheduler.register("size", lambda: log.append(("size", root.now_ms)))
+    scheduler.register("save", lambda: log.append(("save", root.now_ms)))
+    return scheduler
+
+
+def test_burst_is_coalesced_into_one_run(root):
+    log = []
+    scheduler = _scheduler(root, log, delay_ms=100)
+    for _ in range(30):
+        scheduler.request("save")
+        scheduler.request("size")
+        root.advance(5)
+    assert log == []
+    root.advance(100)
+    # One run, 100 ms after the last request, in registration order
+    assert log == [("size", 245), ("save", 245)]
+    assert scheduler.stats() == {"requests": 60, "runs": 1, "skipped": 59}
+    assert root.timers == {} and root.cancelled == 59
+
+
+def test_only_dirty_tasks_run(root):
+    log = []
+    scheduler = _scheduler(root, log)
+    scheduler.request("save")
+    root.advance(1000)
+    assert log == [("save", 100)]
+
+
+def test_steady_stream_runs_at_least_every_max_wait(root):
+    log = []
+    scheduler = _scheduler(root, log, delay_ms=100, max_wait_ms=500)
+    for _ in range(200):  # An event every 50 ms for 10 s
+        scheduler.request("size")
+        root.advance(50)
+    runs = [when for name, when in log]
+    assert runs[0] == 500
+    assert len(runs) == 20
+    assert max(b - a for a, b in zip(runs, runs[1:])) <= 550
+    # The last run (at 10 s) already took the last request
+    root.advance(1000)
+    assert scheduler.runs == 20 and root.timers == {}
+
+
+def test_flush_and_cancel(root):
+    log = []
+    scheduler = _scheduler(root, log)
+    scheduler.request("size", "save")
+    scheduler.flush()
+    assert log == [("size", 0), ("save", 0)] and root.timers == {}
+    scheduler.request("size")
+    scheduler.cancel()
+    root.advance(1000)
+    assert len(log) == 2 and root.timers == {}
+    scheduler.flush()  # Nothing pending
+    assert scheduler.runs == 1
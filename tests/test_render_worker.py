@@ -0,0 +1,180 @@
+# tests/test_render_worker.py
+# This file drives the render worker loop through in-memory pipes with a stub renderer, and
+# checks that SchematicRenderer restarts a worker that has exited.
+
+import io
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import types
+
+import render_worker
+from render_worker import SchematicRenderer, serve
+
+LABELS = {"solar": "Solar Panels"}
+
+
+class Lines:
+    """
+    stdin fed line by line from the test. consumed is set whenever the reader asks for the
+    next line, i.e. once it has handled every line fed so far.
+    """
+
+    def __init__(self, *messages):
+        self._lines = queue.Queue()
+        self.consumed = threading.Event()
+        for message in messages:
+            self.feed(message)
+
+    def feed(self, message):
+        self.consumed.clear()
+        self._lines.put(None if message is None else json.dumps(message) + "\n")
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._lines.empty():
+            self.consumed.set()
+        line = self._lines.get()
+        if line is None:
+            self.consumed.set()
+            raise StopIteration
+        return line
+
+
+def _stub(monkeypatch, stdin, render=None):
+    """
+    Replaces the matplotlib warm-up with a stub schematic module. The warm-up waits until the
+    reader has taken every line fed so far, so all of them are queued before the first job runs.
+    """
+    renders = []
+
+    def render_png(labels, path, dpi):
+        renders.append((labels, path, dpi))
+        if render is not None:
+            render(path)
+        with open(path, 'wb') as file:
+            file.write(b"png")
+
+    def warm_up():
+        assert stdin.consumed.wait(5)
+        return types.SimpleNamespace(DPI=150, render_png=render_png)
+
+    monkeypatch.setattr(render_worker, "_warm_up", warm_up)
+    return renders
+
+
+def _serve(stdin):
+    stdout = io.StringIO()
+    serve(stdin, stdout)
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def _job(job_id, path, **extra):
+    return {"job": job_id, "labels": LABELS, "path": str(path), **extra}
+
+
+def test_newest_job_wins(monkeypatch, tmp_path):
+    stdin = Lines(*(_job(i, tmp_path / f"{i}.png") for i in (1, 2, 3)), None)
+    renders = _stub(monkeypatch, stdin)
+    printed = sys.stdout
+
+    events = _serve(stdin)
+
+    assert [(e["event"], e["job"]) for e in events] == [
+        ("ready", None), ("cancelled", 1), ("cancelled", 2), ("started", 3), ("done", 3)]
+    assert renders == [(LABELS, str(tmp_path / "3.png") + ".tmp", 150)]
+    assert sorted(os.listdir(tmp_path)) == ["3.png"]
+    assert sys.stdout is printed
+
+
+def test_cancel_before_start(monkeypatch, tmp_path):
+    stdin = Lines(_job(1, tmp_path / "1.png", dpi=72), {"cancel": 1}, None)
+    renders = _stub(monkeypatch, stdin)
+
+    events = _serve(stdin)
+
+    assert [(e["event"], e["job"]) for e in events] == [("ready", None), ("cancelled", 1)]
+    assert renders == [] and os.listdir(tmp_path) == []
+
+
+def test_cancel_while_rendering_keeps_the_old_file(monkeypatch, tmp_path):
+    path = tmp_path / "setup.png"
+    path.write_bytes(b"old")
+    stdin = Lines(_job(1, path, dpi=72))
+
+    def cancel_midway(temp_path):
+        assert temp_path == str(path) + ".tmp"
+        stdin.feed({"cancel": 1})
+        assert stdin.consumed.wait(5)
+        stdin.feed(None)
+
+    renders = _stub(monkeypatch, stdin, cancel_midway)
+
+    events = _serve(stdin)
+
+    assert [(e["event"], e["job"]) for e in events] == [("ready", None), ("started", 1), ("cancelled", 1)]
+    assert renders[0][2] == 72
+    # The temporary file is dropped and the previous drawing is untouched
+    assert os.listdir(tmp_path) == ["setup.png"] and path.read_bytes() == b"old"
+
+
+def test_file_is_replaced_only_when_complete(monkeypatch, tmp_path):
+    path = tmp_path / "setup.png"
+    path.write_bytes(b"old")
+    stdin = Lines(_job(1, path), None)
+    seen = []
+    _stub(monkeypatch, stdin, lambda temp_path: seen.append(path.read_bytes()))
+
+    events = _serve(stdin)
+
+    assert events[-1]["event"] == "done" and events[-1]["path"] == str(path)
+    # While rendering, the destination still held the previous file
+    assert seen == [b"old"]
+    assert path.read_bytes() == b"png" and os.listdir(tmp_path) == ["setup.png"]
+
+
+def test_render_error_is_reported(monkeypatch, tmp_path):
+    stdin = Lines(_job(1, tmp_path / "1.png"), None)
+
+    def fail(temp_path):
+        raise RuntimeError("no fonts")
+
+    _stub(monkeypatch, stdin, fail)
+
+    events = _serve(stdin)
+
+    assert events[-1] == {"event": "error", "job": 1, "error": "no fonts"}
+
+
+def _wait_for(renderer, predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    events = []
+    while time.monotonic() < deadline:
+        events += renderer.poll()
+        if predicate(events):
+            return events
+        time.sleep(0.01)
+    raise AssertionError(f"no matching event in {events}")
+
+
+def test_worker_is_restarted_after_it_exits(tmp_path):
+    # A worker that reads one job and exits without answering it
+    renderer = SchematicRenderer([sys.executable, "-c", "import sys; sys.stdin.readline()"])
+    try:
+        first = renderer.submit(LABELS, tmp_path / "setup.png")
+        process = renderer._process
+        events = _wait_for(renderer, lambda events: events)
+        assert events == [{"event": "error", "job": first, "error": "The render worker stopped."}]
+        assert not renderer.busy and process.returncode == 0
+
+        second = renderer.submit(LABELS, tmp_path / "setup.png")
+        assert second == first + 1 and renderer._process is not process
+        events = _wait_for(renderer, lambda events: events)
+        assert events[0]["job"] == second and events[0]["event"] == "error"
+    finally:
+        renderer.close()
@@ -0,0 +1,140 @@
+# tests/test_schedule_import.py
+# This file checks the chunked schedule import: reading load_Sched.csv back, filling values from
+# the catalog, skipping and reporting bad rows, clearing unreadable times, and ending cleanly on
+# a file that cannot be read to the end.
+
+import csv
+import datetime
+import os
+import sys
+
+import pytest
+
+from appliance_catalog import ApplianceCatalog
+from load_model import SCHEDULE_COLUMNS, LoadModel
+from schedule_import import ScheduleImport, schedule_fields, _header_map
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CATALOG = ApplianceCatalog(["Fan", "Pump", "Lamp"], [60.0, 750.0, 10.0], [0.9, 0.8, float("nan")],
+                           [90.0, 85.0, float("nan")], [60.0, 2250.0, float("nan")])
+
+
+def _write(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        csv.writer(file).writerows(rows)
+    return str(path)
+
+
+def _import_all(path, catalog=CATALOG, chunk_rows=1000):
+    run = ScheduleImport(str(path), catalog, chunk_rows=chunk_rows)
+    chunks = []
+    while (chunk := run.next_chunk()) is not None:
+        chunks.append(chunk)
+    return run, [fields for chunk in chunks for fields in chunk], chunks
+
+
+def test_saved_schedule_reads_back(tmp_path):
+    model = LoadModel()
+    model.add("r1", 1500.5, 2.5, 2, 1500.5 * 2.5 * 2 / 1000, surge=4501.5, start_hour=18, end_hour=23,
+              appliance="Pump, borehole", power_factor=0.8, efficiency=85)
+    model.add("r2", 60.0, 8, 3, 60 * 8 * 3 / 1000, appliance="Fan", power_factor=0.9, efficiency=90)
+    model.add("r3", 10.0, 5, 1, 0.05, start_hour=22, end_hour=6, appliance="Lamp")
+    # As save_to_csv writes it: the schedule, a blank line, then the summary sections.
+    rows = [list(SCHEDULE_COLUMNS), *model.display_rows(), [], ["Total Consumption (kWh)", "7.8025"], [],
+            ["Solar Component", "Requirement/Selection", "Details"], ["Inverter Size (W)", "5000", "Required: 4,689W"]]
+    run, imported, _ = _import_all(_write(tmp_path / "load_Sched.csv", rows))
+
+    restored = LoadModel()
+    restored.extend((f"r{i}", fields) for i, fields in enumerate(imported, 1))
+    assert restored.display_rows() == model.display_rows()
+    assert (run.rows, run.skipped, run.unknown, run.stopped) == (3, 0, 1, None)
+    assert run.report() == "Imported 3 rows from load_Sched.csv (1 not in the appliance catalog)"
+
+
+def test_shipped_load_schedule_stops_at_the_summary():
+    catalog = ApplianceCatalog.from_csv(os.path.join(REPO, "Appliances.csv"))
+    run, imported, _ = _import_all(os.path.join(REPO, "load_Sched.csv"), catalog)
+    assert len(imported) == 1 and run.skipped == 0
+    assert imported[0]["appliance"] == "Electric Water Pump (Submersible"
+    assert (imported[0]["power"], imported[0]["usage_hours"], imported[0]["count"]) == (100.0, 6.0, 1)
+    assert imported[0]["consumption_kWh"] == pytest.approx(0.6)
+
+
+def test_catalog_fills_missing_values_and_chunks(tmp_path):
+    rows = [["Name", "Qty", "Hours"]] + [["Pump", 2, ""]] * 25
+    run, imported, chunks = _import_all(_write(tmp_path / "audit.csv", rows), chunk_rows=10)
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert imported[0] == {"appliance": "Pump", "power": 750.0, "power_factor": 0.8, "efficiency": 85.0,
+                           "surge": 2250.0, "usage_hours": 6, "count": 2, "consumption_kWh": 9.0,
+                           "start": "", "end": ""}
+    assert run.done == 1.0 and run.finished
+
+
+def test_bad_rows_are_skipped_with_their_line(tmp_path):
+    rows = [["Appliance", "Power (W)", "Count"], ["", "100", "1"], ["Mystery", "", "1"], ["Fan", "", "two"],
+            ["Fan", "-5", "1"], ["Lamp", "", ""], ["Mystery", "1,200", "1"]]
+    run, imported, _ = _import_all(_write(tmp_path / "audit.csv", rows))
+    assert [fields["appliance"] for fields in imported] == ["Lamp", "Mystery"]
+    assert imported[0]["power_factor"] == 1.0 and imported[0]["surge"] == 10.0  # Blank catalog cells
+    assert imported[1]["power"] == 1200.0
+    assert [line for line, _ in run.errors] == [2, 3, 4, 5]
+    assert run.errors[1][1] == "'Mystery' is not in the appliance catalog and has no power"
+    assert run.errors[2][1] == "Count is not a number: 'two'"
+    assert run.report().endswith("(1 not in the appliance catalog); skipped 4")
+
+
+def test_unreadable_times_are_cleared_not_skipped(tmp_path):
+    rows = [["Appliance", "Usage (Hrs)", "Start", "End"], ["Fan", "2", "18:00:00", "6:30 AM"],
+            ["Fan", "2", "25:00", "23:00"], ["Fan", "8", "18:00", "20:00"], ["Fan", "2", "", "07:00"]]
+    run, imported, _ = _import_all(_write(tmp_path / "audit.csv", rows))
+    assert [(fields["start"], fields["end"]) for fields in imported] == [("18:00", "06:30"), ("", ""), ("", ""), ("", "07:00")]
+    assert run.skipped == 0 and run.cleared == 2
+    assert [line for line, _ in run.warnings] == [3, 4]
+    assert run.warnings[0][1].startswith("Start cleared: Invalid time of day")
+    assert "; cleared the times of 2" in run.report()
+
+
+def test_spreadsheet_time_cells():
+    columns = _header_map(["Appliance", "Start", "End"])
+    fields, unknown, notes = schedule_fields(
+        {"Appliance": "Pump", "Start": datetime.time(6, 0), "End": datetime.time(12, 15)}, columns, CATALOG)
+    assert (fields["start"], fields["end"], unknown, notes) == ("06:00", "12:15", False, [])
+
+
+def test_malformed_file_keeps_the_rows_before_it(tmp_path):
+    path = tmp_path / "audit.csv"
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        file.write("Appliance,Count\nFan,1\nPump,2\n")
+        file.write('Lamp,"' + "x" * (csv.field_size_limit() + 1) + '"\nFan,3\n')
+    run, imported, _ = _import_all(path)
+    assert [fields["appliance"] for fields in imported] == ["Fan", "Pump"]
+    assert run.stopped is not None and run.finished
+    assert run.report().startswith("Imported 2 rows from audit.csv; stopped after line 3: field larger than")
+
+
+def test_cancel_and_header_errors(tmp_path):
+    run = ScheduleImport(_write(tmp_path / "audit.csv", [["Appliance"]] + [["Fan"]] * 30), CATALOG, chunk_rows=10)
+    assert len(run.next_chunk()) == 10
+    run.cancel()
+    assert run.next_chunk() is None
+    assert run.report() == "Imported 10 rows from audit.csv; cancelled after line 11"
+
+    with pytest.raises(ValueError, match="no Appliance column"):
+        ScheduleImport(_write(tmp_path / "other.csv", [["Item", "Watts"], ["Fan", "60"]]), CATALOG)
+
+
+def test_unreadable_header_is_a_value_error(tmp_path):
+    path = tmp_path / "audit.csv"
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        file.write('"' + "x" * (csv.field_size_limit() + 1) + '",Count\nFan,1\n')
+    with pytest.raises(ValueError, match="the header row cannot be read"):
+        ScheduleImport(str(path), CATALOG)
+
+
+def test_parquet_needs_pyarrow(tmp_path, monkeypatch):
+    # None in sys.modules makes the import fail, whether or not pyarrow is installed.
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    with pytest.raises(ImportError, match="needs the pyarrow package"):
+        ScheduleImport(str(tmp_path / "audit.parquet"), CATALOG)
@@ -0,0 +1,143 @@
+# tests/test_schedule_journal.py
+# This file checks that the schedule journal restores the same rows after a clean close,
+# a torn last entry, a crash in the middle of a compaction, and with a second owner.
+
+import json
+import os
+import random
+
+from schedule_journal import ScheduleJournal
+
+
+def _fields(power):
+    return {"power": float(power), "usage_hours": 1.0, "count": 1.0, "appliance": f"Load {power}"}
+
+
+def _edit_randomly(journal, expected, steps, rng):
+    for _ in range(steps):
+        if rng.random() < 0.5 or not expected:
+            row_id = journal.new_id()
+            expected[row_id] = _fields(rng.randint(1, 5000))
+            journal.add(row_id, expected[row_id])
+        elif rng.random() < 0.6:
+            row_id = rng.choice(list(expected))
+            expected[row_id] = {**expected[row_id], "count": float(rng.randint(1, 9))}
+            journal.edit(row_id, {"count": expected[row_id]["count"]})
+        else:
+            row_id = rng.choice(list(expected))
+            del expected[row_id]
+            journal.delete(row_id)
+
+
+def _reopen(base):
+    journal = ScheduleJournal(base)
+    rows = dict(journal.replay())
+    return journal, rows
+
+
+def test_replay_restores_rows_in_order(tmp_path):
+    base = str(tmp_path / "load_Sched")
+    journal = ScheduleJournal(base)
+    assert journal.replay() == []
+    journal.add_many([("r1", _fields(100)), ("r2", _fields(200)), ("r3", _fields(300))])
+    journal.edit("r2", {"count": 4.0})
+    journal.delete("r1")
+    journal.close()
+
+    journal = ScheduleJournal(base)
+    assert journal.replay() == [("r2", {**_fields(200), "count": 4.0}), ("r3", _fields(300))]
+    assert journal.new_id() == "r4"  # Ids of deleted rows are never handed out again
+    journal.close()
+
+
+def test_compaction_keeps_every_change(tmp_path):
+    base = str(tmp_path / "load_Sched")
+    rng = random.Random(3)
+    expected = {}
+    journal = ScheduleJournal(base, compact_every=25)
+    journal.replay()
+    _edit_randomly(journal, expected, 1000, rng)
+    journal.compact(wait=True)
+    _edit_randomly(journal, expected, 37, rng)
+    assert journal.compactions >= 1
+    assert journal.status()["rows"] == len(expected)
+
+    # Reading the files while the owner still runs (read_only) must see the same rows.
+    reader, rows = _reopen(base)
+    assert reader.read_only
+    assert rows == expected
+    reader.close()
+
+    journal.close()
+    assert not os.path.exists(journal.journal_path) or os.path.getsize(journal.journal_path) == 0
+    assert not os.path.exists(journal.rotated_path)
+    journal, rows = _reopen(base)
+    assert rows == expected
+    assert journal.status()["pending"] == 0
+    journal.close()
+
+
+def test_torn_last_entry_is_cut_off(tmp_path):
+    base = str(tmp_path / "load_Sched")
+    journal = ScheduleJournal(base)
+    journal.replay()
+    journal.add("r1", _fields(100))
+    journal.add("r2", _fields(200))
+    journal._file.close()  # Simulate a crash: no close(), no compaction
+    journal._lock_file.close()
+    with open(journal.journal_path, 'ab') as file:
+        file.write(b'{"op":"add","id":"r3","fie')
+
+    journal, rows = _reopen(base)
+    assert list(rows) == ["r1", "r2"]
+    with open(journal.journal_path, 'rb') as file:
+        assert file.read().endswith(b"}\n")
+    journal.add("r3", _fields(300))
+    journal.close()
+    journal, rows = _reopen(base)
+    assert list(rows) == ["r1", "r2", "r3"]
+    journal.close()
+
+
+def test_crash_before_the_rotated_journal_is_removed(tmp_path):
+    base = str(tmp_path / "load_Sched")
+    journal = ScheduleJournal(base)
+    journal.replay()
+    journal.add_many([("r1", _fields(100)), ("r2", _fields(200))])
+    journal.edit("r1", {"count": 2.0})
+    journal.delete("r2")
+    journal.close()
+    journal._file = None
+
+    # The snapshot already holds every entry, yet the rotated journal was left behind.
+    with open(base + ".journal.1", 'w', encoding='utf-8') as file:
+        for entry in ({"op": "add", "id": "r1", "fields": _fields(100)},
+                      {"op": "add", "id": "r2", "fields": _fields(200)},
+                      {"op": "edit", "id": "r1", "fields": {"count": 2.0}},
+                      {"op": "delete", "id": "r2"}):
+            file.write(json.dumps(entry) + "\n")
+    journal, rows = _reopen(base)
+    assert rows == {"r1": {**_fields(100), "count": 2.0}}
+    journal.close()
+    assert not os.path.exists(base + ".journal.1")
+
+
+def test_second_owner_is_read_only(tmp_path):
+    base = str(tmp_path / "load_Sched")
+    owner = ScheduleJournal(base)
+    owner.replay()
+    owner.add("r1", _fields(100))
+
+    other, rows = _reopen(base)
+    assert other.read_only and not owner.read_only
+    assert rows == {"r1": _fields(100)}
+    other.add(other.new_id(), _fields(200))
+    other.compact(wait=True)
+    other.close()
+    assert other.status()["rows"] == 2 and other.appended == 0
+
+    owner.close()
+    journal, rows = _reopen(base)
+    assert not journal.read_only
+    assert rows == {"r1": _fields(100)}
+    journal.close()
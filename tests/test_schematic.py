@@ -0,0 +1,70 @@
+# tests/test_schematic.py
+# This file checks that the retained-mode schematic template, after swapping its labels,
+# draws exactly what a fresh drawing with the same labels would (Agg backend).
+
+import io
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import schematic
+from schematic import BOXES, FIGSIZE, SchematicTemplate, draw_schematic
+
+
+def _labels(tag):
+    labels = {key: f"{key}\n{tag} A" for key in BOXES}
+    labels["cable"] = f"Cable: {tag} mm²"
+    return labels
+
+
+def _texts(figure):
+    """
+    Returns every text of the figure's axes with what decides how it is drawn.
+    """
+    return [(text.get_text(), text.get_position(), text.get_fontsize(), text.get_fontweight(),
+             text.get_ha(), text.get_va(), text.get_color())
+            for ax in figure.axes for text in ax.texts]
+
+
+def _fresh(labels):
+    figure = Figure(figsize=FIGSIZE, dpi=schematic.DPI)
+    FigureCanvasAgg(figure)
+    draw_schematic(figure.subplots(), labels)
+    return figure
+
+
+def _pixels(figure):
+    figure.canvas.draw()
+    return bytes(figure.canvas.buffer_rgba())
+
+
+def test_swapped_labels_match_a_fresh_drawing():
+    template = SchematicTemplate()
+    for tag in ("10", "250", "10"):
+        template.update(_labels(tag))
+        fresh = _fresh(_labels(tag))
+
+        assert _texts(template.figure) == _texts(fresh)
+        assert _pixels(template.figure) == _pixels(fresh)
+
+
+def test_unchanged_labels_are_left_alone():
+    template = SchematicTemplate()
+    labels = _labels("10")
+    template.update(labels)
+    texts = {id(text): text.get_text() for text in template.figure.axes[0].texts}
+
+    changed = dict(labels, fuse="Fuse\n63 A")
+    template.update(changed)
+
+    after = {id(text): text.get_text() for text in template.figure.axes[0].texts}
+    assert after.keys() == texts.keys()
+    assert [key for key in texts if texts[key] != after[key]] == \
+        [id(template._texts["fuse"])]
+    assert template.labels == changed
+
+
+def test_render_png_writes_a_png():
+    buffer = io.BytesIO()
+    schematic.render_png(_labels("10"), buffer, dpi=40)
+    assert buffer.getvalue().startswith(b"\x89PNG")
@@ -0,0 +1,64 @@
+# tests/test_schematic_svg.py
+# This file checks that the SVG schematic is well-formed XML carrying every label, and that
+# it is built without importing matplotlib.
+
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+
+from schematic import ARROWS, BOXES
+from schematic_svg import schematic_svg
+
+SVG = "{http://www.w3.org/2000/svg}"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _labels():
+    labels = {key: f"{key} & <co>\n12 \"A\" > 10" for key in BOXES}
+    labels["outlets"] = "Outlets"
+    labels["cable"] = "Cable: 6 mm² & <b>"
+    return labels
+
+
+def _texts(document):
+    """
+    Returns the text of every <text> element, its lines joined with newlines.
+    """
+    return ["\n".join(span.text or "" for span in text.iter(SVG + "tspan"))
+            for text in document.iter(SVG + "text")]
+
+
+def test_every_label_is_escaped_text():
+    labels = _labels()
+    svg = schematic_svg(labels)
+    texts = _texts(ET.fromstring(svg.encode('utf-8')))
+
+    for label in labels.values():
+        assert label in texts
+    assert "&amp; &lt;co&gt;" in svg
+    assert "<co>" not in svg and "<b>" not in svg
+
+
+def test_shapes_follow_the_layout():
+    document = ET.fromstring(schematic_svg(_labels()).encode('utf-8'))
+
+    # One background plus one rectangle per box
+    assert len(document.findall(SVG + "rect")) == len(BOXES) + 1
+    lines = document.findall(SVG + "line")
+    assert len(lines) == len(ARROWS)
+    markers = {marker.get("id") for marker in document.iter(SVG + "marker")}
+    assert {line.get("marker-end")[5:-1] for line in lines} <= markers
+    assert [line.get("stroke-dasharray") is not None for line in lines] == \
+        [linestyle == '--' for *_, linestyle in ARROWS]
+    # Box labels, arrow labels and the cable label
+    assert len(_texts(document)) == len(BOXES) + len(ARROWS) + 1
+
+
+def test_does_not_import_matplotlib():
+    code = ("import sys, schematic_svg\n"
+            "labels = dict.fromkeys(list(schematic_svg.BOXES) + ['cable'], 'x')\n"
+            "schematic_svg.schematic_svg(labels)\n"
+            "print('matplotlib' in sys.modules)")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
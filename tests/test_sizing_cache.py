@@ -0,0 +1,113 @@
+# tests/test_sizing_cache.py
+# This file checks that cached sizing results are byte-identical to a fresh size_system() call,
+# the LRU bookkeeping of the caches, and that simulations are shared by schedules with the same
+# load profile.
+
+import pickle
+import random
+
+import numpy as np
+
+from load_model import LoadModel
+from sizing_cache import LruMemo, SizingCache, normalized_inputs, sizing_key
+from sizing_engine import LoadSummary, SizingParams, size_system
+from sizing_graph import SizingGraph
+from year_simulation import simulate_profile, simulate_schedule
+
+
+def _gui_inputs(rng):
+    # As calculate_gen_set builds them: float() of the combobox strings and the load model totals
+    loads = LoadSummary(total_wattage=rng.uniform(1, 20000), total_consumption_kWh=rng.uniform(0.1, 100),
+                        coincident_W=rng.choice([None, rng.uniform(1, 20000)]), surge_W=rng.uniform(0, 40000))
+    params = SizingParams(system_voltage=float(rng.choice(["12", "24", "48"])), dod=float(rng.choice(["50", "80"])),
+                          panel_size=float(rng.choice(["300", "400", "550"])))
+    return loads, params
+
+
+def test_hits_pickle_like_a_fresh_computation():
+    rng = random.Random(21)
+    cache = SizingCache(max_entries=16)
+    graph = SizingGraph()
+    for _ in range(500):
+        loads, params = _gui_inputs(rng)
+        for _ in range(2):  # A miss, then a hit
+            cached = cache.size(loads, params, compute=graph.evaluate)
+            assert pickle.dumps(cached) == pickle.dumps(size_system(loads, params))
+    assert cache.sizing.hits == cache.sizing.misses == 500
+
+
+def test_lru_order_and_counters():
+    memo = LruMemo(max_entries=2)
+    assert memo.get("a", lambda: 1) == 1
+    assert memo.get("b", lambda: 2) == 2
+    assert memo.get("a", lambda: None) == 1  # "a" is now the most recently used
+    assert memo.get("c", lambda: 3) == 3  # Evicts "b"
+    assert memo.get("b", lambda: 20) == 20  # Evicts "a"
+    assert memo.get("c", lambda: None) == 3
+    assert memo.stats() == {"entries": 2, "hits": 2, "misses": 4, "evictions": 2, "mismatches": 0}
+
+
+def test_check_counts_and_replaces_mismatches():
+    memo = LruMemo(check=True)
+    memo.get("k", lambda: [1.0])
+    assert memo.get("k", lambda: [1.0], reference=lambda: [1]) == [1]
+    assert memo.get("k", lambda: [2.0], reference=lambda: [1]) == [1]
+    assert (memo.mismatches, memo.hits) == (1, 2)
+
+    cache = SizingCache(check=True)
+    loads = LoadSummary(total_wattage=3000.0, total_consumption_kWh=12.0)
+    params = SizingParams(system_voltage=48.0, dod=80.0, panel_size=400.0)
+    cache.size(loads, params)
+    cache.size(loads, params)
+    assert cache.stats()["sizing"]["mismatches"] == 0
+    # Integer inputs size to a result that pickles differently from the normalized one.
+    cache.size(loads, SizingParams(system_voltage=48, dod=80, panel_size=400))
+    assert cache.stats()["sizing"]["mismatches"] == 1
+
+
+def test_signed_zeros_share_a_key():
+    params = SizingParams(system_voltage=24.0, dod=50.0, panel_size=300.0)
+    plus = LoadSummary(total_wattage=500.0, total_consumption_kWh=2.0, coincident_W=0.0, surge_W=0.0)
+    minus = LoadSummary(total_wattage=500.0, total_consumption_kWh=2.0, coincident_W=-0.0, surge_W=-0.0)
+    assert sizing_key(*normalized_inputs(plus, params)) == sizing_key(*normalized_inputs(minus, params))
+    cache = SizingCache()
+    first = cache.size(minus, params)
+    assert cache.size(plus, params) is first
+    assert cache.sizing.stats()["hits"] == 1
+    assert pickle.dumps(first) == pickle.dumps(size_system(plus, params))
+
+
+def test_simulation_keys_on_profile_and_result():
+    cache = SizingCache()
+    params = SizingParams(system_voltage=48.0, dod=80.0, panel_size=400.0)
+    small = size_system(LoadSummary(total_wattage=1000, total_consumption_kWh=5), params)
+    large = size_system(LoadSummary(total_wattage=1000, total_consumption_kWh=9), params)
+    evening = np.zeros(24)
+    evening[18:23] = 1000.0
+    morning = np.roll(evening, -12)
+
+    simulation = cache.simulate(evening, small)
+    assert simulation == simulate_profile(evening, small)
+    assert cache.simulate(evening.copy(), small) is simulation
+    assert cache.simulate(morning, small) == simulate_profile(morning, small)
+    assert cache.simulate(evening, large) == simulate_profile(evening, large)
+    assert cache.simulations.stats()["hits"] == 1 and cache.simulations.stats()["misses"] == 3
+
+
+def test_schedules_with_the_same_profile_share_a_simulation():
+    cache = SizingCache()
+    params = SizingParams(system_voltage=48.0, dod=80.0, panel_size=400.0)
+    result = size_system(LoadSummary(total_wattage=1000, total_consumption_kWh=5), params)
+    # One 1000 W heater, two 500 W ones on one row, or four 250 W rows: the same load every hour
+    one = LoadModel()
+    one.add("r1", 1000, 5, 1, 5, start_hour=18)
+    two = LoadModel()
+    two.add("r1", 500, 5, 2, 5, start_hour=18, appliance="Heater")
+    four = LoadModel()
+    four.extend([(f"r{i}", dict(one.record("r1"), power=250.0)) for i in range(4)])
+
+    simulation = cache.simulate(one.profile(), result)
+    assert simulation == simulate_schedule(one.rows(), result)
+    assert cache.simulate(two.profile(), result) is simulation
+    assert cache.simulate(four.profile(), result) is simulation
+    assert len(cache.simulations) == 1
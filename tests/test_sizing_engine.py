@@ -0,0 +1,68 @@
+# tests/test_sizing_engine.py
+# This file checks size_system() against the formulas in its docstring.
+
+import math
+
+from component_catalog import CATALOG
+from sizing_engine import LoadSummary, SizingParams, result_rows, size_system, summary_text
+
+
+def test_no_load_gives_no_result():
+    params = SizingParams(system_voltage=24, dod=50, panel_size=300)
+    assert size_system(LoadSummary(0, 5), params) is None
+    assert size_system(LoadSummary(1000, 0), params) is None
+
+
+def test_requirements_follow_the_formulas():
+    result = size_system(LoadSummary(1000, 5), SizingParams(system_voltage=24, dod=50, panel_size=300))
+
+    assert result.daily_consumption_Wh == 5000
+    assert math.isclose(result.battery_Ah_req, 5000 * 1.2 / (24 * 0.5))
+    assert math.isclose(result.inverter_required, 1000 * 1.25)
+    assert result.inverter_sel == CATALOG.select("inverter", 1250)
+    assert math.isclose(result.pv_capacity_required, 5000 * 1.2 / (5.5 * 0.8))
+    assert result.num_panels == math.ceil(result.pv_capacity_required / 300)
+    assert result.total_pv_capacity == result.num_panels * 300
+    assert math.isclose(result.total_pv_current, result.num_panels * 300 / 24)
+    assert math.isclose(result.inverter_ac_current, result.inverter_sel / 230)
+    assert math.isclose(result.inverter_current, result.inverter_sel / 24)
+    assert math.isclose(result.active_balancer_required, 500 * 0.05)
+
+
+def test_inverter_uses_the_coincident_peak_when_known():
+    params = SizingParams(system_voltage=48, dod=80, panel_size=550)
+    all_at_once = size_system(LoadSummary(4000, 10), params)
+    timed = size_system(LoadSummary(4000, 10, coincident_W=1500), params)
+
+    assert math.isclose(all_at_once.inverter_required, 5000)
+    assert math.isclose(timed.inverter_required, 1875)
+    assert timed.battery_Ah_req == all_at_once.battery_Ah_req
+
+
+def test_surge_peak_can_set_the_inverter():
+    # 150 W running with a 450 W start: 450 / 2.0 beats 150 x 1.25
+    result = size_system(LoadSummary(150, 1, coincident_W=150, surge_W=450),
+                         SizingParams(system_voltage=12, dod=50, panel_size=300))
+    assert math.isclose(result.inverter_required, 225)
+    assert result.inverter_sel == CATALOG.select("inverter", 225)
+
+
+def test_small_battery_gets_the_minimum_balancer():
+    result = size_system(LoadSummary(100, 0.2), SizingParams(system_voltage=48, dod=80, panel_size=300))
+    assert result.active_balancer_required == 5
+
+
+def test_oversize_inverter_falls_back_to_the_required_watts():
+    largest = CATALOG.ratings("inverter")[-1]
+    result = size_system(LoadSummary(largest, 10), SizingParams(system_voltage=48, dod=80, panel_size=550))
+
+    assert result.inverter_sel == f"> {largest}"
+    assert math.isclose(result.inverter_ac_current, largest * 1.25 / 230)
+    assert "Inverter" in summary_text(result)
+
+
+def test_result_rows_cover_every_component():
+    result = size_system(LoadSummary(1000, 5), SizingParams(system_voltage=24, dod=50, panel_size=300))
+    rows = result_rows(result)
+    assert [row[0] for row in rows][:3] == ["Daily Consumption (Wh)", "Battery Capacity (Ah)", "Inverter Size (W)"]
+    assert all(len(row) == 3 for row in rows)
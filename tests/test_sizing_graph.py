@@ -0,0 +1,61 @@
+# tests/test_sizing_graph.py
+# This file checks that incremental evaluations of the sizing graph return exactly what
+# size_system() returns, and that an edit only re-runs the nodes it affects.
+
+import dataclasses
+import random
+
+from sizing_engine import LoadSummary, SizingParams, size_system
+from sizing_graph import SizingGraph
+
+
+def _random_edit(rng, loads, params):
+    field = rng.choice(["load", "surge", "peak", "system_voltage", "dod", "panel_size", "sun_hours", "inverter_margin"])
+    if field == "load":
+        return dataclasses.replace(loads, total_consumption_kWh=rng.choice([0.0, rng.uniform(0.1, 200)])), params
+    if field == "surge":
+        return dataclasses.replace(loads, surge_W=rng.uniform(0, 50000)), params
+    if field == "peak":
+        return dataclasses.replace(loads, coincident_W=rng.choice([None, rng.uniform(1, 20000)])), params
+    values = {
+        "system_voltage": [12, 24, 48, 48.0],
+        "dod": [50, 80, 90, 100],
+        "panel_size": [300, 400, 550, 550.0],
+        "sun_hours": [4.5, 5.5, 6],
+        "inverter_margin": [1.0, 1.25, 1.5],
+    }[field]
+    return loads, dataclasses.replace(params, **{field: rng.choice(values)})
+
+
+def test_every_evaluation_matches_size_system():
+    rng = random.Random(22)
+    graph = SizingGraph()
+    loads = LoadSummary(total_wattage=3000, total_consumption_kWh=12)
+    params = SizingParams(system_voltage=48, dod=80, panel_size=400)
+    for _ in range(3000):
+        loads, params = _random_edit(rng, loads, params)
+        # repr() also tells 48 from 48.0, which the results table would show differently.
+        assert repr(graph.evaluate(loads, params)) == repr(size_system(loads, params))
+    assert graph.nodes_skipped > graph.nodes_run
+
+
+def test_panel_size_leaves_the_inverter_alone():
+    graph = SizingGraph()
+    loads = LoadSummary(total_wattage=3000, total_consumption_kWh=12, coincident_W=2000, surge_W=6000)
+    params = SizingParams(system_voltage=48, dod=80, panel_size=400)
+    graph.evaluate(loads, params)
+    assert graph.evaluate(loads, params) == size_system(loads, params)
+    assert graph.changed == frozenset()
+
+    params = dataclasses.replace(params, panel_size=550)
+    assert graph.evaluate(loads, params) == size_system(loads, params)
+    assert "num_panels" in graph.changed
+    assert graph.changed.isdisjoint({"inverter_required", "inverter_sel", "cable_sel", "fuse_sel", "battery_Ah_req"})
+
+
+def test_no_load_returns_none():
+    graph = SizingGraph()
+    params = SizingParams(system_voltage=24, dod=50, panel_size=300)
+    assert graph.evaluate(LoadSummary(total_wattage=0, total_consumption_kWh=5), params) is None
+    loads = LoadSummary(total_wattage=100, total_consumption_kWh=0.5)
+    assert graph.evaluate(loads, params) == size_system(loads, params)
@@ -0,0 +1,168 @@
+# tests/test_virtual_table.py
+# This file checks the virtual-scrolling load table: only the visible window of the view has Tk
+# items, sorting and filtering work on the model, and the selection survives scrolling.
+# It needs a display for Tk and is skipped without one.
+
+import tkinter as tk
+import types
+from tkinter import ttk
+
+import pytest
+
+from load_model import SCHEDULE_COLUMNS, LoadModel
+from virtual_table import _CONTROL, SORT_ARROWS, VirtualTable
+
+PAGE = 10
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"no display for Tk: {e}")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def _model(rows=100):
+    model = LoadModel()
+    for i in range(1, rows + 1):
+        name = "Fan" if i % 10 == 3 else f"Light {i}"
+        model.add(f"r{i}", (i * 37) % 101 + 1, 2, 1, 0.1, appliance=name)
+    return model
+
+
+def _table(root, model):
+    table = VirtualTable(root, model, columns=SCHEDULE_COLUMNS, show="headings", height=PAGE)
+    for column in SCHEDULE_COLUMNS:
+        table.heading(column, text=column)
+    table.refresh()
+    _settle(root)
+    return table
+
+
+def _settle(root):
+    root.update_idletasks()
+
+
+def _shown(table):
+    """
+    Returns the ids of the rows that have Tk items, in display order.
+    """
+    return list(ttk.Treeview.get_children(table))
+
+
+def _click(table, *iids, control=False):
+    """
+    Selects rows like a click on them (a control-click adds them to the selection).
+    """
+    table._on_click(types.SimpleNamespace(state=_CONTROL if control else 0))
+    ttk.Treeview.selection_set(table, [iid for iid in table.selection() if iid in _shown(table)] + list(iids)
+                               if control else list(iids))
+    table._on_select(None)
+
+
+def test_only_the_visible_window_has_items(root):
+    model = _model()
+    table = _table(root, model)
+
+    assert _shown(table) == [f"r{i}" for i in range(1, PAGE + 1)]
+    assert table.get_children() == tuple(model.row_ids()) and len(table) == 100
+    assert table.status.get() == "Rows 1-10 of 100"
+    assert table.yview() == (0.0, 0.1)
+
+    table.yview("scroll", 2, "pages")
+    table.yview("scroll", 3, "units")
+    assert _shown(table) == [f"r{i}" for i in range(24, 34)]
+    table.yview("moveto", 1.0)
+    assert _shown(table) == [f"r{i}" for i in range(91, 101)]
+    assert table.status.get() == "Rows 91-100 of 100"
+
+    table.see("r5")
+    assert _shown(table)[0] == "r5"
+    assert table.item("r5", "values") == model.display("r5")
+
+
+def test_sorting_orders_the_view_and_marks_the_heading(root):
+    model = _model()
+    table = _table(root, model)
+    power = dict(zip(model.row_ids(), model.sort_keys("Power (W)")))
+
+    table.sort_by("Power (W)")
+    _settle(root)
+    ascending = sorted(model.row_ids(), key=power.__getitem__)
+    assert _shown(table) == ascending[:PAGE]
+    assert table.heading("Power (W)", "text") == "Power (W)" + SORT_ARROWS[0]
+
+    table.sort_by("Power (W)")
+    _settle(root)
+    assert _shown(table) == sorted(model.row_ids(), key=power.__getitem__, reverse=True)[:PAGE]
+    assert table.heading("Power (W)", "text") == "Power (W)" + SORT_ARROWS[1]
+
+    table.sort_by("Appliance")
+    _settle(root)
+    assert table.heading("Power (W)", "text") == "Power (W)"
+    assert table.heading("Appliance", "text") == "Appliance" + SORT_ARROWS[0]
+    # Rows in the model keep their order whatever the view shows
+    assert table.get_children() == tuple(model.row_ids())
+
+
+def test_filter_keeps_matching_rows_and_follows_edits(root):
+    model = _model()
+    table = _table(root, model)
+
+    table.set_filter("  FAN ")
+    _settle(root)
+    fans = [f"r{i}" for i in range(3, 101, 10)]
+    assert _shown(table) == fans
+    assert table.status.get() == "Rows 1-10 of 10 (filtered from 100)"
+
+    model.update("r3", appliance="Heater")
+    model.update("r4", appliance="Ceiling fan")
+    table.refresh("r3", "r4")
+    _settle(root)
+    assert _shown(table) == ["r4"] + fans[1:]
+
+    table.set_filter("nothing like this")
+    _settle(root)
+    assert _shown(table) == [] and table.status.get() == "No rows match the filter (of 100)"
+
+    table.set_filter("")
+    _settle(root)
+    assert _shown(table) == [f"r{i}" for i in range(1, PAGE + 1)]
+    assert table.status.get() == "Rows 1-10 of 100"
+
+
+def test_selection_survives_scrolling(root):
+    model = _model()
+    table = _table(root, model)
+    changes = []
+    table.bind("<<TreeviewSelect>>", changes.append)
+
+    _click(table, "r2", "r3")
+    table.yview("scroll", 3, "pages")
+    _settle(root)
+    assert table.selection() == ("r2", "r3")
+    assert list(ttk.Treeview.selection(table)) == []
+
+    _click(table, "r35", control=True)
+    assert table.selection() == ("r2", "r3", "r35")
+    table.yview("moveto", 0)
+    _settle(root)
+    assert list(ttk.Treeview.selection(table)) == ["r2", "r3"]
+    assert len(changes) == 2  # Scrolling re-selects shown rows without reporting a change
+
+    # A plain click replaces the selection, including the rows out of view
+    _click(table, "r5")
+    assert table.selection() == ("r5",) and len(changes) == 3
+
+    # Removed rows leave the selection; the selection follows the order of the view
+    _click(table, "r9", "r4", "r5", control=True)
+    model.remove("r5")
+    table.refresh("r5")
+    table.sort_by("Power (W)")
+    _settle(root)
+    power = dict(zip(model.row_ids(), model.sort_keys("Power (W)")))
+    assert table.selection() == tuple(sorted(["r4", "r9"], key=power.__getitem__))
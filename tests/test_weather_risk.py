@@ -0,0 +1,97 @@
+# tests/test_weather_risk.py
+# This file checks the Monte Carlo weather risk: results do not depend on the number of worker
+# processes, the panel search finds the smallest feasible count, and the helper protocol.
+
+import io
+import json
+import math
+import sys
+import time
+from dataclasses import asdict
+
+import numpy as np
+import pytest
+
+from sizing_engine import LoadSummary, SizingParams, size_system
+from weather_risk import WeatherRisk, WeatherRiskRun, _panels_chunk, _sample_pv, serve, weather_risk
+from year_simulation import Losses, schedule_profile, storage_required
+
+ROWS = [(800.0, 6.0, 1.0, 4.8, 2400.0, 18.0, 0.0), (60.0, 24.0, 2.0, 2.88, 60.0, None, None)]
+RESULT = size_system(LoadSummary(total_wattage=920.0, total_consumption_kWh=7.68),
+                     SizingParams(system_voltage=48.0, dod=80.0, panel_size=400.0))
+
+
+def test_results_do_not_depend_on_the_worker_count():
+    one = weather_risk(ROWS, RESULT, years=300, seed=16, workers=1)
+    two = weather_risk(ROWS, RESULT, years=300, seed=16, workers=2)
+    assert (one.battery_Ah, one.num_panels, one.design_panels) == (two.battery_Ah, two.num_panels, two.design_panels)
+    assert one.years == 300 and one.percentiles == (50, 90, 99)
+    assert one.battery_Ah[0] <= one.battery_Ah[1] <= one.battery_Ah[2]
+
+
+def test_panel_search_finds_the_smallest_feasible_count():
+    load_W = schedule_profile(ROWS)
+    losses = Losses()
+    seed = np.random.SeedSequence(7)
+    usable_Wh = RESULT.battery_Ah_req * RESULT.system_voltage * 0.8
+    panels = _panels_chunk(seed, 6, load_W, 5.5, usable_Wh, 400.0, 12, losses)
+
+    pv_per_W = _sample_pv(seed, 6, 5.5)
+    storage = np.array([storage_required(load_W, pv_per_W, n * 400.0, losses) for n in range(1, 13)])
+    for year in range(6):
+        fits = np.flatnonzero(storage[:, year] <= usable_Wh)
+        assert panels[year] == (fits[0] + 1 if len(fits) else math.inf)
+    assert np.all(np.isfinite(panels))
+
+    # No panel count carries an evening load without a battery.
+    assert np.all(_panels_chunk(seed, 6, load_W, 5.5, 0.0, 400.0, 12, losses) == math.inf)
+
+
+def _serve(job):
+    stdout = io.StringIO()
+    serve(io.StringIO(json.dumps(job)), stdout)
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def test_serve_protocol():
+    job = {"rows": [list(row) for row in ROWS], "result": asdict(RESULT), "years": 300, "seed": 3, "workers": 1}
+    stdout = sys.stdout
+    events = _serve(job)
+    assert sys.stdout is stdout
+    assert [event["event"] for event in events] == ["progress"] * 4 + ["done"]
+    assert [(event["done"], event["total"]) for event in events[:-1]] == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    risk = events[-1]["risk"]
+    expected = weather_risk(ROWS, RESULT, years=300, seed=3, workers=1)
+    assert risk["battery_Ah"] == list(expected.battery_Ah)
+
+    events = _serve({"rows": [], "result": {"system_voltage": 48}})
+    assert [event["event"] for event in events] == ["error"]
+
+
+def _wait(run, timeout=30):
+    events = []
+    deadline = time.monotonic() + timeout
+    while not run.finished and time.monotonic() < deadline:
+        events.extend(run.poll())
+        time.sleep(0.01)
+    return events
+
+
+@pytest.mark.parametrize("script", ["import sys; sys.exit(3)", "print('not json'); import sys; sys.stdin.read()"])
+def test_dead_helper_is_an_error(script):
+    run = WeatherRiskRun(ROWS, RESULT, command=[sys.executable, "-c", script])
+    events = _wait(run)
+    assert events == [{"event": "error", "error": "The weather risk helper stopped."}]
+
+
+def test_helper_events_are_decoded():
+    done = {"event": "done", "risk": {"years": 10, "percentiles": [50, 90, 99], "design_panels": 4.0,
+                                      "battery_Ah": [1.0, 2.0, 3.0], "num_panels": [3.0, 4.0, float("inf")],
+                                      "battery_margin": [1.0, 1.1, 1.2], "pv_margin": [1.0, 1.3, float("inf")],
+                                      "seconds": 0.5}}
+    script = f"import sys; sys.stdin.read(); print({json.dumps(json.dumps(done))})"
+    run = WeatherRiskRun(ROWS, RESULT, command=[sys.executable, "-c", script])
+    events = _wait(run)
+    assert len(events) == 1
+    assert events[0]["risk"] == WeatherRisk(10, (50, 90, 99), 4.0, (1.0, 2.0, 3.0), (3.0, 4.0, math.inf),
+                                            (1.0, 1.1, 1.2), (1.0, 1.3, math.inf), 0.5)
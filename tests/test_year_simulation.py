@@ -0,0 +1,118 @@
+# tests/test_year_simulation.py
+# This file checks the hourly battery simulation: the scalar and batch loops agree, energy is
+# conserved over the year, a battery of storage_required() meets the whole load, and merging
+# repeated running blocks leaves the load profile unchanged.
+
+import numpy as np
+import pytest
+
+from year_simulation import (
+    HOURS_PER_YEAR, Losses, default_pv_profile, load_profile, pv_profile, simulate_batch, simulate_year,
+    storage_required,
+)
+
+LOAD_W = load_profile([800.0, 150.0, 60.0, 1500.0], [6, 10, 24, 1.5], [1, 2, 3, 1], [18.0, 7.0, None, 12.0],
+                      [0.0, 22.0, None, 14.0])
+DAILY_WH = float(LOAD_W.sum())
+
+
+def _designs():
+    # (pv_W, battery_Wh, dod): undersized, balanced and oversized PV and batteries
+    return [(pv, battery, dod) for pv in (0.0, 0.5, 1.0, 1.6, 3.0) for battery in (0.0, 0.3, 1.0, 2.5)
+            for dod in (50.0, 80.0, 100.0)]
+
+
+def _scaled(pv, battery):
+    # PV in W relative to the daily load, battery in days of load
+    return pv * DAILY_WH / 5.5, battery * DAILY_WH
+
+
+def test_batch_matches_the_scalar_loop():
+    pv_per_W = default_pv_profile()
+    designs = [(*_scaled(pv, battery), dod) for pv, battery, dod in _designs()]
+    batch = simulate_batch(LOAD_W, pv_per_W, *(np.array(column) for column in zip(*designs)))
+    assert len(batch) == len(designs)
+    for i, (pv_W, battery_Wh, dod) in enumerate(designs):
+        single = simulate_year(LOAD_W, pv_per_W, pv_W, battery_Wh, dod)
+        assert single.loss_of_load_hours == batch.loss_of_load_hours[i]
+        for field in ("load_kWh", "pv_kWh", "unmet_kWh", "curtailed_kWh", "min_soc"):
+            assert getattr(single, field) == pytest.approx(getattr(batch, field)[i], rel=1e-9, abs=1e-9), field
+
+
+def test_batch_with_a_weather_year_per_design():
+    rng = np.random.default_rng(15)
+    sun_hours = rng.uniform(2, 8, size=(6, 365))
+    pv_per_W = pv_profile(sun_hours)
+    pv_W, battery_Wh = _scaled(1.3, 1.0)
+    batch = simulate_batch(LOAD_W, pv_per_W, pv_W, battery_Wh, 80.0)
+    for i in range(len(sun_hours)):
+        single = simulate_year(LOAD_W, pv_per_W[i], pv_W, battery_Wh, 80.0)
+        assert single.unmet_kWh == pytest.approx(batch.unmet_kWh[i], rel=1e-9, abs=1e-9)
+        assert single.loss_of_load_hours == batch.loss_of_load_hours[i]
+
+
+@pytest.mark.parametrize("pv, battery, dod", [(0.8, 0.5, 80.0), (1.5, 1.0, 50.0), (3.0, 2.0, 100.0)])
+def test_energy_balance(pv, battery, dod):
+    losses = Losses()
+    pv_W, battery_Wh = _scaled(pv, battery)
+    # A bright last hour refills the battery, so it ends the year as full as it started.
+    pv_per_W = default_pv_profile().copy()
+    pv_per_W[-1] = 10 * battery_Wh / (pv_W * losses.pv_derate * losses.charge_efficiency)
+    simulation = simulate_year(LOAD_W, pv_per_W, pv_W, battery_Wh, dod, losses)
+
+    net = pv_W * losses.pv_derate * pv_per_W - np.tile(LOAD_W, 365) / losses.inverter_efficiency
+    surplus, deficit = net[net > 0].sum(), -net[net < 0].sum()
+    charged = losses.charge_efficiency * (surplus - simulation.curtailed_kWh * 1000)
+    unmet_dc = simulation.unmet_kWh * 1000 / losses.inverter_efficiency
+    discharged = (deficit - unmet_dc) / losses.discharge_efficiency
+    assert charged == pytest.approx(discharged, rel=1e-9)
+    assert simulation.pv_kWh == pytest.approx(pv_W * losses.pv_derate * pv_per_W.sum() / 1000)
+    assert simulation.load_kWh == pytest.approx(DAILY_WH * 365 / 1000)
+    assert 100 * (1 - dod / 100) - 1e-9 <= simulation.min_soc <= 100
+
+
+@pytest.mark.parametrize("pv", [1.1, 1.5, 2.5])
+def test_storage_required_meets_the_whole_load(pv):
+    pv_per_W = default_pv_profile()
+    pv_W, _ = _scaled(pv, 0)
+    usable_Wh = float(storage_required(LOAD_W, pv_per_W, pv_W)[0])
+    assert usable_Wh > 0
+    for dod in (50.0, 80.0, 100.0):
+        battery_Wh = usable_Wh / (dod / 100) * (1 + 1e-12)
+        simulation = simulate_year(LOAD_W, pv_per_W, pv_W, battery_Wh, dod)
+        assert simulation.unmet_kWh == pytest.approx(0, abs=1e-9)
+        # The bound is tight: a slightly smaller battery falls short.
+        assert simulate_year(LOAD_W, pv_per_W, pv_W, 0.99 * battery_Wh, dod).unmet_kWh > 0
+
+
+def test_storage_required_per_design_matches_the_scalar_call():
+    pv_per_W = default_pv_profile()
+    pv_W = np.array([_scaled(pv, 0)[0] for pv in (1.1, 1.5, 2.5)])
+    required = storage_required(LOAD_W, pv_per_W, pv_W)
+    assert required.shape == (3,)
+    for i in range(3):
+        assert required[i] == storage_required(LOAD_W, pv_per_W, pv_W[i])[0]
+    assert len(default_pv_profile()) == HOURS_PER_YEAR
+
+
+def test_load_profile_of_repeated_blocks_matches_a_row_by_row_sum():
+    # Many rows sharing a few running blocks, as large schedules do, plus windows, wrapping and
+    # rows without times
+    rng = np.random.default_rng(7)
+    n = 2000
+    powers = rng.uniform(5, 2000, n)
+    counts = rng.integers(1, 4, n).astype(float)
+    usage = rng.choice([0.5, 2.0, 6.0, 24.0, 30.0], n)
+    start = rng.choice([np.nan, 0.0, 7.5, 22.0, 23.75], n)
+    end = rng.choice([np.nan, 1.0, 9.0, 22.0], n)
+
+    profile = load_profile(powers, usage, counts, start, end)
+
+    by_row = sum(load_profile(powers[i:i + 1], usage[i:i + 1], counts[i:i + 1], start[i:i + 1], end[i:i + 1])
+                 for i in range(n))
+    assert profile == pytest.approx(by_row, rel=1e-12)
+    untimed = load_profile(powers, usage, counts)
+    assert untimed == pytest.approx(
+        sum(load_profile(powers[i:i + 1], usage[i:i + 1], counts[i:i + 1]) for i in range(n)), rel=1e-12)
+    # Without windows every row runs its full usage hours (at most all day)
+    assert untimed.sum() == pytest.approx((powers * counts * np.minimum(usage, 24)).sum(), rel=1e-12)
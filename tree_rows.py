@@ -0,0 +1,63 @@
+# tree_rows.py
+# This file keeps the rows of a ttk.Treeview in step with a list of value tuples.
+# Deleting and re-inserting every row on each recalculation makes Tk redraw the whole table even
+# when one cell changed. TreeRows identifies rows by their first column, remembers what each
+# cell shows, and only sets the cells whose text changed, inserting, deleting and reordering
+# rows only when the list itself changes.
+
+
+class TreeRows:
+    """
+    show(rows) makes the tree display rows, in order, touching as little of it as possible.
+    Rows are identified by their first value, which must be unique within a list.
+    The counters record the cells and rows that were actually changed.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._shown = {}
+        self.cells_updated = 0
+        self.rows_inserted = 0
+        self.rows_deleted = 0
+
+    def show(self, rows):
+        """
+        Updates the tree to rows and returns the number of cells changed.
+        """
+        tree = self.tree
+        columns = tree["columns"]
+        wanted = []
+        changed = 0
+        for values in rows:
+            iid = str(values[0])
+            text = tuple(str(value) for value in values)
+            wanted.append(iid)
+            shown = self._shown.get(iid)
+            if shown is None:
+                tree.insert("", "end", iid=iid, values=values)
+                self.rows_inserted += 1
+                changed += len(text)
+            else:
+                for column, old, new, value in zip(columns, shown, text, values):
+                    if old != new:
+                        tree.set(iid, column, value)
+                        changed += 1
+            self._shown[iid] = text
+
+        keep = set(wanted)
+        for iid in [iid for iid in self._shown if iid not in keep]:
+            tree.delete(iid)
+            del self._shown[iid]
+            self.rows_deleted += 1
+        if list(tree.get_children()) != wanted:
+            for index, iid in enumerate(wanted):
+                tree.move(iid, "", index)
+        self.cells_updated += changed
+        return changed
+
+    def stats(self):
+        """
+        Returns the cell/row counters.
+        """
+        return {"cells_updated": self.cells_updated, "rows_inserted": self.rows_inserted,
+                "rows_deleted": self.rows_deleted}
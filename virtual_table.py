@@ -0,0 +1,287 @@
+# virtual_table.py
+# This file provides the virtual-scrolling table behind the load schedule.
+# A ttk.Treeview keeps a Tk item per row, which makes a schedule of tens of thousands of rows slow
+# to load, scroll and save. VirtualTable reads the rows from a model (the LoadModel) and only ever
+# has Tk items for the rows that fit on screen; scrolling, sorting and filtering work on the model
+# and then refill those few items. It subclasses ttk.Treeview and keeps the read methods the GUIs
+# use (item, get_children, selection, bind) working on rows rather than Tk items.
+
+import tkinter as tk
+from tkinter import ttk
+
+SORT_ARROWS = (" ▲", " ▼")  # Ascending, descending
+_SHIFT = 0x0001
+_CONTROL = 0x0004
+
+
+class VirtualTable(ttk.Treeview):
+    """
+    Treeview showing the rows of a model, which provides row_ids() (in table order), display(iid)
+    (the text of each column) and sort_keys(column) (one key per row, in row_ids() order).
+    Call refresh() after changing the model, with the ids of the rows that changed.
+
+    Only the visible window of the filtered, sorted view exists in Tk; yview() and the mouse wheel
+    move that window. Clicking a heading sorts by that column (again to reverse it), set_filter()
+    keeps the rows containing a text, and status holds a "rows a-b of n" line for a label.
+    get_children() returns every row in model order, whatever the view shows, and selection()
+    also covers selected rows that are scrolled out of view.
+    """
+
+    def __init__(self, master, model, **options):
+        self._yscrollcommand = options.pop("yscrollcommand", None)
+        super().__init__(master, **options)
+        self.model = model
+        self._text = {}  # Filter text of rows, built while a filter is set
+        self._selected = set()
+        self._replace_selection = False
+        self._view = None
+        self._filter = ""
+        self._sort_column = None
+        self._descending = False
+        self._offset = 0
+        self._page = max(int(options.get("height", 10)), 1)
+        self._window = []
+        self._refresh_pending = False
+        self._select_callbacks = []
+        self.status = tk.StringVar(master)
+
+        for column in self["columns"]:
+            super().heading(column, command=lambda column=column: self.sort_by(column))
+        super().bind("<<TreeviewSelect>>", self._on_select)
+        super().bind("<ButtonPress-1>", self._on_click, add=True)
+        super().bind("<Configure>", lambda event: self._schedule_refresh(), add=True)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            super().bind(sequence, self._on_wheel)
+
+    # ---------------------------
+    # TREEVIEW-COMPATIBLE ROW API
+    # ---------------------------
+    def refresh(self, *iids):
+        """
+        Shows the model as it is now. iids are the rows added, edited or removed since the last
+        refresh; without any, every row is treated as changed.
+        """
+        if iids:
+            for iid in iids:
+                self._text.pop(iid, None)
+                if iid not in self.model:
+                    self._selected.discard(iid)
+        else:
+            self._text.clear()
+            self._selected.intersection_update(self.model.row_ids())
+        self._changed()
+
+    def item(self, iid, option=None):
+        """
+        Returns {'values': [...]} of a row, or its values with option="values".
+        """
+        if option == "values":
+            return self.model.display(iid)
+        return {"values": list(self.model.display(iid))}
+
+    def get_children(self, item=None):
+        return tuple(self.model.row_ids())
+
+    def exists(self, iid):
+        return iid in self.model
+
+    def selection(self):
+        return tuple(iid for iid in self._view_rows() if iid in self._selected)
+
+    def bind(self, sequence=None, func=None, add=None):
+        """
+        <<TreeviewSelect>> callbacks run when the selected rows change, not when scrolling
+        re-selects the visible ones; other events bind to the widget as usual.
+        """
+        if sequence == "<<TreeviewSelect>>":
+            if not add:
+                self._select_callbacks.clear()
+            self._select_callbacks.append(func)
+            return None
+        return super().bind(sequence, func, add)
+
+    def __len__(self):
+        return len(self.model)
+
+    def configure(self, cnf=None, **options):
+        if isinstance(cnf, dict):
+            options.update(cnf)
+            cnf = None
+        if "yscrollcommand" in options:
+            self._yscrollcommand = options.pop("yscrollcommand")
+            self._update_scrollbar()
+        return super().configure(cnf, **options)
+
+    config = configure
+
+    # ---------------------------
+    # VIEW: FILTER, SORT, SCROLL
+    # ---------------------------
+    def set_filter(self, text):
+        """
+        Shows only the rows whose text contains text (case-insensitive); blank shows all.
+        """
+        text = text.strip().casefold()
+        if text != self._filter:
+            self._filter = text
+            self._offset = 0
+            if not text:
+                self._text.clear()
+            self._changed()
+
+    def sort_by(self, column):
+        """
+        Sorts the view by column, reversing the order if it is already sorted by it.
+        """
+        self._descending = column == self._sort_column and not self._descending
+        self._sort_column = column
+        for name in self["columns"]:
+            text = super().heading(name, "text")
+            for arrow in SORT_ARROWS:
+                text = text.removesuffix(arrow)
+            if name == column:
+                text += SORT_ARROWS[self._descending]
+            super().heading(name, text=text)
+        self._changed()
+
+    def yview(self, *args):
+        """
+        Scrollbar protocol: with no arguments returns the visible fraction, otherwise handles
+        ("moveto", fraction) and ("scroll", n, "units" or "pages").
+        """
+        rows = len(self._view_rows())
+        if not args:
+            return self._fractions(rows)
+        if args[0] == "moveto":
+            self._scroll_to(round(float(args[1]) * rows))
+        elif args[0] == "scroll":
+            step = self._page if args[2] == "pages" else 1
+            self._scroll_to(self._offset + int(args[1]) * step)
+        return None
+
+    def see(self, iid):
+        """
+        Scrolls the view so that a row is visible.
+        """
+        rows = self._view_rows()
+        if iid not in self._window and iid in rows:
+            self._scroll_to(rows.index(iid))
+
+    def _view_rows(self):
+        """
+        Returns the row ids of the view (filtered and sorted), rebuilt only after a change.
+        """
+        if self._view is None:
+            rows = self.model.row_ids()
+            if self._sort_column is not None:
+                keys = dict(zip(rows, self.model.sort_keys(self._sort_column)))
+                rows.sort(key=keys.__getitem__, reverse=self._descending)
+            if self._filter:
+                rows = [iid for iid in rows if self._filter in self._row_text(iid)]
+            self._view = rows
+        return self._view
+
+    def _row_text(self, iid):
+        """
+        Returns the casefolded text of a row that filters match, built the first time it is filtered.
+        """
+        text = self._text.get(iid)
+        if text is None:
+            text = self._text[iid] = "\t".join(self.model.display(iid)).casefold()
+        return text
+
+    def _fractions(self, rows):
+        if not rows:
+            return 0.0, 1.0
+        return self._offset / rows, min(self._offset + self._page, rows) / rows
+
+    def _scroll_to(self, offset):
+        rows = len(self._view_rows())
+        offset = max(0, min(offset, rows - self._page))
+        if offset != self._offset:
+            self._offset = offset
+            self._refresh()
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self._scroll_to(self._offset - 3)
+        else:
+            self._scroll_to(self._offset + 3)
+        return "break"
+
+    # ---------------------------
+    # RENDERING
+    # ---------------------------
+    def _changed(self):
+        self._view = None
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.after_idle(self._refresh)
+
+    def _visible_rows(self):
+        """
+        Returns how many rows fit in the widget, measured from a shown row once there is one.
+        """
+        if self._window:
+            box = super().bbox(self._window[0])
+            height = self.winfo_height()
+            if box and height > 1:
+                return max(1, (height - box[1]) // box[3])
+        return self._page
+
+    def _refresh(self):
+        """
+        Refills the Tk items with the visible window of the view.
+        """
+        self._refresh_pending = False
+        self._page = self._visible_rows()
+        rows = self._view_rows()
+        self._offset = max(0, min(self._offset, len(rows) - self._page))
+        window = rows[self._offset:self._offset + self._page]
+
+        keep = set(window)
+        stale = [iid for iid in self._window if iid not in keep]
+        if stale:
+            super().delete(*stale)
+        shown = set(self._window) - set(stale)
+        for index, iid in enumerate(window):
+            values = self.model.display(iid)
+            if iid in shown:
+                super().item(iid, values=values)
+                super().move(iid, "", index)
+            else:
+                super().insert("", index, iid=iid, values=values)
+        self._window = window
+        super().selection_set([iid for iid in window if iid in self._selected])
+
+        self._update_scrollbar()
+        if rows:
+            self.status.set(f"Rows {self._offset + 1:,}-{self._offset + len(window):,} of {len(rows):,}"
+                            + (f" (filtered from {len(self.model):,})" if self._filter else ""))
+        else:
+            self.status.set(f"No rows match the filter (of {len(self.model):,})" if self._filter else "")
+
+    def _update_scrollbar(self):
+        if self._yscrollcommand is not None:
+            self._yscrollcommand(*self._fractions(len(self._view_rows())))
+
+    # ---------------------------
+    # SELECTION
+    # ---------------------------
+    def _on_click(self, event):
+        # A plain click replaces the selection, including rows scrolled out of view
+        self._replace_selection = not event.state & (_SHIFT | _CONTROL)
+
+    def _on_select(self, event):
+        selected = set(super().selection())
+        if not self._replace_selection:
+            shown = set(self._window)
+            selected |= {iid for iid in self._selected if iid not in shown}
+        self._replace_selection = False
+        if selected != self._selected:
+            self._selected = selected
+            for callback in self._select_callbacks:
+                callback(event)
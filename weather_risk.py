@@ -0,0 +1,295 @@
+# weather_risk.py
+# This file sizes a design against thousands of sampled weather years (Monte Carlo).
+# For every sampled year it finds the panel count that carries the load through that year with
+# the selected battery, then the battery (Ah) needed in every year with the design-percentile
+# (P90) array, using the sequent-peak storage calculation of year_simulation. The spread of those
+# requirements gives P50/P90/P99 sizes and the margins they imply, in place of the fixed 20%
+# battery and PV margins.
+#
+# The years are split into chunks that run on a process pool. The GUIs have module-level code
+# and no __main__ guard, so they cannot host pool workers themselves; they start this file as a
+# helper process (WeatherRiskRun), which owns the pool and reports progress on stdout.
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from sizing_engine import SUN_HOURS, PERFORMANCE_RATIO, SizingResult
+from year_simulation import (
+    DAYS_PER_YEAR, Losses, daily_sun_hours, pv_profile, schedule_profile, storage_required
+)
+
+# Command-line flag that turns the packaged executable into the weather risk helper (see solar.py).
+WORKER_FLAG = "--weather-risk"
+
+N_YEARS = 2000
+CHUNK_YEARS = 250  # Years per pool task; fixed so results do not depend on the number of cores
+PERCENTILES = (50, 90, 99)
+DESIGN_PERCENTILE = 90  # The battery is sized for the array that covers this share of years
+MAX_PANEL_FACTOR = 4  # Panel counts are searched up to this multiple of the selected count
+
+# ---------------------------
+# WEATHER MODEL
+# ---------------------------
+YEAR_SIGMA = 0.05  # Spread of a year's mean irradiance around the long-term mean
+DAY_SIGMA = 0.25  # Spread of single days around the seasonal mean (cloud cover)
+PERSISTENCE = 0.5  # Day-to-day correlation of the cloud cover, so overcast spells last days
+CLEAR_SKY_FACTOR = 1.3  # A clear day yields at most this multiple of the seasonal mean
+
+
+@dataclass(frozen=True)
+class WeatherRisk:
+    """
+    Percentiles (one entry per PERCENTILES value) of the per-year requirements.
+    num_panels is the panels needed with the selected battery (inf: more than MAX_PANEL_FACTOR
+    times the selected count), battery_Ah the battery needed with design_panels panels, the
+    DESIGN_PERCENTILE panel count. The margins are those requirements divided by the no-margin
+    sizes of size_system(), so they are directly comparable to BATTERY_MARGIN and PV_MARGIN.
+    """
+    years: int
+    percentiles: tuple
+    design_panels: float
+    battery_Ah: tuple
+    num_panels: tuple
+    battery_margin: tuple
+    pv_margin: tuple
+    seconds: float
+
+
+# ---------------------------
+# SAMPLING
+# ---------------------------
+def sample_sun_hours(rng, years, mean=SUN_HOURS):
+    """
+    Returns (years, 365) daily peak sun hours: the seasonal curve of daily_sun_hours(), scaled by
+    a random factor per year and by day-to-day cloud cover that follows an AR(1) process.
+    """
+    seasonal = daily_sun_hours(mean)
+    year_factor = rng.lognormal(-YEAR_SIGMA ** 2 / 2, YEAR_SIGMA, (years, 1))
+    noise = rng.standard_normal((years, DAYS_PER_YEAR))
+    innovation = np.sqrt(1 - PERSISTENCE ** 2)
+    for day in range(1, DAYS_PER_YEAR):
+        noise[:, day] = PERSISTENCE * noise[:, day - 1] + innovation * noise[:, day]
+    day_factor = np.exp(DAY_SIGMA * noise - DAY_SIGMA ** 2 / 2)
+    return np.minimum(seasonal * year_factor * day_factor, seasonal * CLEAR_SKY_FACTOR)
+
+
+# ---------------------------
+# SIMULATION
+# ---------------------------
+def _sample_pv(seed, years, sun_hours):
+    return pv_profile(sample_sun_hours(np.random.default_rng(seed), years, sun_hours))
+
+
+def _panels_chunk(seed, years, load_W, sun_hours, usable_Wh, panel_size, max_panels, losses):
+    """
+    Pool task: returns the smallest panel count per sampled year whose storage need fits in
+    usable_Wh, or inf if max_panels are not enough. A bisection over (lo, hi], run for all
+    years at once.
+    """
+    pv_per_W = _sample_pv(seed, years, sun_hours)
+    lo = np.zeros(years)
+    hi = np.full(years, float(max_panels))
+    feasible = storage_required(load_W, pv_per_W, hi * panel_size, losses) <= usable_Wh
+    while np.any(hi - lo > 1):
+        mid = np.floor((lo + hi) / 2)
+        fits = storage_required(load_W, pv_per_W, mid * panel_size, losses) <= usable_Wh
+        hi = np.where(fits, mid, hi)
+        lo = np.where(fits, lo, mid)
+    return np.where(feasible, hi, np.inf)
+
+
+def _storage_chunk(seed, years, load_W, sun_hours, pv_W, losses):
+    """
+    Pool task: returns the usable storage (Wh) each sampled year needs with pv_W of PV.
+    The same seed gives the same weather years as _panels_chunk.
+    """
+    return storage_required(load_W, _sample_pv(seed, years, sun_hours), pv_W, losses)
+
+
+def weather_risk(rows, result, years=N_YEARS, seed=None, workers=None, sun_hours=SUN_HOURS,
+                 performance_ratio=PERFORMANCE_RATIO, losses=Losses(), progress=None):
+    """
+    Runs the Monte Carlo for a load schedule (LoadModel rows) and the SizingResult picked for it,
+    and returns a WeatherRisk. Chunks run on a process pool with workers processes (all cores
+    by default; 1 runs them in this process). progress(done, total) is called per finished chunk.
+    """
+    started = time.perf_counter()
+    load_W = schedule_profile(rows)
+    dod_fraction = result.dod / 100
+    usable_Wh = result.battery_Ah_req * result.system_voltage * dod_fraction
+    max_panels = max(1, result.num_panels) * MAX_PANEL_FACTOR
+
+    sizes = [min(CHUNK_YEARS, years - start) for start in range(0, years, CHUNK_YEARS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    total = 2 * len(sizes)
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def run(function, *args, done=0):
+        """
+        Runs function(chunk seed, chunk years, *args) for every chunk, in order of the chunks.
+        """
+        outputs = [None] * len(sizes)
+        if pool is None:
+            for index, (chunk_seed, size) in enumerate(zip(seeds, sizes)):
+                outputs[index] = function(chunk_seed, size, *args)
+                if progress:
+                    progress(done + index + 1, total)
+        else:
+            futures = {pool.submit(function, chunk_seed, size, *args): index
+                       for index, (chunk_seed, size) in enumerate(zip(seeds, sizes))}
+            for finished, future in enumerate(as_completed(futures), 1):
+                outputs[futures[future]] = future.result()
+                if progress:
+                    progress(done + finished, total)
+        return np.concatenate(outputs)
+
+    try:
+        panels = run(_panels_chunk, load_W, sun_hours, usable_Wh, result.panel_size, max_panels, losses)
+        panels_q = np.percentile(panels, PERCENTILES, method='higher')
+        design_panels = min(float(np.percentile(panels, DESIGN_PERCENTILE, method='higher')), max_panels)
+        storage = run(_storage_chunk, load_W, sun_hours, design_panels * result.panel_size, losses,
+                      done=len(sizes))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    battery_q = np.percentile(storage / (result.system_voltage * dod_fraction), PERCENTILES)
+    # No-margin sizes of size_system() (battery_margin = pv_margin = 1)
+    daily_Wh = result.daily_consumption_Wh
+    base_battery_Ah = daily_Wh / (result.system_voltage * dod_fraction)
+    base_pv_W = daily_Wh / (sun_hours * performance_ratio)
+    return WeatherRisk(
+        years=years,
+        percentiles=PERCENTILES,
+        design_panels=design_panels,
+        battery_Ah=tuple(float(q) for q in battery_q),
+        num_panels=tuple(float(q) for q in panels_q),
+        battery_margin=tuple(float(q) / base_battery_Ah for q in battery_q),
+        pv_margin=tuple(float(q) * result.panel_size / base_pv_W for q in panels_q),
+        seconds=time.perf_counter() - started,
+    )
+
+
+def risk_text(risk):
+    """
+    Returns a one-line summary of a WeatherRisk for the GUIs.
+    """
+    labels = "/".join(f"P{p}" for p in risk.percentiles)
+    battery = " / ".join(f"{q:,.0f}" for q in risk.battery_Ah)
+    panels = " / ".join("> max" if q == float('inf') else f"{q:.0f}" for q in risk.num_panels)
+    battery_margin = " / ".join(f"{m:.2f}" for m in risk.battery_margin)
+    pv_margin = " / ".join(f"{m:.2f}" for m in risk.pv_margin)
+    return (f"Weather risk over {risk.years:,} years ({labels}): panels {panels} (margin {pv_margin}); "
+            f"battery with {risk.design_panels:.0f} panels {battery} Ah (margin {battery_margin})")
+
+
+# ---------------------------
+# HELPER PROCESS
+# ---------------------------
+def serve(stdin=None, stdout=None):
+    """
+    Helper main: reads one job ({"rows", "result", "years", "seed", "workers"}) from stdin, runs it
+    on the process pool and writes "progress" events and a final "done" or "error" event as JSON
+    lines. Anything else printed meanwhile goes to stderr, so it cannot corrupt the events.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    printed, sys.stdout = sys.stdout, sys.stderr
+
+    def send(**event):
+        stdout.write(json.dumps(event) + "\n")
+        stdout.flush()
+
+    try:
+        job = json.loads(stdin.read())
+        risk = weather_risk(job["rows"], SizingResult(**job["result"]), years=job.get("years", N_YEARS),
+                            seed=job.get("seed"), workers=job.get("workers"),
+                            progress=lambda done, total: send(event="progress", done=done, total=total))
+    except Exception as e:
+        send(event="error", error=str(e))
+        return
+    finally:
+        sys.stdout = printed
+    send(event="done", risk=asdict(risk))
+
+
+def helper_command():
+    """
+    Returns the command line that starts the helper; a PyInstaller build re-runs its own
+    executable with WORKER_FLAG.
+    """
+    if getattr(sys, "frozen", False):
+        return [sys.executable, WORKER_FLAG]
+    return [sys.executable, os.path.abspath(__file__)]
+
+
+class WeatherRiskRun:
+    """
+    One Monte Carlo run in a helper process, for the GUIs.
+    poll() returns the events received so far; the run ends with a "done" event (carrying a
+    WeatherRisk) or an "error" event. cancel() stops the helper and its pool.
+    """
+
+    def __init__(self, rows, result, years=N_YEARS, seed=None, command=None):
+        flags = subprocess.CREATE_NO_WINDOW if sys.platform.startswith('win') else 0
+        self.finished = False
+        self._events = queue.Queue()
+        self._process = subprocess.Popen(
+            command or helper_command(), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            text=True, encoding='utf-8', creationflags=flags,
+        )
+        threading.Thread(target=self._read_events, name="weather-risk-events", daemon=True).start()
+        job = {"rows": [list(row) for row in rows], "result": asdict(result), "years": years, "seed": seed}
+        try:
+            self._process.stdin.write(json.dumps(job))
+            self._process.stdin.close()
+        except OSError:
+            # The helper died before reading the job; poll() reports it when its stdout closes.
+            pass
+
+    def _read_events(self):
+        for line in self._process.stdout:
+            try:
+                self._events.put(json.loads(line))
+            except ValueError:
+                continue
+        # Reap the helper, so a finished run leaves no zombie process behind
+        self._process.stdout.close()
+        self._process.wait()
+        self._events.put({"event": "exit"})
+
+    def poll(self):
+        events = []
+        while not self.finished:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if event["event"] == "exit":
+                event = {"event": "error", "error": "The weather risk helper stopped."}
+            elif event["event"] == "done":
+                risk = event["risk"]
+                event["risk"] = WeatherRisk(**{key: tuple(value) if isinstance(value, list) else value
+                                               for key, value in risk.items()})
+            events.append(event)
+            self.finished = event["event"] in ("done", "error")
+        return events
+
+    def cancel(self):
+        self.finished = True
+        if self._process.poll() is None:
+            self._process.kill()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,376 @@
+# year_simulation.py
+# This file simulates a sized system over a full year, hour by hour (8760 steps).
+# The closed-form sizing in sizing_engine assumes the same sun every day; this checks the design
+# against a year of PV production and the schedule's daily load, tracking the battery state of
+# charge within its DoD limit, and reports unmet load, curtailed PV and the lowest SOC reached.
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from sizing_engine import SUN_HOURS
+
+HOURS_PER_DAY = 24
+DAYS_PER_YEAR = 365
+HOURS_PER_YEAR = HOURS_PER_DAY * DAYS_PER_YEAR
+
+# ---------------------------
+# SITE AND LOSS ASSUMPTIONS
+# ---------------------------
+SUNRISE_HOUR = 6
+SUNSET_HOUR = 18
+SEASONAL_SWING = 0.20  # Daily sun hours vary by +/-20% around the mean over the year
+SUNNIEST_DAY = 105  # Mid-April, the peak of the dry season; the rainy season is the trough
+LOAD_CENTRE_HOUR = 20  # Each appliance's usage hours are centred on 8 PM, the evening peak
+
+PV_DERATE = 0.90  # Temperature, soiling and wiring losses of the array
+CHARGE_EFFICIENCY = 0.95  # Charge controller and battery charging
+DISCHARGE_EFFICIENCY = 0.95  # Battery discharging
+INVERTER_EFFICIENCY = 0.93  # DC -> AC
+
+
+@dataclass(frozen=True)
+class Losses:
+    """
+    Efficiencies applied in the simulation, each between 0 and 1.
+    """
+    pv_derate: float = PV_DERATE
+    charge_efficiency: float = CHARGE_EFFICIENCY
+    discharge_efficiency: float = DISCHARGE_EFFICIENCY
+    inverter_efficiency: float = INVERTER_EFFICIENCY
+
+
+# ---------------------------
+# OUTPUT
+# ---------------------------
+@dataclass(frozen=True)
+class YearSimulation:
+    """
+    Yearly totals of one design. Energies are in kWh (load and unmet load on the AC side,
+    PV and curtailment on the DC side); min_soc is in percent of the battery capacity.
+    """
+    load_kWh: float
+    pv_kWh: float
+    unmet_kWh: float
+    loss_of_load_hours: int
+    curtailed_kWh: float
+    min_soc: float
+
+    @property
+    def unmet_fraction(self):
+        return self.unmet_kWh / self.load_kWh if self.load_kWh else 0.0
+
+
+@dataclass(frozen=True)
+class BatchYearSimulation:
+    """
+    The YearSimulation fields for N designs, one array entry per design.
+    """
+    load_kWh: np.ndarray
+    pv_kWh: np.ndarray
+    unmet_kWh: np.ndarray
+    loss_of_load_hours: np.ndarray
+    curtailed_kWh: np.ndarray
+    min_soc: np.ndarray
+
+    @property
+    def unmet_fraction(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.load_kWh > 0, self.unmet_kWh / self.load_kWh, 0.0)
+
+    def __len__(self):
+        return len(self.unmet_kWh)
+
+
+# ---------------------------
+# PROFILES
+# ---------------------------
+def daily_sun_hours(mean=SUN_HOURS, swing=SEASONAL_SWING):
+    """
+    Returns the peak sun hours of every day of the year: mean +/- swing, highest on SUNNIEST_DAY.
+    """
+    day = np.arange(DAYS_PER_YEAR)
+    return mean * (1 + swing * np.cos(2 * np.pi * (day - SUNNIEST_DAY) / DAYS_PER_YEAR))
+
+
+def _daylight_shape():
+    """
+    Fraction of a day's insolation falling in each hour: a half sine from sunrise to sunset.
+    """
+    middle = np.arange(HOURS_PER_DAY) + 0.5
+    shape = np.sin(np.pi * (middle - SUNRISE_HOUR) / (SUNSET_HOUR - SUNRISE_HOUR))
+    shape[(middle < SUNRISE_HOUR) | (middle > SUNSET_HOUR)] = 0
+    return shape / shape.sum()
+
+
+def pv_profile(sun_hours_by_day):
+    """
+    Returns the hourly output per W of installed PV (before losses) for daily peak sun hours.
+    sun_hours_by_day has shape (365,) or (k, 365) for k weather years; the result (8760,) or (k, 8760).
+    """
+    sun_hours_by_day = np.asarray(sun_hours_by_day, dtype=float)
+    hourly = sun_hours_by_day[..., :, None] * _daylight_shape()
+    return hourly.reshape(sun_hours_by_day.shape[:-1] + (HOURS_PER_YEAR,))
+
+
+@lru_cache(maxsize=8)
+def default_pv_profile(mean=SUN_HOURS, swing=SEASONAL_SWING):
+    """
+    Returns the (read-only, cached) pv_profile() of the default year of daily_sun_hours().
+    """
+    profile = pv_profile(daily_sun_hours(mean, swing))
+    profile.flags.writeable = False
+    return profile
+
+
+def load_profile(powers, usage_hours, counts, start_hours=None, end_hours=None):
+    """
+    Returns the average AC load (W) of each hour of the day for a load schedule.
+    Each appliance runs usage_hours in one block from start_hour (wrapping past midnight), cut
+    short at end_hour when its running window is shorter than that; without start hours, or
+    where a start hour is NaN, the block is centred on LOAD_CENTRE_HOUR. A NaN end hour, or one
+    equal to the start, means the window is all day.
+    Fractional hours count as part of an hour, and 24 or more usage hours mean always on.
+    """
+    powers = np.asarray(powers, dtype=float)
+    usage = np.clip(np.asarray(usage_hours, dtype=float), 0, HOURS_PER_DAY)
+    watts = powers * np.asarray(counts, dtype=float)
+    start = LOAD_CENTRE_HOUR - usage / 2
+    if start_hours is not None:
+        given = np.asarray(start_hours, dtype=float)
+        start = np.where(np.isnan(given), start, given)
+        if end_hours is not None:
+            window = np.mod(np.asarray(end_hours, dtype=float) - given, HOURS_PER_DAY)
+            usage = np.where(window > 0, np.minimum(usage, window), usage)
+    start = np.mod(start, HOURS_PER_DAY)
+    # Large schedules repeat the same few blocks; spread each distinct block over the day once.
+    blocks, index = np.unique(np.stack([start, usage], axis=1), axis=0, return_inverse=True)
+    watts = np.bincount(index.ravel(), weights=watts, minlength=len(blocks))
+    start, usage = blocks[:, :1], blocks[:, 1:]
+    end = start + usage
+    hour = np.arange(HOURS_PER_DAY)
+    # Overlap of [start, end) with every hour, plus the part that wrapped past midnight.
+    share = (np.clip(np.minimum(end, hour + 1) - np.maximum(start, hour), 0, 1)
+             + np.clip(np.minimum(end - HOURS_PER_DAY, hour + 1) - np.maximum(start - HOURS_PER_DAY, hour), 0, 1))
+    return watts @ share
+
+
+def schedule_profile(rows):
+    """
+    Returns load_profile() of a schedule given as LoadModel rows; rows with a running window
+    run their usage hours inside it, from its start time.
+    """
+    powers, usage_hours, counts = ([row[i] for row in rows] for i in range(3))
+    start_hours, end_hours = ([np.nan if row[i] is None else row[i] for row in rows] for i in (5, 6))
+    return load_profile(powers, usage_hours, counts, start_hours, end_hours)
+
+
+# ---------------------------
+# SIMULATION
+# ---------------------------
+def _yearly(hourly):
+    """
+    Expands a 24-hour profile to 8760 hours; a full-year profile is returned as it is.
+    """
+    hourly = np.asarray(hourly, dtype=float)
+    if hourly.shape[-1] == HOURS_PER_DAY:
+        hourly = np.tile(hourly, DAYS_PER_YEAR)
+    return hourly
+
+
+def simulate_year(load_W, pv_per_W, pv_W, battery_Wh, dod, losses=Losses()):
+    """
+    Simulates one design for a year and returns a YearSimulation.
+
+    load_W is the AC load per hour (24 or 8760 values), pv_per_W the PV output per installed W
+    (8760 values), pv_W the installed PV, battery_Wh the nominal battery capacity and dod the
+    allowed depth of discharge in %. The battery starts full. Each hour PV serves the load first;
+    surplus charges the battery and whatever does not fit is curtailed, a shortfall is drawn from
+    the battery down to the DoD floor and the rest is unmet.
+    The hour loop runs on plain floats, which is several times faster than NumPy for one design.
+    """
+    load_dc = _yearly(load_W) / losses.inverter_efficiency
+    pv_dc = pv_W * losses.pv_derate * np.asarray(pv_per_W, dtype=float)
+    charge_eff = losses.charge_efficiency
+    discharge_eff = losses.discharge_efficiency
+    capacity = float(battery_Wh)
+    floor = capacity * (1 - dod / 100)
+
+    soc = min_soc = capacity
+    curtailed = unmet = 0.0
+    short_hours = 0
+    for net in (pv_dc - load_dc).tolist():
+        if net >= 0:
+            charge = net * charge_eff
+            room = capacity - soc
+            if charge > room:
+                curtailed += (charge - room) / charge_eff
+                charge = room
+            soc += charge
+        else:
+            need = -net / discharge_eff
+            available = soc - floor
+            if need > available:
+                unmet += (need - available) * discharge_eff
+                short_hours += 1
+                soc = floor
+            else:
+                soc -= need
+            if soc < min_soc:
+                min_soc = soc
+
+    return YearSimulation(
+        load_kWh=float(load_dc.sum()) * losses.inverter_efficiency / 1000,
+        pv_kWh=float(pv_dc.sum()) / 1000,
+        unmet_kWh=unmet * losses.inverter_efficiency / 1000,
+        loss_of_load_hours=short_hours,
+        curtailed_kWh=curtailed / 1000,
+        min_soc=100 * min_soc / capacity if capacity else 0.0,
+    )
+
+
+def simulate_batch(load_W, pv_per_W, pv_W, battery_Wh, dod, losses=Losses()):
+    """
+    Simulates N designs at once and returns a BatchYearSimulation.
+
+    pv_W, battery_Wh and dod are broadcast to N designs. pv_per_W is either one profile
+    (8760,) shared by all designs or one per design (N, 8760), e.g. sampled weather years;
+    load_W likewise is (24,), (8760,) or (N, 8760). The year is stepped hour by hour with every
+    operation vectorized across the designs, using the same rules as simulate_year().
+    """
+    load_dc = _yearly(load_W) / losses.inverter_efficiency
+    pv_per_W = np.asarray(pv_per_W, dtype=float)
+    pv_W, battery_Wh, dod = (np.atleast_1d(np.asarray(a, dtype=float)).ravel() for a in (pv_W, battery_Wh, dod))
+    n = max(len(pv_W), len(battery_Wh), len(dod), pv_per_W.shape[0] if pv_per_W.ndim == 2 else 1,
+            load_dc.shape[0] if load_dc.ndim == 2 else 1)
+    pv_W, capacity, dod = (np.array(np.broadcast_to(a, (n,))) for a in (pv_W, battery_Wh, dod))
+    pv_scale = pv_W * losses.pv_derate
+    # Hour-major views, so each step reads one row; the (8760, N) net power is never built.
+    pv_rows = np.ascontiguousarray(pv_per_W.T) if pv_per_W.ndim == 2 else pv_per_W[:, None]
+    load_rows = np.ascontiguousarray(load_dc.T) if load_dc.ndim == 2 else load_dc[:, None]
+
+    charge_eff = losses.charge_efficiency
+    discharge_eff = losses.discharge_efficiency
+    floor = capacity * (1 - dod / 100)
+    soc = capacity.copy()
+    min_soc = capacity.copy()
+    curtailed = np.zeros(n)
+    unmet = np.zeros(n)
+    short_hours = np.zeros(n, dtype=np.int64)
+    step = np.empty(n)
+    surplus = np.empty(n)
+    charge = np.empty(n)
+    need = np.empty(n)
+    draw = np.empty(n)
+    short = np.empty(n, dtype=bool)
+    for pv_row, load_row in zip(pv_rows, load_rows):
+        np.multiply(pv_row, pv_scale, out=step)
+        step -= load_row
+        # Charging side: surplus up to the room left in the battery
+        np.maximum(step, 0, out=surplus)
+        np.subtract(capacity, soc, out=draw)
+        np.multiply(surplus, charge_eff, out=charge)
+        np.minimum(charge, draw, out=charge)
+        curtailed += surplus
+        np.divide(charge, charge_eff, out=surplus)
+        curtailed -= surplus
+        # Discharging side: shortfall down to the DoD floor, the rest is unmet
+        np.minimum(step, 0, out=need)
+        need *= -1 / discharge_eff
+        np.subtract(soc, floor, out=draw)
+        np.minimum(need, draw, out=draw)
+        need -= draw
+        unmet += need
+        np.greater(need, 0, out=short)
+        short_hours += short
+        soc += charge
+        soc -= draw
+        np.minimum(min_soc, soc, out=min_soc)
+
+    load_kWh = np.broadcast_to(load_dc.sum(axis=-1) * losses.inverter_efficiency / 1000, (n,))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        min_soc_pct = np.where(capacity > 0, 100 * min_soc / capacity, 0.0)
+    return BatchYearSimulation(
+        load_kWh=np.array(load_kWh),
+        pv_kWh=pv_per_W.sum(axis=-1) * pv_scale / 1000,
+        unmet_kWh=unmet * discharge_eff * losses.inverter_efficiency / 1000,
+        loss_of_load_hours=short_hours,
+        curtailed_kWh=curtailed / 1000,
+        min_soc=min_soc_pct,
+    )
+
+
+def storage_required(load_W, pv_per_W, pv_W, losses=Losses()):
+    """
+    Returns the usable battery energy (Wh, between full and the DoD floor) that N designs need
+    to meet the whole load of the year, with the same rules as simulate_year().
+    This is the sequent-peak method: the battery's deficit below full grows with every shortfall
+    and shrinks with every surplus, and the largest deficit reached is the storage needed.
+    Arguments are broadcast like simulate_batch(); the result has one entry per design.
+    """
+    pv_W = np.atleast_1d(np.asarray(pv_W, dtype=float)).ravel()
+    load_dc = _yearly(load_W) / losses.inverter_efficiency
+    pv_per_W = np.asarray(pv_per_W, dtype=float)
+    n = max(len(pv_W), pv_per_W.shape[0] if pv_per_W.ndim == 2 else 1,
+            load_dc.shape[0] if load_dc.ndim == 2 else 1)
+    pv_scale = np.broadcast_to(pv_W * losses.pv_derate, (n,))
+    pv_rows = np.ascontiguousarray(pv_per_W.T) if pv_per_W.ndim == 2 else pv_per_W[:, None]
+    load_rows = np.ascontiguousarray(load_dc.T) if load_dc.ndim == 2 else load_dc[:, None]
+
+    charge_eff = losses.charge_efficiency
+    discharge_scale = 1 / losses.discharge_efficiency
+    deficit = np.zeros(n)
+    peak = np.zeros(n)
+    step = np.empty(n)
+    flow = np.empty(n)
+    for pv_row, load_row in zip(pv_rows, load_rows):
+        np.multiply(pv_row, pv_scale, out=step)
+        step -= load_row
+        # Surplus refills the battery after charge losses; a shortfall drains it after discharge losses.
+        np.maximum(step, 0, out=flow)
+        flow *= charge_eff
+        deficit -= flow
+        np.minimum(step, 0, out=flow)
+        flow *= discharge_scale
+        deficit -= flow
+        np.maximum(deficit, 0, out=deficit)
+        np.maximum(peak, deficit, out=peak)
+    return peak
+
+
+def simulate_schedule(rows, result, pv_per_W=None, losses=Losses()):
+    """
+    Simulates the design picked by size_system() (a SizingResult) for a load schedule given as
+    LoadModel rows (see schedule_profile()).
+    Without pv_per_W, the default year around SUN_HOURS is used.
+    """
+    return simulate_profile(schedule_profile(rows), result, pv_per_W, losses)
+
+
+def simulate_profile(load_W, result, pv_per_W=None, losses=Losses()):
+    """
+    simulate_schedule() for a schedule already reduced to its load profile (load_profile()).
+    """
+    if pv_per_W is None:
+        pv_per_W = default_pv_profile()
+    return simulate_year(load_W, pv_per_W,
+                         result.total_pv_capacity, result.battery_Ah_req * result.system_voltage,
+                         result.dod, losses)
+
+
+# ---------------------------
+# PRESENTATION HELPERS
+# ---------------------------
+def simulation_rows(simulation, result):
+    """
+    Returns the (Component, Requirement/Selection, Details) rows added to solar_tree.
+    """
+    return [
+        ("Unmet Load (kWh/yr)", f"{simulation.unmet_kWh:,.1f}",
+         f"{simulation.unmet_fraction:.1%} of {simulation.load_kWh:,.0f} kWh, "
+         f"{simulation.loss_of_load_hours} h short"),
+        ("Curtailed PV (kWh/yr)", f"{simulation.curtailed_kWh:,.1f}",
+         f"of {simulation.pv_kWh:,.0f} kWh produced"),
+        ("Minimum SOC (%)", f"{simulation.min_soc:.0f}", f"DoD limit: {100 - result.dod:.0f}%"),
+    ]